@@ -0,0 +1,124 @@
+"""NumPy 기반 오디오 레벨 측정
+
+청크를 복사 없이 int16 배열로 보고 여러 청크의 RMS, 피크, dBFS, 클리핑 수를 한 번에 계산합니다.
+녹음 전체에 대한 누적 통계도 함께 유지합니다.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+# 16비트 PCM 기준 최대값
+FULL_SCALE = 32768.0
+
+# 레벨 미터에 표시할 최소 dBFS (이 값이 0, 0 dBFS가 100)
+METER_FLOOR_DB = -60.0
+
+# 이 값 이상이면 클리핑으로 간주
+CLIP_THRESHOLD = 32767
+
+# 이보다 작으면 무음으로 간주
+SILENCE_DBFS = -50.0
+
+MeterReading = namedtuple('MeterReading', ['rms', 'peak', 'dbfs', 'peak_dbfs', 'clipped', 'level'])
+
+
+def as_samples(data):
+    """바이트 데이터를 복사 없이 int16 배열로 변환합니다."""
+    return np.frombuffer(data, dtype=np.int16)
+
+
+def to_dbfs(values):
+    """진폭을 dBFS로 변환합니다 (0 진폭은 -inf 대신 최소값으로 제한)."""
+    values = np.maximum(np.asarray(values, dtype=np.float64), 1.0)
+    return 20.0 * np.log10(values / FULL_SCALE)
+
+
+def dbfs_to_level(dbfs):
+    """dBFS를 로그 스케일 미터 값(0-100)으로 변환합니다."""
+    level = (np.asarray(dbfs) - METER_FLOOR_DB) / -METER_FLOOR_DB * 100.0
+    return np.clip(level, 0.0, 100.0)
+
+
+def measure_chunks(data, chunk_samples):
+    """여러 청크의 RMS, 피크, 클리핑 수를 한 번에 계산합니다.
+
+    data는 chunk_samples 단위로 나뉘며 끝에 남는 샘플은 별도의 짧은 청크로 계산합니다.
+    """
+    samples = as_samples(data)
+    if samples.size == 0:
+        empty = np.zeros(0)
+        return empty, empty, np.zeros(0, dtype=np.int64)
+
+    count, remainder = divmod(samples.size, chunk_samples)
+    blocks = [samples[:count * chunk_samples].reshape(count, chunk_samples)] if count else []
+    if remainder:
+        blocks.append(samples[count * chunk_samples:].reshape(1, remainder))
+
+    rms, peak, clipped = [], [], []
+    for block in blocks:
+        wide = block.astype(np.float32)
+        rms.append(np.sqrt(np.einsum('ij,ij->i', wide, wide) / block.shape[1]))
+        magnitude = np.abs(block.astype(np.int32))
+        peak.append(magnitude.max(axis=1))
+        clipped.append(np.count_nonzero(magnitude >= CLIP_THRESHOLD, axis=1))
+    return np.concatenate(rms), np.concatenate(peak), np.concatenate(clipped)
+
+
+class AudioMeter:
+    """청크별 레벨과 녹음 전체 누적 통계를 계산하는 측정기입니다."""
+
+    def __init__(self, chunk_size=1024, channels=1):
+        self.chunk_samples = chunk_size * channels
+        self.reset()
+
+    def reset(self):
+        """누적 통계를 초기화합니다."""
+        self.total_samples = 0
+        self.sum_squares = 0.0
+        self.peak = 0
+        self.clipped_samples = 0
+
+    def measure(self, data):
+        """청크 하나를 측정합니다."""
+        return self.measure_batch(data)[-1]
+
+    def measure_batch(self, data):
+        """여러 청크를 한 번에 측정하고 청크별 MeterReading 목록을 반환합니다."""
+        rms, peak, clipped = measure_chunks(data, self.chunk_samples)
+        if rms.size == 0:
+            return [MeterReading(0.0, 0, METER_FLOOR_DB, METER_FLOOR_DB, 0, 0)]
+
+        # 누적 통계 갱신 (청크 길이로 가중)
+        sizes = np.full(rms.size, self.chunk_samples, dtype=np.float64)
+        sizes[-1] = as_samples(data).size - self.chunk_samples * (rms.size - 1)
+        self.total_samples += int(sizes.sum())
+        self.sum_squares += float(np.dot(rms * rms, sizes))
+        self.peak = max(self.peak, int(peak.max()))
+        self.clipped_samples += int(clipped.sum())
+
+        dbfs = to_dbfs(rms)
+        peak_dbfs = to_dbfs(peak)
+        levels = dbfs_to_level(dbfs)
+        return [
+            MeterReading(float(r), int(p), float(d), float(pd), int(c), int(l))
+            for r, p, d, pd, c, l in zip(rms, peak, dbfs, peak_dbfs, clipped, levels)
+        ]
+
+    @property
+    def rms(self):
+        if self.total_samples == 0:
+            return 0.0
+        return float(np.sqrt(self.sum_squares / self.total_samples))
+
+    @property
+    def dbfs(self):
+        return float(to_dbfs(self.rms))
+
+    @property
+    def peak_dbfs(self):
+        return float(to_dbfs(self.peak))
+
+    def summary(self):
+        """누적 통계를 한 줄 문자열로 반환합니다."""
+        return (f"RMS {self.dbfs:.1f} dBFS, 피크 {self.peak_dbfs:.1f} dBFS, "
+                f"클리핑 {self.clipped_samples}샘플")
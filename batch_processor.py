@@ -0,0 +1,543 @@
+"""녹음 파일 일괄 후처리
+
+녹음 디렉토리의 WAV 파일에 처리 단계(정규화, 무음 잘라내기, 샘플레이트 변환, 모노 변환,
+음량 조절, 무음 기준 분할)를 차례로 적용합니다. 파일마다 프로세스 풀에서 처리하고,
+각 파일은 일정 크기 블록 단위로 읽어서 메모리 사용량이 파일 길이와 무관합니다.
+이미 처리한 파일은 매니페스트로 확인해 건너뛰고, 결과 파일은 임시 파일에 쓴 뒤 교체합니다.
+
+처리 단계는 쉼표로 구분하고, 인자는 콜론으로 붙입니다:
+
+    mono,trim:-50,normalize:-1,resample:16000,gain:3,split:-45:700
+"""
+import os
+import json
+import time
+import wave
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from playback_engine import WavSource
+from resampler import StreamingResampler
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = ".batch_manifest.json"
+
+# 한 번에 읽어 처리하는 프레임 수
+BLOCK_FRAMES = 65536
+
+# 무음 판정에 사용하는 분석 창 (ms)
+_WINDOW_MS = 10
+
+
+def _window_dbfs(block, rate):
+    """블록을 10ms 창으로 나눈 창별 RMS dBFS 배열을 반환합니다 (마지막 남는 부분 포함)."""
+    window = max(1, rate * _WINDOW_MS // 1000)
+    mono = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+    count = -(-len(mono) // window)
+    padded = np.zeros(count * window, dtype=np.float64)
+    padded[:len(mono)] = mono
+    squares = np.square(padded).reshape(count, window)
+    lengths = np.full(count, window)
+    lengths[-1] = len(mono) - (count - 1) * window
+    rms = np.sqrt(squares.sum(axis=1) / lengths)
+    return 20.0 * np.log10(np.maximum(rms, 1.0) / 32768.0), window
+
+
+# ----------------------------------------------------------------------
+# 처리 단계
+# ----------------------------------------------------------------------
+class Operation:
+    """처리 단계의 기본 클래스입니다. 블록은 (프레임, 채널) float64 배열(16비트 범위)입니다.
+
+    needs_analysis가 참이면 실제 처리 전에 같은 입력으로 observe()를 한 번 거쳐 값을 정합니다.
+    """
+    name = ""
+    needs_analysis = False
+
+    def configure(self, rate: int, channels: int):
+        """입력 형식을 받아 출력 (샘플레이트, 채널)을 반환합니다."""
+        self.rate = rate
+        self.channels = channels
+        return rate, channels
+
+    def start(self) -> None:
+        """처리를 (다시) 시작하기 전에 상태를 초기화합니다."""
+
+    def observe(self, block: np.ndarray) -> None:
+        """분석 단계에서 입력 블록을 봅니다."""
+
+    def end_analysis(self) -> None:
+        """분석 단계가 끝났을 때 호출됩니다."""
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        return block
+
+    def finish(self) -> Optional[np.ndarray]:
+        """입력이 끝났을 때 남은 출력을 반환합니다."""
+        return None
+
+    def describe(self) -> str:
+        return self.name
+
+
+class Gain(Operation):
+    name = "gain"
+
+    def __init__(self, db: float = 0.0):
+        self.db = float(db)
+        self.factor = 10 ** (self.db / 20.0)
+
+    def process(self, block):
+        return block * self.factor
+
+    def describe(self):
+        return f"gain:{self.db:g}"
+
+
+class Normalize(Operation):
+    """가장 큰 샘플이 target_dbfs가 되도록 음량을 맞춥니다."""
+    name = "normalize"
+    needs_analysis = True
+
+    def __init__(self, target_dbfs: float = -1.0):
+        self.target_dbfs = float(target_dbfs)
+        self.peak = 0.0
+        self.factor = 1.0
+
+    def start(self):
+        self.peak = 0.0
+
+    def observe(self, block):
+        if block.size:
+            self.peak = max(self.peak, float(np.abs(block).max()))
+
+    def end_analysis(self):
+        target = 32767.0 * 10 ** (self.target_dbfs / 20.0)
+        self.factor = target / self.peak if self.peak > 0 else 1.0
+
+    def process(self, block):
+        return block * self.factor
+
+    def describe(self):
+        return f"normalize:{self.target_dbfs:g}"
+
+
+class Trim(Operation):
+    """앞뒤의 무음(threshold_dbfs 이하)을 잘라 냅니다. pad_ms만큼은 남깁니다."""
+    name = "trim"
+    needs_analysis = True
+
+    def __init__(self, threshold_dbfs: float = -50.0, pad_ms: float = 100.0):
+        self.threshold_dbfs = float(threshold_dbfs)
+        self.pad_ms = float(pad_ms)
+        self.first = None
+        self.last = None
+
+    def start(self):
+        self._position = 0
+
+    def observe(self, block):
+        if not len(block):
+            return
+        levels, window = _window_dbfs(block, self.rate)
+        loud = np.nonzero(levels > self.threshold_dbfs)[0]
+        if len(loud):
+            if self.first is None:
+                self.first = self._position + loud[0] * window
+            self.last = self._position + min(len(block), (loud[-1] + 1) * window)
+        self._position += len(block)
+
+    def end_analysis(self):
+        pad = int(self.rate * self.pad_ms / 1000)
+        if self.first is None:
+            self.keep_from, self.keep_to = 0, 0
+        else:
+            self.keep_from = max(0, self.first - pad)
+            self.keep_to = min(self._position, self.last + pad)
+
+    def process(self, block):
+        start = self._position
+        self._position += len(block)
+        lo = max(0, self.keep_from - start)
+        hi = min(len(block), self.keep_to - start)
+        return block[lo:hi] if hi > lo else block[:0]
+
+    def describe(self):
+        return f"trim:{self.threshold_dbfs:g}"
+
+
+class Mono(Operation):
+    name = "mono"
+
+    def configure(self, rate, channels):
+        super().configure(rate, channels)
+        return rate, 1
+
+    def process(self, block):
+        return block.mean(axis=1, keepdims=True) if block.shape[1] > 1 else block
+
+
+class Resample(Operation):
+    """샘플레이트를 바꿉니다.
+
+    앞 단계 결과를 16비트로 자르지 않고 실수 그대로 변환하므로, gain 뒤에 두고 나중에 normalize해도
+    중간에 클리핑되지 않습니다.
+    """
+    name = "resample"
+
+    def __init__(self, rate: int = 16000):
+        self.target_rate = int(rate)
+
+    def configure(self, rate, channels):
+        super().configure(rate, channels)
+        return self.target_rate, channels
+
+    def start(self):
+        self._resampler = StreamingResampler(self.rate, self.target_rate, self.channels)
+
+    def process(self, block):
+        return self._resampler.process_array(block)
+
+    def finish(self):
+        return self._resampler.flush_array()
+
+    def describe(self):
+        return f"resample:{self.target_rate}"
+
+
+class SplitOnSilence(Operation):
+    """min_silence_ms 이상 이어지는 무음에서 파일을 나눕니다. 무음 부분은 버립니다.
+
+    항상 마지막 단계여야 하며, feed()가 (구간 번호, 블록) 목록을 반환합니다.
+    """
+    name = "split"
+
+    def __init__(self, threshold_dbfs: float = -45.0, min_silence_ms: float = 700.0):
+        self.threshold_dbfs = float(threshold_dbfs)
+        self.min_silence_ms = float(min_silence_ms)
+
+    def start(self):
+        self._segment = 0
+        self._in_segment = False
+        self._silent = []
+        self._silent_frames = 0
+        self._min_silence = int(self.rate * self.min_silence_ms / 1000)
+
+    def feed(self, block):
+        """블록을 받아 (구간 번호, 블록) 목록을 반환합니다."""
+        out = []
+        if not len(block):
+            return out
+        levels, window = _window_dbfs(block, self.rate)
+        for i, level in enumerate(levels):
+            piece = block[i * window:(i + 1) * window]
+            if level > self.threshold_dbfs:
+                if not self._in_segment:
+                    self._in_segment = True
+                    self._segment += 1
+                elif self._silent:
+                    # 구간 안의 짧은 무음은 그대로 둠
+                    out.extend((self._segment, held) for held in self._silent)
+                self._silent, self._silent_frames = [], 0
+                out.append((self._segment, piece))
+            elif self._in_segment:
+                self._silent.append(piece)
+                self._silent_frames += len(piece)
+                if self._silent_frames >= self._min_silence:
+                    self._in_segment = False
+                    self._silent, self._silent_frames = [], 0
+        return out
+
+    def describe(self):
+        return f"split:{self.threshold_dbfs:g}:{self.min_silence_ms:g}"
+
+
+OPERATIONS = {op.name: op for op in (Gain, Normalize, Trim, Mono, Resample, SplitOnSilence)}
+
+
+def parse_chain(spec: str) -> List[Operation]:
+    """'mono,trim:-50,normalize' 형식의 문자열을 처리 단계 목록으로 바꿉니다."""
+    ops = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, *args = item.split(":")
+        if name not in OPERATIONS:
+            raise ValueError(f"알 수 없는 처리 단계입니다: {name} (사용 가능: {', '.join(OPERATIONS)})")
+        try:
+            ops.append(OPERATIONS[name](*(float(arg) for arg in args)))
+        except TypeError:
+            raise ValueError(f"처리 단계 인자가 잘못되었습니다: {item}") from None
+    if not ops:
+        raise ValueError("처리 단계가 없습니다.")
+    for op in ops[:-1]:
+        if isinstance(op, SplitOnSilence):
+            raise ValueError("split은 마지막 단계여야 합니다.")
+    return ops
+
+
+# ----------------------------------------------------------------------
+# 파일 하나 처리 (작업자 프로세스)
+# ----------------------------------------------------------------------
+class _OutputFiles:
+    """구간 번호별 출력 파일을 임시 이름으로 쓰고 끝나면 한꺼번에 교체합니다."""
+
+    def __init__(self, out_dir, base_name, rate, channels, numbered):
+        self.out_dir = out_dir
+        self.base_name = base_name
+        self.rate = rate
+        self.channels = channels
+        self.numbered = numbered
+        self._files = {}
+        self.frames = 0
+
+    def final_name(self, index):
+        return f"{self.base_name}_{index:03d}.wav" if self.numbered else f"{self.base_name}.wav"
+
+    def _open(self, index):
+        tmp_path = os.path.join(self.out_dir, f".{self.final_name(index)}.tmp_{os.getpid()}")
+        wf = wave.open(tmp_path, 'wb')
+        wf.setnchannels(self.channels)
+        wf.setsampwidth(2)
+        wf.setframerate(self.rate)
+        self._files[index] = (wf, tmp_path)
+        return wf
+
+    def write(self, index, block):
+        if not len(block):
+            return
+        wf = self._files[index][0] if index in self._files else self._open(index)
+        wf.writeframes(np.clip(np.round(block), -32768, 32767).astype('<i2').tobytes())
+        self.frames += len(block)
+
+    def commit(self):
+        if not self.numbered and not self._files:
+            # 모두 잘려 나간 경우에도 빈 파일을 남겨 처리되었음을 표시
+            self._open(0)
+        names = []
+        for index, (wf, tmp_path) in sorted(self._files.items()):
+            wf.close()
+            name = self.final_name(index)
+            os.replace(tmp_path, os.path.join(self.out_dir, name))
+            names.append(name)
+        self._files.clear()
+        return names
+
+    def abort(self):
+        for wf, tmp_path in self._files.values():
+            try:
+                wf.close()
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        self._files.clear()
+
+
+def _read_blocks(source, block_frames):
+    for frame in range(0, source.frames, block_frames):
+        data = source.read(frame, block_frames)
+        yield np.frombuffer(data, dtype='<i2').reshape(-1, source.channels).astype(np.float64)
+
+
+def process_file(source_path: str, out_dir: str, spec: str, block_frames: int = BLOCK_FRAMES) -> dict:
+    """파일 하나에 처리 단계를 적용합니다. 결과 요약을 사전으로 반환합니다."""
+    started = time.perf_counter()
+    ops = parse_chain(spec)
+    source = WavSource(source_path)
+    try:
+        if source.sample_width != 2:
+            raise ValueError(f"16비트 WAV만 처리할 수 있습니다 ({source.sample_width * 8}bit)")
+
+        rate, channels = source.sample_rate, source.channels
+        for op in ops:
+            rate, channels = op.configure(rate, channels)
+
+        def run(chain, sink):
+            """chain을 처음부터 끝까지 통과시키며 마지막 결과를 sink로 넘깁니다."""
+            for op in chain:
+                op.start()
+
+            def push(block, start_index):
+                for op in chain[start_index:]:
+                    block = op.process(block)
+                sink(block)
+
+            for block in _read_blocks(source, block_frames):
+                push(block, 0)
+            for i, op in enumerate(chain):
+                tail = op.finish()
+                if tail is not None and len(tail):
+                    push(tail, i + 1)
+
+        # 분석이 필요한 단계는 앞 단계 결과를 한 번 더 흘려 보내 값을 정함 (메모리 대신 계산을 더 씀)
+        for index, op in enumerate(ops):
+            if op.needs_analysis:
+                op.start()
+                run(ops[:index], op.observe)
+                op.end_analysis()
+
+        base_name = os.path.splitext(os.path.basename(source_path))[0]
+        split = ops[-1] if isinstance(ops[-1], SplitOnSilence) else None
+        outputs = _OutputFiles(out_dir, base_name, rate, channels, numbered=split is not None)
+        try:
+            if split:
+                split.start()
+                run(ops[:-1], lambda block: [outputs.write(i, piece) for i, piece in split.feed(block)])
+            else:
+                run(ops, lambda block: outputs.write(0, block))
+            names = outputs.commit()
+        except Exception:
+            outputs.abort()
+            raise
+
+        return {
+            "outputs": names,
+            "frames_in": source.frames,
+            "seconds_in": source.duration,
+            "frames_out": outputs.frames,
+            "bytes_in": source.frames * source.frame_size,
+            "elapsed": time.perf_counter() - started,
+        }
+    finally:
+        source.close()
+
+
+# ----------------------------------------------------------------------
+# 일괄 처리
+# ----------------------------------------------------------------------
+@dataclass
+class BatchReport:
+    """일괄 처리 결과"""
+    total: int = 0
+    processed: int = 0
+    skipped: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+    audio_seconds: float = 0.0
+    bytes_in: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def realtime_factor(self) -> float:
+        """처리한 오디오 길이 / 걸린 시간"""
+        return self.audio_seconds / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        mb_per_sec = self.bytes_in / 1e6 / self.elapsed if self.elapsed else 0.0
+        return (f"처리 {self.processed}개, 건너뜀 {self.skipped}개, 실패 {len(self.failed)}개 / 전체 {self.total}개, "
+                f"{self.elapsed:.1f}초 (오디오 {self.audio_seconds:.0f}초, {self.realtime_factor:.0f}배속, {mb_per_sec:.1f}MB/s)")
+
+
+class BatchProcessor:
+    """녹음 디렉토리 전체에 처리 단계를 적용합니다."""
+
+    def __init__(self, directory: str, spec: str, out_dir: Optional[str] = None,
+                 workers: Optional[int] = None, block_frames: int = BLOCK_FRAMES):
+        self.directory = directory
+        # 시작 전에 형식을 확인하고, 매니페스트 비교를 위해 표준 형태로 바꿔 둠
+        self.spec = ",".join(op.describe() for op in parse_chain(spec))
+        self.out_dir = out_dir or os.path.join(directory, "processed")
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.block_frames = block_frames
+        self.manifest_path = os.path.join(self.out_dir, MANIFEST_FILE)
+        os.makedirs(self.out_dir, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def is_up_to_date(self, name: str) -> bool:
+        """원본과 처리 단계가 그대로이고 결과 파일이 남아 있으면 참입니다."""
+        entry = self.manifest.get(name)
+        if not entry or entry.get("spec") != self.spec:
+            return False
+        try:
+            stat = os.stat(os.path.join(self.directory, name))
+        except OSError:
+            return False
+        if entry.get("size") != stat.st_size or entry.get("mtime") != stat.st_mtime:
+            return False
+        return all(os.path.exists(os.path.join(self.out_dir, out)) for out in entry.get("outputs", []))
+
+    def _remove_stale_outputs(self, name: str, outputs: List[str]) -> None:
+        """이전 처리 결과 중 이번에 만들지 않은 파일을 지웁니다 (split 구간 수가 줄어든 경우 등)."""
+        for stale in set(self.manifest.get(name, {}).get("outputs", [])) - set(outputs):
+            try:
+                os.remove(os.path.join(self.out_dir, os.path.basename(stale)))
+            except OSError:
+                pass
+
+    def list_sources(self) -> List[str]:
+        return sorted(entry.name for entry in os.scandir(self.directory)
+                      if entry.is_file() and entry.name.endswith(".wav"))
+
+    def pending(self, names: Optional[List[str]] = None, force: bool = False) -> List[str]:
+        """처리해야 할 파일 이름 목록을 반환합니다."""
+        if names is None:
+            names = self.list_sources()
+        return [name for name in names if force or not self.is_up_to_date(name)]
+
+    def run(self, names: Optional[List[str]] = None, force: bool = False,
+            on_progress: Optional[Callable[[int, int, str, Optional[dict]], None]] = None) -> BatchReport:
+        """처리 대상 파일을 프로세스 풀에서 처리합니다.
+
+        on_progress(완료 수, 대상 수, 파일 이름, 결과 또는 None)는 파일 하나가 끝날 때마다 호출됩니다.
+        """
+        all_names = names if names is not None else self.list_sources()
+        todo = self.pending(all_names, force)
+        report = BatchReport(total=len(all_names), skipped=len(all_names) - len(todo))
+        started = time.perf_counter()
+        if not todo:
+            return report
+
+        last_save = time.monotonic()
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(todo))) as pool:
+            futures = {}
+            for name in todo:
+                source_path = os.path.join(self.directory, name)
+                stat = os.stat(source_path)
+                future = pool.submit(process_file, source_path, self.out_dir, self.spec, self.block_frames)
+                futures[future] = (name, stat)
+
+            for done, future in enumerate(as_completed(futures), 1):
+                name, stat = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    report.failed[name] = str(e)
+                    logger.error(f"일괄 처리 오류 ({name}): {e}")
+                    result = None
+                else:
+                    report.processed += 1
+                    report.audio_seconds += result["seconds_in"]
+                    report.bytes_in += result["bytes_in"]
+                    self._remove_stale_outputs(name, result["outputs"])
+                    self.manifest[name] = {
+                        "spec": self.spec,
+                        "size": stat.st_size,
+                        "mtime": stat.st_mtime,
+                        "outputs": result["outputs"],
+                    }
+                report.elapsed = time.perf_counter() - started
+                if on_progress:
+                    on_progress(done, len(todo), name, result)
+                # 중간에 멈춰도 다시 처리하지 않도록 매니페스트를 주기적으로 저장
+                if time.monotonic() - last_save > 2.0:
+                    self._save_manifest()
+                    last_save = time.monotonic()
+
+        self._save_manifest()
+        report.elapsed = time.perf_counter() - started
+        return report
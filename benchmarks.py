@@ -0,0 +1,422 @@
+"""녹음/재생 성능 측정
+
+가상 오디오 장치(fake_pyaudio)로 하드웨어 없이 다음 항목을 측정하고 JSON으로 저장합니다.
+
+  capture    캡처 방식별 처리량, 입력 오버플로와 손실 프레임 (지터/멈춤 포함)
+  ui         백그라운드 스레드에서 보낸 이벤트가 UI 스레드에서 처리되기까지의 지연
+  memory     긴 녹음 동안의 최대 메모리 사용량 (soak)
+  save       녹음 종료(파일 확정)에 걸리는 시간
+  playback   재생 시작 지연 (처음 재생 / 스트림 재사용)
+  dsp        변환기, VAD, 레벨 측정의 처리 속도 (실시간 대비 배수)
+  monitor    입력 모니터(FFT)를 켠 채 녹음할 때의 손실 프레임과 분석 범위, 분석 속도
+
+사용 예:
+    python benchmarks.py --quick --output bench.json
+    python benchmarks.py --only capture,ui --compare bench.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+import fake_pyaudio
+
+BENCHMARKS = ("capture", "ui", "memory", "save", "playback", "dsp", "monitor")
+
+
+def percentiles(values, points=(50, 95, 99)):
+    """지연 목록(초)을 밀리초 백분위수로 요약합니다."""
+    if not values:
+        return {}
+    ms = np.asarray(values) * 1000.0
+    summary = {f"p{p}_ms": round(float(np.percentile(ms, p)), 3) for p in points}
+    summary["max_ms"] = round(float(ms.max()), 3)
+    return summary
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def quiet_engine(audio, **kwargs):
+    """로그를 모아 두기만 하는 녹음 엔진을 만듭니다."""
+    from recorder_engine import RecordingEngine
+
+    engine = RecordingEngine(audio=audio, **kwargs)
+    engine.logs = []
+    engine.on_log = engine.logs.append
+    return engine
+
+
+# ----------------------------------------------------------------------
+# 캡처 처리량 / 손실
+# ----------------------------------------------------------------------
+def bench_capture(workdir, quick):
+    """가상 시간을 빠르게 돌려 캡처가 장치 속도를 따라가는지 봅니다."""
+    seconds = 1.5 if quick else 5.0
+    # 장치 버퍼(8192프레임, 약 186ms)보다 긴 멈춤은 손실로 이어져야 정상
+    scenarios = {
+        "steady": dict(time_scale=5.0),
+        "jitter": dict(time_scale=5.0, jitter_ms=5.0),
+        "stalls": dict(time_scale=5.0, jitter_ms=5.0, stall_every=2.0, stall_ms=250.0),
+    }
+    results = {}
+    for mode in ("blocking", "callback"):
+        for name, options in scenarios.items():
+            audio = fake_pyaudio.FakePyAudio(seed=1, **options)
+            engine = quiet_engine(audio)
+            path = os.path.join(workdir, f"capture_{mode}_{name}.wav")
+            started = time.perf_counter()
+            result = engine.record_for(path, seconds, capture_mode=mode)
+            elapsed = time.perf_counter() - started
+
+            stream = audio.streams[0]
+            # 장치가 녹음 시간 동안 만들어 낸 분량 (가상 시간)
+            device_seconds = (stream.stats.closed_at - stream.stats.opened_at) * audio.time_scale
+            results[f"{mode}_{name}"] = {
+                "realtime_factor": round(result.duration / elapsed, 2),
+                "captured_seconds": round(result.duration, 3),
+                "device_seconds": round(device_seconds, 3),
+                "frames_dropped": stream.stats.frames_dropped,
+                "overflows": stream.stats.overflows,
+                "stalls": stream.stats.stalls,
+                "completeness": round(min(1.0, result.duration / device_seconds), 4),
+            }
+            engine.close()
+    return results
+
+
+# ----------------------------------------------------------------------
+# UI 스레드 지연
+# ----------------------------------------------------------------------
+class HeadlessRoot:
+    """Tk 없이 root.after만 흉내 내는 메인 루프입니다."""
+
+    def __init__(self):
+        self._timers = {}
+        self._next_id = 0
+        self.tick_lateness = []
+
+    def after(self, ms, func):
+        self._next_id += 1
+        self._timers[self._next_id] = (time.perf_counter() + ms / 1000.0, func)
+        return self._next_id
+
+    def after_cancel(self, after_id):
+        self._timers.pop(after_id, None)
+
+    def run_for(self, seconds):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            if not self._timers:
+                time.sleep(0.001)
+                continue
+            after_id, (due, func) = min(self._timers.items(), key=lambda item: item[1][0])
+            wait = due - time.perf_counter()
+            if wait > 0:
+                time.sleep(min(wait, 0.005))
+                continue
+            del self._timers[after_id]
+            self.tick_lateness.append(-wait)
+            func()
+
+
+def bench_ui(workdir, quick):
+    """녹음 중 레벨/로그 이벤트가 이벤트 버스를 거쳐 처리되기까지의 지연을 잽니다."""
+    from ui_bus import UIEventBus
+
+    seconds = 2.0 if quick else 6.0
+    root = HeadlessRoot()
+    bus = UIEventBus(root, fps=30)
+    level_latency, log_latency = [], []
+    bus.on("level", lambda posted: level_latency.append(time.perf_counter() - posted))
+    bus.on_logs(lambda batch: log_latency.extend(time.perf_counter() - posted for posted in batch))
+
+    audio = fake_pyaudio.FakePyAudio(seed=2, time_scale=4.0, jitter_ms=2.0)
+    engine = quiet_engine(audio)
+    engine.on_level = lambda level: bus.post("level", time.perf_counter())
+    engine.on_log = lambda message: bus.post_log(time.perf_counter())
+
+    bus.start()
+    engine.start(os.path.join(workdir, "ui.wav"), capture_mode="callback")
+    try:
+        root.run_for(seconds)
+    finally:
+        engine.stop()
+        bus.stop()
+        engine.close()
+
+    return {
+        "level_events": len(level_latency),
+        "level_latency": percentiles(level_latency),
+        "log_latency": percentiles(log_latency),
+        "tick_lateness": percentiles(root.tick_lateness),
+    }
+
+
+# ----------------------------------------------------------------------
+# 메모리 (soak)
+# ----------------------------------------------------------------------
+def bench_memory(workdir, quick, soak_seconds=None):
+    """긴 녹음을 빠른 가상 시간으로 돌리며 최대 메모리 사용량을 잽니다."""
+    virtual_seconds = soak_seconds or (60.0 if quick else 900.0)
+    time_scale = 30.0
+    results = {}
+    for vad_mode in ("off", "drop"):
+        audio = fake_pyaudio.FakePyAudio(seed=3, time_scale=time_scale)
+        engine = quiet_engine(audio)
+        engine.vad_mode = vad_mode
+        path = os.path.join(workdir, f"soak_{vad_mode}.wav")
+
+        tracemalloc.start()
+        samples = []
+        engine.start(path, capture_mode="callback")
+        deadline = time.perf_counter() + virtual_seconds / time_scale
+        while time.perf_counter() < deadline and engine.is_recording:
+            time.sleep(0.25)
+            samples.append(tracemalloc.get_traced_memory()[0])
+        result = engine.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        engine.close()
+
+        half = len(samples) // 2
+        growth = (np.mean(samples[half:]) - np.mean(samples[:half])) if half else 0.0
+        produced = audio.streams[0].stats.frames_produced
+        results[vad_mode] = {
+            "device_seconds": round(produced / float(engine.sample_rate), 1),
+            "recorded_seconds": round(result.duration, 1),
+            "peak_mb": round(peak / 1e6, 2),
+            "growth_mb": round(growth / 1e6, 3),
+            "file_mb": round(os.path.getsize(path) / 1e6, 2),
+        }
+        os.remove(path)
+    return results
+
+
+# ----------------------------------------------------------------------
+# 저장 시간
+# ----------------------------------------------------------------------
+def bench_save(workdir, quick):
+    """녹음을 멈추고 파일을 확정하는 데 걸리는 시간을 잽니다."""
+    seconds = 1.0 if quick else 3.0
+    results = {}
+    for vad_mode in ("off", "drop"):
+        timings = []
+        for attempt in range(2 if quick else 5):
+            audio = fake_pyaudio.FakePyAudio(seed=attempt, time_scale=30.0)
+            engine = quiet_engine(audio)
+            engine.vad_mode = vad_mode
+            engine.start(os.path.join(workdir, f"save_{vad_mode}_{attempt}.wav"))
+            time.sleep(seconds)
+            started = time.perf_counter()
+            engine.stop()
+            timings.append(time.perf_counter() - started)
+            engine.close()
+        results[vad_mode] = percentiles(timings, points=(50,))
+    return results
+
+
+# ----------------------------------------------------------------------
+# 재생 시작 지연
+# ----------------------------------------------------------------------
+def write_test_wav(path, seconds, rate=44100, channels=1):
+    from wav_writer import build_wav_header
+
+    samples = fake_pyaudio.speech_like()(0, int(seconds * rate), rate, channels)
+    with open(path, 'wb') as f:
+        f.write(build_wav_header(channels, 2, rate, samples.nbytes))
+        f.write(samples.tobytes())
+
+
+def bench_playback(workdir, quick):
+    """play() 호출부터 첫 출력 쓰기까지의 시간을 잽니다. 장치 열기에는 30ms가 걸린다고 가정합니다."""
+    from playback_engine import PlaybackEngine
+
+    path = os.path.join(workdir, "playback.wav")
+    write_test_wav(path, 2.0)
+    audio = fake_pyaudio.FakePyAudio(time_scale=50.0, open_latency_ms=30.0)
+    engine = PlaybackEngine(audio)
+    engine.on_log = lambda message: None
+
+    first, reused = [], []
+    try:
+        for attempt in range(3 if quick else 10):
+            started = time.perf_counter()
+            item = engine.play(path)
+            while not (audio.streams and audio.streams[-1].stats.first_write_at):
+                if item.wait(timeout=0.0005) and item.status == "failed":
+                    raise RuntimeError(f"재생 실패: {item.error}")
+            stream = audio.streams[-1]
+            (first if attempt == 0 else reused).append(stream.stats.first_write_at - started)
+            engine.stop()
+            item.wait(timeout=2.0)
+            # 재생이 끝난 뒤에 지워야 이전 재생의 쓰기가 다음 측정에 섞이지 않음
+            stream.stats.first_write_at = None
+    finally:
+        engine.close()
+    return {
+        "first_play_ms": round(first[0] * 1000.0, 3),
+        "reused_stream": percentiles(reused, points=(50, 95)),
+        "streams_opened": engine.streams_opened,
+    }
+
+
+# ----------------------------------------------------------------------
+# DSP 처리 속도
+# ----------------------------------------------------------------------
+def bench_dsp(workdir, quick):
+    """녹음 경로의 연산 단계를 청크 단위로 돌려 실시간 대비 배수를 잽니다."""
+    from audio_meter import AudioMeter
+    from resampler import StreamingResampler
+    from vad import VoiceActivityDetector
+
+    seconds = 20.0 if quick else 120.0
+    chunk = 1024
+
+    def run(rate, stage):
+        data = fake_pyaudio.speech_like()(0, int(seconds * rate), rate, 1).tobytes()
+        started = time.perf_counter()
+        for offset in range(0, len(data), chunk * 2):
+            stage(data[offset:offset + chunk * 2])
+        return round(seconds / (time.perf_counter() - started), 1)
+
+    meter = AudioMeter(chunk, 1)
+    return {
+        "meter_x_realtime": run(44100, meter.measure_batch),
+        "vad_x_realtime": run(16000, VoiceActivityDetector(16000, mode="drop").process),
+        "resample_44k_16k_x_realtime": run(44100, StreamingResampler(44100, 16000).process),
+        "resample_48k_16k_x_realtime": run(48000, StreamingResampler(48000, 16000).process),
+    }
+
+
+# ----------------------------------------------------------------------
+# 입력 모니터
+# ----------------------------------------------------------------------
+def bench_monitor(workdir, quick):
+    """입력 모니터를 켠 채 녹음해도 캡처 손실이 없고 모든 청크가 분석되는지 봅니다."""
+    from spectrum import SpectrumAnalyzer
+
+    seconds = 1.5 if quick else 5.0
+    results = {}
+    for mode in ("blocking", "callback"):
+        audio = fake_pyaudio.FakePyAudio(seed=3, time_scale=5.0, jitter_ms=5.0)
+        engine = quiet_engine(audio)
+        monitor = engine.start_monitor()
+        # 모니터 전용 입력 다음에 열리는 스트림이 녹음 스트림
+        opened = len(audio.streams)
+        result = engine.record_for(os.path.join(workdir, f"monitor_{mode}.wav"), seconds, capture_mode=mode)
+        engine.stop_monitor()
+        stream = audio.streams[opened]
+        results[mode] = {
+            "captured_seconds": round(result.duration, 3),
+            "analyzed_seconds": round(monitor.analyzer.samples / float(monitor.sample_rate), 3),
+            "frames_dropped": stream.stats.frames_dropped,
+            "analysis_skipped_bytes": monitor.skipped_bytes,
+        }
+        engine.close()
+
+    rate, chunk = 44100, 1024
+    data = fake_pyaudio.speech_like()(0, int((20.0 if quick else 120.0) * rate), rate, 1).tobytes()
+    analyzer = SpectrumAnalyzer(rate)
+    started = time.perf_counter()
+    for offset in range(0, len(data), chunk * 2):
+        analyzer.process(data[offset:offset + chunk * 2])
+    results["analyzer_x_realtime"] = round(len(data) / 2 / rate / (time.perf_counter() - started), 1)
+    return results
+
+
+# ----------------------------------------------------------------------
+# 결과 비교
+# ----------------------------------------------------------------------
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(old, new):
+    """이전 결과와 비교한 표를 문자열로 반환합니다."""
+    before, after = flatten(old.get("results", {})), flatten(new.get("results", {}))
+    lines = [f"{'항목':<50} {'이전':>12} {'현재':>12} {'변화':>9}"]
+    for name in sorted(set(before) & set(after)):
+        a, b = before[name], after[name]
+        change = f"{(b - a) / abs(a) * 100:+.1f}%" if a else "-"
+        lines.append(f"{name:<50} {a:>12g} {b:>12g} {change:>9}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="가상 오디오 장치로 녹음/재생 성능을 측정합니다.")
+    parser.add_argument("--quick", action="store_true", help="짧게 실행 (CI 확인용)")
+    parser.add_argument("--only", help=f"실행할 항목 (쉼표 구분: {','.join(BENCHMARKS)})")
+    parser.add_argument("--soak", type=float, help="메모리 측정에 쓸 녹음 길이 (가상 시간 초)")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일 (기본: 표준 출력)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args(argv)
+
+    selected = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"알 수 없는 항목입니다: {', '.join(unknown)}")
+
+    # 실제 PyAudio가 없어도 녹음 엔진을 가져올 수 있게 가상 장치를 등록
+    fake_pyaudio.install()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": args.quick,
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="voice_bench_") as workdir:
+        for name in selected:
+            print(f"[{name}] 측정 중...", file=sys.stderr)
+            started = time.perf_counter()
+            if name == "memory":
+                result = bench_memory(workdir, args.quick, args.soak)
+            else:
+                result = globals()[f"bench_{name}"](workdir, args.quick)
+            report["results"][name] = result
+            print(f"[{name}] {time.perf_counter() - started:.1f}초", file=sys.stderr)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+        print(f"결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print(compare(json.load(f), report), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""콜백 기반 오디오 캡처
+
+PyAudio의 stream_callback 안에서는 미리 할당한 링 버퍼에 바이트를 복사하는 일만 합니다.
+레벨 측정, 무음 감지, UI 갱신, 디스크 기록은 모두 링 버퍼를 읽는 별도 작업자가 처리합니다.
+"""
+import threading
+import logging
+
+import pyaudio
+
+logger = logging.getLogger(__name__)
+
+
+class RingBuffer:
+    """미리 할당된 고정 크기 바이트 링 버퍼입니다 (생산자 1, 소비자 1)."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        # 누적 기록/읽기 위치 (바이트 단위로 계속 증가)
+        self._write_total = 0
+        self._read_total = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.overrun_bytes = 0
+
+    @property
+    def available(self):
+        with self._cond:
+            return self._write_total - self._read_total
+
+    def write(self, data):
+        """데이터를 복사해 넣습니다. 공간이 부족하면 가장 오래된 데이터를 덮어씁니다."""
+        data = memoryview(data)
+        size = len(data)
+        if size > self.capacity:
+            data = data[-self.capacity:]
+            self.overrun_bytes += size - self.capacity
+            size = self.capacity
+        with self._cond:
+            overflow = self._write_total + size - self._read_total - self.capacity
+            if overflow > 0:
+                self._read_total += overflow
+                self.overrun_bytes += overflow
+            start = self._write_total % self.capacity
+            first = min(size, self.capacity - start)
+            self._view[start:start + first] = data[:first]
+            if first < size:
+                self._view[0:size - first] = data[first:]
+            self._write_total += size
+            self._cond.notify_all()
+
+    def read(self, size, timeout=None):
+        """size 바이트가 모일 때까지 기다렸다가 꺼냅니다. 시간 초과나 종료 시 남은 데이터만 반환합니다."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._closed or self._write_total - self._read_total >= size,
+                timeout=timeout
+            )
+            size = min(size, self._write_total - self._read_total)
+            if size <= 0:
+                return b''
+            start = self._read_total % self.capacity
+            first = min(size, self.capacity - start)
+            data = bytes(self._view[start:start + first])
+            if first < size:
+                data += bytes(self._view[0:size - first])
+            self._read_total += size
+            return data
+
+    def seek_latest(self, size):
+        """다음 읽기가 가장 최근 size 바이트부터 시작하도록 읽기 위치를 옮깁니다.
+
+        이미 읽은 데이터라도 아직 덮어쓰지 않았으면 다시 읽습니다 (녹음 대기 프리롤용).
+        """
+        with self._cond:
+            size = min(size, self._write_total, self.capacity)
+            self._read_total = self._write_total - size
+
+    def peek_latest(self, size):
+        """가장 최근에 기록된 size 바이트를 꺼내지 않고 복사해 반환합니다."""
+        with self._cond:
+            size = min(size, self._write_total, self.capacity)
+            if size <= 0:
+                return b''
+            end = self._write_total % self.capacity
+            if size <= end:
+                return bytes(self._view[end - size:end])
+            return bytes(self._view[self.capacity - (size - end):]) + bytes(self._view[:end])
+
+    @property
+    def write_position(self):
+        """지금까지 기록된 누적 바이트 수 (copy_since의 시작 위치로 사용)"""
+        with self._cond:
+            return self._write_total
+
+    def copy_since(self, position):
+        """position 이후 기록된 데이터를 꺼내지 않고 복사해 (데이터, 새 위치)로 반환합니다.
+
+        읽기 위치와 무관한 두 번째 관찰자용이며, 이미 덮어쓴 부분은 건너뜁니다.
+        """
+        with self._cond:
+            position = max(position, self._write_total - self.capacity)
+            size = self._write_total - position
+            if size <= 0:
+                return b'', self._write_total
+            start = position % self.capacity
+            first = min(size, self.capacity - start)
+            data = bytes(self._view[start:start + first])
+            if first < size:
+                data += bytes(self._view[0:size - first])
+            return data, self._write_total
+
+    def close(self):
+        """대기 중인 소비자를 깨웁니다. 남아 있는 데이터는 계속 읽을 수 있습니다."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+class CallbackCapture:
+    """stream_callback으로 입력을 받아 링 버퍼에 쌓는 캡처 엔진입니다."""
+
+    def __init__(self, audio, format, channels, rate, chunk_size, device_index=None, buffer_seconds=2.0,
+                 stats=None):
+        self.audio = audio
+        self.format = format
+        self.channels = channels
+        self.rate = rate
+        self.chunk_size = chunk_size
+        self.device_index = device_index
+
+        self.chunk_bytes = chunk_size * channels * audio.get_sample_size(format)
+        capacity = max(self.chunk_bytes * 4, int(rate * buffer_seconds) * channels * audio.get_sample_size(format))
+        self.ring = RingBuffer(capacity - capacity % self.chunk_bytes)
+
+        self.stream = None
+        self.input_overflows = 0
+        # 콜백 간격과 상태 플래그 계측 (capture_stats.CaptureStats)
+        self.stats = stats
+
+    def _callback(self, in_data, frame_count, time_info, status_flags):
+        # 오디오 스레드: 복사 외에는 아무것도 하지 않음
+        if status_flags & pyaudio.paInputOverflow:
+            self.input_overflows += 1
+        if self.stats is not None:
+            self.stats.record_callback(frame_count, status_flags)
+        self.ring.write(in_data)
+        return (None, pyaudio.paContinue)
+
+    def start(self):
+        """입력 스트림을 열고 캡처를 시작합니다."""
+        self.stream = self.audio.open(
+            format=self.format,
+            channels=self.channels,
+            rate=self.rate,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.chunk_size,
+            stream_callback=self._callback
+        )
+        self.stream.start_stream()
+
+    def read_chunk(self, timeout=0.5):
+        """청크 하나를 링 버퍼에서 꺼냅니다. 데이터가 없으면 빈 바이트를 반환합니다."""
+        return self.ring.read(self.chunk_bytes, timeout=timeout)
+
+    def stop(self):
+        """스트림을 닫습니다. 링 버퍼에 남은 데이터는 계속 읽을 수 있습니다."""
+        if self.stream:
+            try:
+                self.stream.stop_stream()
+                self.stream.close()
+            except Exception as e:
+                logger.error(f"콜백 스트림 닫기 오류: {e}")
+            self.stream = None
+        self.ring.close()
+
+    @property
+    def dropped_bytes(self):
+        return self.ring.overrun_bytes
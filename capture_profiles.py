@@ -0,0 +1,46 @@
+"""녹음 프로필
+
+샘플레이트, 채널 수, 샘플 폭, 버퍼 크기를 이름 붙인 묶음으로 관리합니다.
+장치가 프로필의 샘플레이트를 지원하지 않으면 녹음 엔진이 장치 기본 샘플레이트로 캡처한 뒤
+프로필 샘플레이트로 변환해서 저장합니다.
+"""
+from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class CaptureProfile:
+    """녹음 형식 묶음"""
+    name: str
+    label: str
+    sample_rate: int
+    channels: int = 1
+    sample_width: int = 2
+    chunk_size: int = 1024
+
+    @property
+    def chunk_seconds(self) -> float:
+        return self.chunk_size / float(self.sample_rate)
+
+    def describe(self) -> str:
+        channels = "모노" if self.channels == 1 else f"{self.channels}채널"
+        return f"{self.label} ({self.sample_rate / 1000:g}kHz, {self.sample_width * 8}bit, {channels})"
+
+
+PROFILES: Dict[str, CaptureProfile] = {
+    profile.name: profile for profile in (
+        CaptureProfile("speech", "음성", 16000, 1, 2, 512),
+        CaptureProfile("standard", "기본", 44100, 1, 2, 1024),
+        CaptureProfile("music", "음악", 48000, 2, 2, 2048),
+    )
+}
+
+DEFAULT_PROFILE = "standard"
+
+
+def get_profile(name: str) -> CaptureProfile:
+    """이름으로 프로필을 찾습니다."""
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"알 수 없는 녹음 프로필입니다: {name}") from None
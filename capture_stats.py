@@ -0,0 +1,345 @@
+"""캡처 상태 계측
+
+녹음 중 입력 오버플로/언더플로, 읽기 대기 시간과 콜백 간격 분포, 기대 프레임 대비 캡처 프레임,
+기록 큐 깊이를 모읍니다. 값은 설정 탭에 표시하고, 주기적으로 JSON이나 Prometheus 텍스트 형식
+파일로 내보내 실제 사용 중에 생긴 끊김을 나중에 확인할 수 있게 합니다.
+"""
+import os
+import json
+import time
+import bisect
+import threading
+import logging
+from typing import Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# PortAudio 오류 코드 (pyaudio.paInputOverflowed / paOutputUnderflowed)
+INPUT_OVERFLOWED = -9981
+OUTPUT_UNDERFLOWED = -9980
+
+# 콜백 상태 플래그 (pyaudio.paInputUnderflow / paInputOverflow)
+INPUT_UNDERFLOW_FLAG = 1
+INPUT_OVERFLOW_FLAG = 2
+
+# 히스토그램 구간 상한 (ms)
+DEFAULT_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def is_overflow_error(error: Exception) -> bool:
+    """stream.read가 낸 예외가 입력 오버플로인지 확인합니다."""
+    return INPUT_OVERFLOWED in getattr(error, 'args', ())
+
+
+class LatencyHistogram:
+    """고정 구간 지연 히스토그램입니다 (값은 초 단위로 넣음)."""
+
+    def __init__(self, bounds_ms: Sequence[float] = DEFAULT_BOUNDS_MS):
+        self.bounds_ms = tuple(bounds_ms)
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000.0
+        self.counts[bisect.bisect_left(self.bounds_ms, ms)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """구간 상한으로 어림한 분위수(ms)를 반환합니다."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        running = 0
+        for bound, count in zip(self.bounds_ms, self.counts):
+            running += count
+            if running >= target:
+                return float(bound)
+        return self.max * 1000.0
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000.0, 3) if self.count else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max * 1000.0, 3),
+            "buckets": {f"le_{bound:g}": count for bound, count in zip(self.bounds_ms, self.counts)},
+            "overflow_bucket": self.counts[-1],
+        }
+
+    def prometheus(self, name: str) -> list:
+        """Prometheus 히스토그램 형식(누적 버킷, 초 단위) 줄 목록을 반환합니다."""
+        lines = [f"# TYPE {name} histogram"]
+        running = 0
+        for bound, count in zip(self.bounds_ms, self.counts):
+            running += count
+            lines.append(f'{name}_bucket{{le="{bound / 1000.0:g}"}} {running}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum {self.total:.6f}")
+        lines.append(f"{name}_count {self.count}")
+        return lines
+
+
+def stream_clock(stream) -> Callable[[], float]:
+    """스트림 시각(초)을 돌려주는 함수입니다. 장치가 지원하지 않으면 벽시계로 대신합니다."""
+    try:
+        if stream.get_time() > 0:
+            return stream.get_time
+    except Exception:
+        pass
+    return time.perf_counter
+
+
+class OverflowDetector:
+    """exception_on_overflow=False로 읽을 때 입력 오버플로를 찾아냅니다.
+
+    이때 PyAudio는 오버플로를 알려 주지 않으므로, 스트림 시각으로 계산한 생성 프레임 수와
+    (읽은 프레임 + 장치 버퍼에 남은 프레임)의 차이를 읽을 때마다 봅니다. 이 차이는 시계 오차로
+    천천히만 변하므로, 읽기 한 번 사이에 청크 두 개 분량 넘게 벌어지면 장치가 버린 것으로 셉니다.
+    """
+
+    def __init__(self, sample_rate: int, chunk_frames: int):
+        self.sample_rate = sample_rate
+        self.threshold = 2 * chunk_frames
+        self.reset()
+
+    def reset(self) -> None:
+        self._origin: Optional[float] = None
+        self._frames = 0
+        self._gap = 0.0
+        self.frames_dropped = 0
+
+    def observe(self, now: float, frames: int, available: int) -> bool:
+        """읽기 한 번을 반영하고, 그 사이 오버플로가 있었으면 True를 돌려줍니다.
+
+        now는 읽은 직후의 스트림 시각(초), available은 그때 장치 버퍼에 남은 프레임 수입니다.
+        """
+        self._frames += frames
+        if self._origin is None:
+            self._origin = now - (frames + available) / float(self.sample_rate)
+            return False
+        gap = (now - self._origin) * self.sample_rate - self._frames - available
+        jump = gap - self._gap
+        self._gap = gap
+        if jump < self.threshold:
+            return False
+        self.frames_dropped += int(jump)
+        return True
+
+
+class CaptureStats:
+    """녹음 세션 하나의 캡처 계측값입니다.
+
+    record_read는 블로킹 캡처 스레드에서, record_callback은 오디오 콜백에서 호출되므로
+    값을 더하는 일만 합니다. snapshot은 어느 스레드에서든 호출할 수 있습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.read_latency = LatencyHistogram()
+        self.callback_gap = LatencyHistogram()
+        self.reset()
+
+    def reset(self, sample_rate: int = 0, chunk_frames: int = 0, mode: str = "") -> None:
+        with self._lock:
+            self.sample_rate = sample_rate
+            self.chunk_frames = chunk_frames
+            self.mode = mode
+            self.started_at: Optional[float] = None
+            self.stopped_at: Optional[float] = None
+            self.frames_captured = 0
+            self.chunks = 0
+            self.overflows = 0
+            self.underflows = 0
+            self.read_errors = 0
+            self.ring_dropped_bytes = 0
+            self.queue_depth = 0
+            self.max_queue_depth = 0
+            self._last_callback = None
+            self.read_latency.reset()
+            self.callback_gap.reset()
+
+    def start(self) -> None:
+        self.started_at = time.monotonic()
+        self.stopped_at = None
+
+    def stop(self) -> None:
+        if self.started_at is not None and self.stopped_at is None:
+            self.stopped_at = time.monotonic()
+
+    @property
+    def running(self) -> bool:
+        return self.started_at is not None and self.stopped_at is None
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def record_read(self, seconds: float, frames: int) -> None:
+        """stream.read 한 번의 대기 시간과 읽은 프레임 수를 기록합니다."""
+        with self._lock:
+            self.read_latency.observe(seconds)
+            self.frames_captured += frames
+            self.chunks += 1
+
+    def record_overflow(self) -> None:
+        """블로킹 읽기에서 입력 오버플로를 찾은 경우입니다 (읽은 청크는 살리고 장치가 버린 구간만 잃음)."""
+        with self._lock:
+            self.overflows += 1
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.read_errors += 1
+
+    def record_callback(self, frames: int, status_flags: int) -> None:
+        """오디오 콜백 한 번을 기록합니다. 콜백 간격과 상태 플래그를 셉니다."""
+        now = time.perf_counter()
+        with self._lock:
+            if self._last_callback is not None:
+                self.callback_gap.observe(now - self._last_callback)
+            self._last_callback = now
+            self.frames_captured += frames
+            self.chunks += 1
+            if status_flags & INPUT_OVERFLOW_FLAG:
+                self.overflows += 1
+            if status_flags & INPUT_UNDERFLOW_FLAG:
+                self.underflows += 1
+
+    def record_queue_depth(self, depth: int) -> None:
+        self.queue_depth = depth
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    # ------------------------------------------------------------------
+    # 조회 / 내보내기
+    # ------------------------------------------------------------------
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.stopped_at or time.monotonic()) - self.started_at
+
+    @property
+    def frames_expected(self) -> int:
+        """경과 시간으로 계산한, 장치가 지금까지 만들어 냈어야 할 프레임 수"""
+        return int(self.elapsed * self.sample_rate)
+
+    @property
+    def frames_lost(self) -> int:
+        """기대 프레임보다 모자란 만큼. 마지막 청크 하나 분량은 아직 오는 중으로 봅니다."""
+        return max(0, self.frames_expected - self.frames_captured - self.chunk_frames)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            expected = self.frames_expected
+            return {
+                "mode": self.mode,
+                "running": self.running,
+                "sample_rate": self.sample_rate,
+                "chunk_frames": self.chunk_frames,
+                "elapsed_seconds": round(self.elapsed, 3),
+                "frames_expected": expected,
+                "frames_captured": self.frames_captured,
+                "frames_lost": self.frames_lost,
+                "capture_ratio": round(self.frames_captured / float(expected), 4) if expected else 1.0,
+                "chunks": self.chunks,
+                "overflows": self.overflows,
+                "underflows": self.underflows,
+                "read_errors": self.read_errors,
+                "ring_dropped_bytes": self.ring_dropped_bytes,
+                "writer_queue_depth": self.queue_depth,
+                "writer_queue_max": self.max_queue_depth,
+                "read_latency": self.read_latency.to_dict(),
+                "callback_gap": self.callback_gap.to_dict(),
+            }
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 형식으로 반환합니다."""
+        snapshot = self.snapshot()
+        lines = []
+        for key, kind in (("frames_expected", "counter"), ("frames_captured", "counter"),
+                          ("frames_lost", "gauge"), ("chunks", "counter"), ("overflows", "counter"),
+                          ("underflows", "counter"), ("read_errors", "counter"),
+                          ("ring_dropped_bytes", "counter"), ("writer_queue_depth", "gauge"),
+                          ("writer_queue_max", "gauge"), ("elapsed_seconds", "gauge")):
+            name = f"voice_capture_{key}"
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {snapshot[key]}")
+        with self._lock:
+            lines.extend(self.read_latency.prometheus("voice_capture_read_latency_seconds"))
+            lines.extend(self.callback_gap.prometheus("voice_capture_callback_gap_seconds"))
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        snapshot = self.snapshot()
+        return (f"캡처 {snapshot['frames_captured']}/{snapshot['frames_expected']}프레임 "
+                f"({snapshot['capture_ratio'] * 100:.1f}%), 오버플로 {snapshot['overflows']}회, "
+                f"언더플로 {snapshot['underflows']}회, 기록 큐 최대 {snapshot['writer_queue_max']}")
+
+    def describe(self) -> str:
+        """설정 탭에 표시할 여러 줄 요약입니다."""
+        s = self.snapshot()
+        latency = s["callback_gap"] if s["mode"] == "callback" else s["read_latency"]
+        label = "콜백 간격" if s["mode"] == "callback" else "읽기 대기"
+        return (
+            f"캡처 방식: {s['mode'] or '-'} ({'녹음 중' if s['running'] else '정지'}), 경과 {s['elapsed_seconds']:.1f}초\n"
+            f"프레임: {s['frames_captured']} / 기대 {s['frames_expected']} (손실 추정 {s['frames_lost']})\n"
+            f"오버플로 {s['overflows']}회, 언더플로 {s['underflows']}회, 읽기 오류 {s['read_errors']}회, "
+            f"링 버퍼 손실 {s['ring_dropped_bytes']}바이트\n"
+            f"{label}: 평균 {latency['mean_ms']:.1f}ms, p99 {latency['p99_ms']:g}ms 이하, 최대 {latency['max_ms']:.1f}ms\n"
+            f"기록 큐: 현재 {s['writer_queue_depth']}, 최대 {s['writer_queue_max']}"
+        )
+
+
+class StatsExporter:
+    """CaptureStats를 일정 간격으로 파일에 씁니다. 확장자가 .prom이면 Prometheus 텍스트, 아니면 JSON입니다."""
+
+    def __init__(self, stats: CaptureStats, file_path: str, interval: float = 5.0):
+        self.stats = stats
+        self.file_path = file_path
+        self.interval = interval
+        self.prometheus = file_path.endswith(".prom")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stats-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """내보내기를 멈추고 마지막 값을 한 번 더 씁니다."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.export()
+
+    def export(self) -> None:
+        """현재 값을 임시 파일에 쓴 뒤 바꿔 넣습니다 (읽는 쪽이 쓰다 만 파일을 보지 않도록)."""
+        try:
+            if self.prometheus:
+                text = self.stats.to_prometheus()
+            else:
+                text = json.dumps(self.stats.snapshot(), ensure_ascii=False, indent=2) + "\n"
+            directory = os.path.dirname(os.path.abspath(self.file_path))
+            os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.file_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(temp_path, self.file_path)
+        except Exception as e:
+            logger.error(f"캡처 통계 내보내기 오류: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.export()
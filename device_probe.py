@@ -0,0 +1,348 @@
+"""입력 장치 성능 조회
+
+모든 호스트 API(MME, WASAPI, ALSA, Core Audio 등)의 입력 장치를 찾고, 장치마다 샘플레이트,
+샘플 폭, 채널 수 조합을 is_format_supported로 확인합니다. 확인 결과는 장치 식별 정보(호스트 API,
+이름, 채널 수, 기본 샘플레이트)를 키로 디스크에 저장해 두고, 다음 실행부터는 바뀐 장치만 다시 확인합니다.
+
+새로고침할 때마다 이전 목록과 비교해 추가/제거/변경된 장치만 알려 주므로 UI는 해당 항목만 고칠 수 있습니다.
+PortAudio는 초기화할 때의 장치 목록을 유지하므로, refresh(rescan=True)는 reinitialize로 PortAudio를 다시
+초기화한 뒤 장치를 찾습니다. 열린 스트림이 있어 다시 초기화하지 못하면 예전 목록을 그대로 씁니다.
+장치는 번호가 아니라 key(호스트 API와 이름)로 비교하므로 다시 초기화해 번호가 바뀌어도 같은 장치로 봅니다.
+"""
+import os
+import json
+import time
+import threading
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 확인할 샘플레이트와 샘플 폭(바이트)
+PROBE_RATES = (8000, 11025, 16000, 22050, 32000, 44100, 48000, 88200, 96000)
+PROBE_WIDTHS = (2, 3, 4)
+
+# 캐시 파일 형식이 바뀌면 올려서 예전 캐시를 무시
+CACHE_VERSION = 1
+
+# (샘플레이트, 샘플 폭, 채널 수)
+Format = Tuple[int, int, int]
+
+
+@dataclass
+class DeviceCapabilities:
+    """입력 장치 하나와 지원하는 녹음 형식
+
+    supported가 None이면 아직 확인하지 않은 장치입니다.
+    """
+    index: int
+    name: str
+    host_api: str
+    max_input_channels: int
+    default_sample_rate: float
+    supported: Optional[List[Format]] = None
+    probed_at: float = 0.0
+    # 이름이 같은 장치가 여러 개일 때 구분용 (두 번째부터 1, 2, ...)
+    occurrence: int = 0
+
+    @property
+    def key(self) -> str:
+        """장치 목록 비교용 식별자 (PortAudio 장치 번호는 다시 초기화하면 바뀌므로 쓰지 않음)"""
+        suffix = f"#{self.occurrence + 1}" if self.occurrence else ""
+        return f"{self.host_api}/{self.name}{suffix}"
+
+    @property
+    def signature(self) -> str:
+        """캐시 키. 같은 장치라도 채널 수나 기본 샘플레이트가 바뀌면 다시 확인"""
+        return f"{self.key}|{self.max_input_channels}|{self.default_sample_rate:g}"
+
+    @property
+    def probed(self) -> bool:
+        return self.supported is not None
+
+    def label(self) -> str:
+        return f"{self.index}: {self.name} ({self.host_api})"
+
+    def supports(self, rate: int, width: int, channels: int) -> Optional[bool]:
+        """형식을 지원하면 True, 아니면 False, 확인 전이면 None을 반환합니다."""
+        if self.supported is None:
+            return None
+        return (int(rate), width, channels) in set(self.supported)
+
+    def best_rate(self, rate: int, width: int, channels: int) -> Optional[int]:
+        """rate를 지원하면 그대로, 아니면 기본 샘플레이트, 그것도 아니면 rate 이상 중 가장 가까운 값.
+
+        해당 샘플 폭과 채널 수로는 어떤 샘플레이트도 열 수 없으면 None을 반환합니다.
+        """
+        rates = sorted(r for r, w, c in self.supported or () if w == width and c == channels)
+        if not rates:
+            return None
+        if int(rate) in rates:
+            return int(rate)
+        if int(self.default_sample_rate) in rates:
+            return int(self.default_sample_rate)
+        higher = [r for r in rates if r > rate]
+        return higher[0] if higher else rates[-1]
+
+    def describe(self) -> str:
+        """설정 탭에 표시할 한 줄 요약입니다."""
+        if self.supported is None:
+            return "형식 확인 중..."
+        if not self.supported:
+            return "지원 형식 없음"
+        rates = sorted({r for r, _, _ in self.supported})
+        widths = sorted({w for _, w, _ in self.supported})
+        channels = max(c for _, _, c in self.supported)
+        return (f"{'/'.join(f'{r / 1000:g}' for r in rates)}kHz, "
+                f"{'/'.join(str(w * 8) for w in widths)}bit, 최대 {channels}채널")
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "host_api": self.host_api,
+            "max_input_channels": self.max_input_channels,
+            "default_sample_rate": self.default_sample_rate,
+            "supported": [list(f) for f in self.supported or ()],
+            "probed_at": self.probed_at,
+        }
+
+
+@dataclass
+class DeviceChanges:
+    """두 장치 목록의 차이"""
+    added: List[DeviceCapabilities] = field(default_factory=list)
+    removed: List[DeviceCapabilities] = field(default_factory=list)
+    changed: List[DeviceCapabilities] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self) -> str:
+        return f"추가 {len(self.added)}, 제거 {len(self.removed)}, 변경 {len(self.changed)}"
+
+
+def enumerate_input_devices(audio) -> List[DeviceCapabilities]:
+    """모든 호스트 API의 입력 장치를 찾습니다 (형식은 확인하지 않음)."""
+    devices = []
+    seen: Dict[str, int] = {}
+    for host_index in range(audio.get_host_api_count()):
+        try:
+            host_info = audio.get_host_api_info_by_index(host_index)
+        except Exception as e:
+            logger.error(f"호스트 API {host_index} 조회 오류: {e}")
+            continue
+        host_name = host_info.get('name', str(host_index))
+        for i in range(host_info.get('deviceCount', 0)):
+            try:
+                info = audio.get_device_info_by_host_api_device_index(host_index, i)
+            except Exception as e:
+                logger.error(f"장치 정보 조회 오류 ({host_name} {i}): {e}")
+                continue
+            if info.get('maxInputChannels', 0) <= 0:
+                continue
+            device = DeviceCapabilities(
+                index=info['index'],
+                name=info.get('name', str(info['index'])),
+                host_api=host_name,
+                max_input_channels=info['maxInputChannels'],
+                default_sample_rate=float(info.get('defaultSampleRate', 0.0)),
+            )
+            key = device.key
+            device.occurrence = seen.get(key, 0)
+            seen[key] = device.occurrence + 1
+            devices.append(device)
+    return devices
+
+
+def probe_formats(audio, device: DeviceCapabilities, rates=PROBE_RATES, widths=PROBE_WIDTHS) -> List[Format]:
+    """장치가 열 수 있는 (샘플레이트, 샘플 폭, 채널 수) 조합을 확인합니다.
+
+    채널은 모노, 스테레오, 최대 채널 수만 확인합니다. 장치 기본 샘플레이트는 항상 포함합니다.
+    """
+    channel_options = sorted({c for c in (1, 2, device.max_input_channels) if c <= device.max_input_channels})
+    rate_options = sorted(set(rates) | {int(device.default_sample_rate)})
+    supported = []
+    for width in widths:
+        try:
+            sample_format = audio.get_format_from_width(width)
+        except (KeyError, ValueError):
+            continue
+        for channels in channel_options:
+            for rate in rate_options:
+                try:
+                    audio.is_format_supported(rate, input_device=device.index,
+                                              input_channels=channels, input_format=sample_format)
+                except ValueError:
+                    continue
+                supported.append((rate, width, channels))
+    return supported
+
+
+class CapabilityCache:
+    """장치 형식 확인 결과를 JSON 파일로 보관합니다."""
+
+    def __init__(self, file_path: Optional[str]):
+        self.file_path = file_path
+        self.entries: Dict[str, dict] = {}
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        if not self.file_path or not os.path.exists(self.file_path):
+            return
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data.get("devices", {})
+        except Exception as e:
+            logger.warning(f"장치 캐시를 읽을 수 없어 새로 만듭니다: {e}")
+            self.entries = {}
+
+    def get(self, device: DeviceCapabilities) -> Optional[List[Format]]:
+        entry = self.entries.get(device.signature)
+        if entry is None:
+            return None
+        device.probed_at = entry.get("probed_at", 0.0)
+        return [tuple(f) for f in entry.get("supported", [])]
+
+    def put(self, device: DeviceCapabilities) -> None:
+        self.entries[device.signature] = device.to_dict()
+        self._dirty = True
+
+    def save(self) -> None:
+        """바뀐 내용이 있으면 임시 파일에 쓴 뒤 바꿔 넣습니다."""
+        if not self.file_path or not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.file_path)), exist_ok=True)
+            temp_path = f"{self.file_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": CACHE_VERSION, "devices": self.entries}, f, ensure_ascii=False, indent=1)
+            os.replace(temp_path, self.file_path)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"장치 캐시 저장 오류: {e}")
+
+
+class DeviceProber:
+    """입력 장치 목록과 지원 형식을 관리합니다.
+
+    refresh는 장치를 다시 찾아 캐시에 없는 장치만 확인하고, 이전 목록과의 차이를 반환하며
+    on_change로도 알립니다. refresh_async는 같은 일을 백그라운드 스레드에서 합니다.
+    reinitialize는 PortAudio를 다시 초기화해 새 오디오 객체를 돌려주는 함수로, 열린 스트림이 있어
+    다시 초기화할 수 없으면 None을 돌려줘야 합니다 (RecordingEngine.reinitialize_audio).
+    is_format_supported는 스트림을 열지 않으므로 녹음이나 재생 중에도 확인할 수 있습니다.
+    """
+
+    def __init__(self, audio, cache_path: Optional[str] = None, rates=PROBE_RATES, widths=PROBE_WIDTHS):
+        self.audio = audio
+        self.cache = CapabilityCache(cache_path)
+        self.rates = tuple(rates)
+        self.widths = tuple(widths)
+        self.devices: Dict[str, DeviceCapabilities] = {}
+        self.on_change: Optional[Callable[[DeviceChanges], None]] = None
+        self.reinitialize: Optional[Callable[[], object]] = None
+        # _lock은 self.devices 교체만 보호하고, 오래 걸리는 조회/확인은 refresh끼리만 _refresh_lock으로 순서를 맞춤
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def list(self) -> List[DeviceCapabilities]:
+        """현재 장치 목록 (PortAudio 장치 번호순)"""
+        with self._lock:
+            return sorted(self.devices.values(), key=lambda d: d.index)
+
+    def find(self, index: Optional[int]) -> Optional[DeviceCapabilities]:
+        """PortAudio 장치 번호로 장치를 찾습니다. None이면 기본 입력 장치입니다."""
+        if index is None:
+            try:
+                index = self.audio.get_default_input_device_info()['index']
+            except Exception:
+                return None
+        with self._lock:
+            for device in self.devices.values():
+                if device.index == index:
+                    return device
+        return None
+
+    def refresh(self, probe: bool = True, force: bool = False, rescan: bool = False) -> DeviceChanges:
+        """장치를 다시 찾고 형식을 확인합니다.
+
+        probe가 False면 캐시에 있는 결과만 쓰고 나머지는 확인 전으로 둡니다 (시작 시 빠른 목록용).
+        force면 캐시를 무시하고 모두 다시 확인합니다.
+        rescan이면 먼저 PortAudio를 다시 초기화해 새로 꽂거나 뺀 장치까지 찾습니다.
+        """
+        started = time.perf_counter()
+        with self._refresh_lock:
+            if rescan:
+                self._reinitialize_audio()
+            # 새 객체에 채운 뒤 목록만 바꿔 끼우므로, 확인하는 동안에도 list/find(녹음 시작)는 기다리지 않음
+            found = enumerate_input_devices(self.audio)
+            probed = 0
+            for device in found:
+                cached = None if force else self.cache.get(device)
+                if cached is not None:
+                    device.supported = cached
+                elif probe:
+                    device.supported = probe_formats(self.audio, device, self.rates, self.widths)
+                    device.probed_at = time.time()
+                    self.cache.put(device)
+                    probed += 1
+            self.cache.save()
+            with self._lock:
+                changes = self._diff({device.key: device for device in found})
+        if probed:
+            logger.info(f"장치 {probed}개 형식 확인 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        if changes:
+            logger.info(f"장치 목록 변경: {changes.summary()}")
+            if self.on_change:
+                self.on_change(changes)
+        return changes
+
+    def refresh_async(self, probe: bool = True, force: bool = False, rescan: bool = False,
+                      on_done: Optional[Callable[[DeviceChanges], None]] = None) -> None:
+        """refresh를 백그라운드 스레드에서 실행하고 끝나면 on_done(차이)을 호출합니다.
+
+        이미 진행 중이면 무시합니다.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def run():
+            try:
+                changes = self.refresh(probe, force, rescan)
+            except Exception as e:
+                logger.error(f"장치 조회 오류: {e}")
+                return
+            if on_done:
+                on_done(changes)
+
+        self._thread = threading.Thread(target=run, name="device-probe", daemon=True)
+        self._thread.start()
+
+    def _reinitialize_audio(self) -> None:
+        if self.reinitialize is None:
+            return
+        try:
+            audio = self.reinitialize()
+        except Exception as e:
+            logger.error(f"오디오 백엔드 재초기화 오류: {e}")
+            return
+        if audio is None:
+            logger.info("열린 스트림이 있어 PortAudio를 다시 초기화하지 않았습니다 (새로 꽂은 장치는 다음 새로고침에 보임).")
+            return
+        self.audio = audio
+
+    def _diff(self, current: Dict[str, DeviceCapabilities]) -> DeviceChanges:
+        previous, self.devices = self.devices, current
+        changes = DeviceChanges()
+        for key, device in current.items():
+            old = previous.get(key)
+            if old is None:
+                changes.added.append(device)
+            elif (old.index, old.signature, old.supported) != (device.index, device.signature, device.supported):
+                changes.changed.append(device)
+        changes.removed = [device for key, device in previous.items() if key not in current]
+        return changes
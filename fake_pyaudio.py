@@ -0,0 +1,487 @@
+"""가상 오디오 장치 (PyAudio 대체)
+
+실제 하드웨어 없이 녹음/재생 경로를 실행하기 위한 PyAudio 호환 백엔드입니다.
+RecordingEngine(audio=FakePyAudio(...))처럼 인스턴스를 넘기거나, PyAudio가 설치되지 않은
+환경에서는 install()로 pyaudio 모듈 자리에 등록해서 사용합니다.
+
+입력 스트림은 샘플레이트에 맞춰 실제 시간에 따라 데이터를 만들어 내며(time_scale배 빠르게 가능),
+읽기 지터와 주기적인 멈춤(stall)을 흉내 낼 수 있습니다. 읽는 쪽이 장치 버퍼보다 늦어지면
+PyAudio와 같이 오버플로가 발생합니다. 신호는 시드를 고정한 생성기로 만들어 매번 같습니다.
+"""
+import sys
+import time
+import importlib.util
+import types
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+__version__ = "fake"
+
+# PyAudio 상수 (값은 PortAudio와 같음)
+paFloat32 = 1
+paInt32 = 2
+paInt24 = 4
+paInt16 = 8
+paInt8 = 16
+paUInt8 = 32
+
+paContinue = 0
+paComplete = 1
+paAbort = 2
+
+paInputUnderflow = 1
+paInputOverflow = 2
+paOutputUnderflow = 4
+paOutputOverflow = 8
+
+paInputOverflowed = -9981
+paOutputUnderflowed = -9980
+paInvalidSampleRate = -9997
+paSampleFormatNotSupported = -9994
+
+_SAMPLE_SIZES = {paFloat32: 4, paInt32: 4, paInt24: 3, paInt16: 2, paInt8: 1, paUInt8: 1}
+_FORMATS_BY_WIDTH = {1: paUInt8, 2: paInt16, 3: paInt24, 4: paFloat32}
+
+
+def get_sample_size(format: int) -> int:
+    return _SAMPLE_SIZES[format]
+
+
+def get_format_from_width(width: int, unsigned: bool = True) -> int:
+    if width == 1 and not unsigned:
+        return paInt8
+    return _FORMATS_BY_WIDTH[width]
+
+
+# ----------------------------------------------------------------------
+# 신호 생성기: (시작 프레임, 프레임 수, 샘플레이트, 채널) -> (프레임, 채널) int16 배열
+# ----------------------------------------------------------------------
+SignalGenerator = Callable[[int, int, int, int], np.ndarray]
+
+
+def _db_to_amplitude(dbfs):
+    return 32767.0 * 10 ** (dbfs / 20.0)
+
+
+def sine(frequency: float = 440.0, dbfs: float = -12.0) -> SignalGenerator:
+    amplitude = _db_to_amplitude(dbfs)
+
+    def generate(start, frames, rate, channels):
+        t = (np.arange(start, start + frames) / float(rate))[:, None]
+        return np.repeat(np.sin(2 * np.pi * frequency * t) * amplitude, channels, axis=1).astype(np.int16)
+    return generate
+
+
+def noise(dbfs: float = -50.0, seed: int = 0) -> SignalGenerator:
+    """백색 잡음. 같은 시작 프레임이면 항상 같은 값을 만듭니다."""
+    amplitude = _db_to_amplitude(dbfs)
+
+    def generate(start, frames, rate, channels):
+        rng = np.random.default_rng((seed, start))
+        return np.clip(rng.normal(0, amplitude, (frames, channels)), -32768, 32767).astype(np.int16)
+    return generate
+
+
+def silence() -> SignalGenerator:
+    def generate(start, frames, rate, channels):
+        return np.zeros((frames, channels), dtype=np.int16)
+    return generate
+
+
+def speech_like(talk_seconds: float = 2.0, pause_seconds: float = 1.5, dbfs: float = -18.0,
+                noise_dbfs: float = -60.0, seed: int = 0) -> SignalGenerator:
+    """말소리(음높이가 바뀌는 톤)와 쉼이 번갈아 나오는 신호입니다. VAD/무음 처리 측정용"""
+    background = noise(noise_dbfs, seed)
+    amplitude = _db_to_amplitude(dbfs)
+    period = talk_seconds + pause_seconds
+
+    def generate(start, frames, rate, channels):
+        t = np.arange(start, start + frames) / float(rate)
+        talking = (t % period) < talk_seconds
+        pitch = 140 + 40 * np.sin(2 * np.pi * 3 * t)
+        voice = np.sin(2 * np.pi * np.cumsum(pitch) / rate + 2 * np.pi * 140 * start / rate) * amplitude
+        mono = np.where(talking, voice, 0.0)
+        signal = background(start, frames, rate, channels).astype(np.float64) + mono[:, None]
+        return np.clip(signal, -32768, 32767).astype(np.int16)
+    return generate
+
+
+def _encode(samples, format):
+    """int16 샘플을 스트림 형식의 바이트로 바꿉니다."""
+    if format == paInt16:
+        return samples.astype('<i2').tobytes()
+    if format == paFloat32:
+        return (samples.astype('<f4') / 32768.0).tobytes()
+    if format == paInt32:
+        return (samples.astype('<i4') << 16).tobytes()
+    if format == paUInt8:
+        return ((samples >> 8) + 128).astype(np.uint8).tobytes()
+    if format == paInt8:
+        return (samples >> 8).astype(np.int8).tobytes()
+    # paInt24: 하위 바이트 0을 붙인 리틀 엔디언 3바이트
+    wide = samples.astype('<i4') << 8
+    return wide.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+
+
+# ----------------------------------------------------------------------
+# 장치 / 스트림
+# ----------------------------------------------------------------------
+@dataclass
+class FakeDevice:
+    """가상 장치 하나"""
+    name: str
+    max_input_channels: int = 2
+    max_output_channels: int = 2
+    default_sample_rate: float = 48000.0
+    supported_rates: Tuple[int, ...] = (16000, 22050, 32000, 44100, 48000)
+    host_api: int = 0
+    supported_formats: Tuple[int, ...] = (paInt16, paInt24, paInt32, paFloat32)
+    # 장치 클록 오차 (ppm). 양수면 공칭 샘플레이트보다 조금 빨리 샘플을 만듦
+    clock_ppm: float = 0.0
+
+    def info(self, index: int) -> dict:
+        return {
+            'index': index,
+            'structVersion': 2,
+            'name': self.name,
+            'hostApi': self.host_api,
+            'maxInputChannels': self.max_input_channels,
+            'maxOutputChannels': self.max_output_channels,
+            'defaultLowInputLatency': 0.01,
+            'defaultLowOutputLatency': 0.01,
+            'defaultHighInputLatency': 0.04,
+            'defaultHighOutputLatency': 0.04,
+            'defaultSampleRate': self.default_sample_rate,
+        }
+
+
+def default_devices() -> List[FakeDevice]:
+    return [
+        FakeDevice("Fake Microphone", max_input_channels=2, max_output_channels=0),
+        FakeDevice("Fake Speakers", max_input_channels=0, max_output_channels=2, default_sample_rate=44100.0),
+        FakeDevice("Fake USB Headset", max_input_channels=1, max_output_channels=2,
+                   default_sample_rate=16000.0, supported_rates=(16000, 48000)),
+    ]
+
+
+@dataclass
+class StreamStats:
+    """가상 스트림 하나의 기록"""
+    frames_produced: int = 0
+    frames_delivered: int = 0
+    frames_dropped: int = 0
+    overflows: int = 0
+    frames_written: int = 0
+    reads: int = 0
+    stalls: int = 0
+    opened_at: float = 0.0
+    first_write_at: Optional[float] = None
+    closed_at: Optional[float] = None
+    read_waits: List[float] = field(default_factory=list)
+
+
+class FakeStream:
+    """PyAudio Stream과 같은 인터페이스의 가상 스트림입니다."""
+
+    def __init__(self, pa: "FakePyAudio", rate, channels, format, input=False, output=False,
+                 input_device_index=None, output_device_index=None, frames_per_buffer=1024,
+                 start=True, stream_callback=None, device: Optional[FakeDevice] = None, **kwargs):
+        if not input and not output:
+            raise ValueError("Must specify an input or output stream.")
+        self._pa = pa
+        self.rate = int(rate)
+        # 장치 클록 오차를 반영한 실제 샘플레이트
+        self.actual_rate = self.rate * (1.0 + (device.clock_ppm if device else 0.0) * 1e-6)
+        self.channels = channels
+        self.format = format
+        self.is_input = input
+        self.frames_per_buffer = frames_per_buffer if frames_per_buffer else 1024
+        self.frame_bytes = channels * get_sample_size(format)
+        self.stats = StreamStats(opened_at=time.perf_counter())
+
+        self._callback = stream_callback
+        self._lock = threading.Lock()
+        self._active = False
+        self._closed = False
+        self._read_frame = 0
+        self._clock_start = None
+        self._stall_until = 0.0
+        self._next_stall = None
+        self._thread = None
+        if start:
+            self.start_stream()
+
+    # 가상 시간: 스트림 시작 후 time_scale배 속도로 흐름
+    def _now_frames(self):
+        elapsed = (time.perf_counter() - self._clock_start) * self._pa.time_scale
+        return int(elapsed * self.actual_rate)
+
+    def _frames_to_seconds(self, frames):
+        return frames / self.actual_rate / self._pa.time_scale
+
+    def start_stream(self):
+        if self._active:
+            return
+        self._active = True
+        if self._clock_start is None:
+            self._clock_start = time.perf_counter()
+            # 같은 FakePyAudio의 스트림들은 같은 소리를 듣도록 신호 위치를 공통 시작 시각 기준으로 맞춤
+            self._signal_offset = int(round((self._clock_start - self._pa.epoch) * self._pa.time_scale * self.actual_rate))
+            self._schedule_stall()
+        if self._callback is not None:
+            self._thread = threading.Thread(target=self._run_callback, name="fake-audio", daemon=True)
+            self._thread.start()
+
+    def stop_stream(self):
+        self._active = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def close(self):
+        self.stop_stream()
+        self._closed = True
+        self.stats.closed_at = time.perf_counter()
+
+    def is_active(self):
+        return self._active
+
+    def is_stopped(self):
+        return not self._active
+
+    def get_read_available(self):
+        return max(0, self._now_frames() - self._read_frame)
+
+    def get_time(self):
+        return self._now_frames() / float(self.actual_rate)
+
+    def get_input_latency(self):
+        return self.frames_per_buffer / float(self.rate)
+
+    def get_output_latency(self):
+        return self.frames_per_buffer / float(self.rate)
+
+    # ------------------------------------------------------------------
+    def _schedule_stall(self):
+        pa = self._pa
+        if pa.stall_every > 0 and pa.stall_ms > 0:
+            self._next_stall = time.perf_counter() + pa.rng.exponential(pa.stall_every / pa.time_scale)
+
+    def _extra_delay(self):
+        """지터와 멈춤으로 생기는 추가 지연(실제 초)"""
+        pa = self._pa
+        delay = abs(pa.rng.normal(0, pa.jitter_ms / 1000.0)) / pa.time_scale if pa.jitter_ms else 0.0
+        now = time.perf_counter()
+        if self._next_stall is not None and now >= self._next_stall:
+            self.stats.stalls += 1
+            self._stall_until = now + pa.stall_ms / 1000.0 / pa.time_scale
+            self._schedule_stall()
+        if self._stall_until > now:
+            delay += self._stall_until - now
+        return delay
+
+    def _take(self, frames):
+        """읽기 위치에서 frames만큼 만들어 냅니다. 장치 버퍼를 넘겨 밀린 만큼은 버립니다."""
+        status = 0
+        behind = self._now_frames() - self._read_frame
+        capacity = self._pa.device_buffer_frames
+        if behind - frames > capacity:
+            dropped = behind - frames - capacity
+            self._read_frame += dropped
+            self.stats.frames_dropped += dropped
+            self.stats.overflows += 1
+            status |= paInputOverflow
+        samples = self._pa.signal(self._signal_offset + self._read_frame, frames, self.actual_rate, self.channels)
+        self._read_frame += frames
+        self.stats.frames_produced = self._read_frame
+        self.stats.frames_delivered += frames
+        return _encode(samples, self.format), status
+
+    def read(self, num_frames, exception_on_overflow=True):
+        if not self.is_input:
+            raise IOError(-9975, "Not input stream")
+        if not self._active:
+            raise IOError(-9988, "Stream not open")
+        started = time.perf_counter()
+        delay = self._extra_delay()
+        # 요청한 프레임이 모두 만들어질 때까지 대기
+        ready_at = self._clock_start + self._frames_to_seconds(self._read_frame + num_frames)
+        wait = max(0.0, ready_at - time.perf_counter()) + delay
+        if wait:
+            time.sleep(wait)
+        data, status = self._take(num_frames)
+        self.stats.reads += 1
+        self.stats.read_waits.append(time.perf_counter() - started)
+        if status & paInputOverflow and exception_on_overflow:
+            raise IOError(paInputOverflowed, "Input overflowed")
+        return data
+
+    def write(self, frames, num_frames=None, exception_on_underflow=False):
+        if self.is_input:
+            raise IOError(-9974, "Not output stream")
+        if self.stats.first_write_at is None:
+            self.stats.first_write_at = time.perf_counter()
+        count = len(frames) // self.frame_bytes if num_frames is None else num_frames
+        self.stats.frames_written += count
+        time.sleep(self._frames_to_seconds(count))
+
+    def _run_callback(self):
+        """콜백 스트림: 버퍼 주기마다 stream_callback을 호출합니다."""
+        while self._active:
+            ready_at = self._clock_start + self._frames_to_seconds(self._read_frame + self.frames_per_buffer)
+            wait = max(0.0, ready_at - time.perf_counter()) + self._extra_delay()
+            if wait:
+                time.sleep(wait)
+            if not self._active:
+                break
+            data, status = self._take(self.frames_per_buffer)
+            now = time.perf_counter()
+            time_info = {'input_buffer_adc_time': now, 'current_time': now, 'output_buffer_dac_time': 0}
+            result = self._callback(data, self.frames_per_buffer, time_info, status)
+            flag = result[1] if isinstance(result, tuple) else paContinue
+            if flag != paContinue:
+                self._active = False
+                break
+
+
+class FakePyAudio:
+    """PyAudio.PyAudio와 같은 인터페이스의 가상 오디오 백엔드입니다.
+
+    time_scale     가상 시간이 흐르는 속도 (10이면 10초 분량을 1초에 녹음)
+    jitter_ms      읽기/콜백마다 더해지는 지연의 표준편차 (가상 시간 ms)
+    stall_every    평균 몇 초(가상 시간)마다 멈출지, 0이면 멈추지 않음
+    stall_ms       멈춤 한 번의 길이 (가상 시간 ms)
+    device_buffer_frames  장치 버퍼 크기, 읽기가 이보다 늦으면 오버플로
+    open_latency_ms       스트림을 여는 데 걸리는 시간 (실제 ms)
+    """
+
+    def __init__(self, devices: Optional[List[FakeDevice]] = None, signal: Optional[SignalGenerator] = None,
+                 time_scale: float = 1.0, jitter_ms: float = 0.0, stall_every: float = 0.0,
+                 stall_ms: float = 0.0, device_buffer_frames: int = 8192, open_latency_ms: float = 0.0,
+                 seed: int = 0):
+        self.devices = devices if devices is not None else default_devices()
+        self.signal = signal or speech_like(seed=seed)
+        self.time_scale = float(time_scale)
+        self.jitter_ms = jitter_ms
+        self.stall_every = stall_every
+        self.stall_ms = stall_ms
+        self.device_buffer_frames = device_buffer_frames
+        self.open_latency_ms = open_latency_ms
+        self.rng = np.random.default_rng(seed)
+        self.streams: List[FakeStream] = []
+        self.terminated = False
+        self.epoch = time.perf_counter()
+
+    # 장치 조회 (호스트 API는 장치의 host_api 값으로 나뉨)
+    def get_host_api_count(self):
+        return max((device.host_api for device in self.devices), default=0) + 1
+
+    def get_default_host_api_info(self):
+        return self.get_host_api_info_by_index(0)
+
+    def get_host_api_info_by_index(self, host_api_index):
+        if not 0 <= host_api_index < self.get_host_api_count():
+            raise IOError(-9978, "Invalid host api info")
+        return {
+            'index': host_api_index, 'structVersion': 1, 'type': host_api_index,
+            'name': 'Fake Audio' if host_api_index == 0 else f'Fake Audio {host_api_index}',
+            'deviceCount': len(self._host_api_devices(host_api_index)),
+            'defaultInputDevice': self._default_index('max_input_channels'),
+            'defaultOutputDevice': self._default_index('max_output_channels'),
+        }
+
+    def _host_api_devices(self, host_api_index):
+        return [index for index, device in enumerate(self.devices) if device.host_api == host_api_index]
+
+    def get_device_count(self):
+        return len(self.devices)
+
+    def get_device_info_by_index(self, device_index):
+        if not 0 <= device_index < len(self.devices):
+            raise IOError(-9996, "Invalid device index")
+        return self.devices[device_index].info(device_index)
+
+    def get_device_info_by_host_api_device_index(self, host_api_index, host_api_device_index):
+        indexes = self._host_api_devices(host_api_index)
+        if not 0 <= host_api_device_index < len(indexes):
+            raise IOError(-9996, "Invalid device index")
+        return self.get_device_info_by_index(indexes[host_api_device_index])
+
+    def _default_index(self, attribute):
+        for index, device in enumerate(self.devices):
+            if getattr(device, attribute) > 0:
+                return index
+        return -1
+
+    def get_default_input_device_info(self):
+        index = self._default_index('max_input_channels')
+        if index < 0:
+            raise IOError("No Default Input Device Available", -9996)
+        return self.get_device_info_by_index(index)
+
+    def get_default_output_device_info(self):
+        index = self._default_index('max_output_channels')
+        if index < 0:
+            raise IOError("No Default Output Device Available", -9996)
+        return self.get_device_info_by_index(index)
+
+    def is_format_supported(self, rate, input_device=None, input_channels=None, input_format=None,
+                            output_device=None, output_channels=None, output_format=None):
+        for index, channels, format, attribute in (
+                (input_device, input_channels, input_format, 'max_input_channels'),
+                (output_device, output_channels, output_format, 'max_output_channels')):
+            if index is None:
+                continue
+            device = self.devices[index]
+            if int(rate) not in device.supported_rates:
+                raise ValueError("Invalid sample rate", paInvalidSampleRate)
+            if channels and channels > getattr(device, attribute):
+                raise ValueError("Invalid number of channels", -9998)
+            if format is not None and format not in device.supported_formats:
+                raise ValueError("Sample format not supported", paSampleFormatNotSupported)
+        return True
+
+    # 스트림
+    def open(self, rate, channels, format, input=False, output=False, input_device_index=None,
+             output_device_index=None, **kwargs):
+        index = input_device_index if input else output_device_index
+        if index is None:
+            index = self._default_index('max_input_channels' if input else 'max_output_channels')
+        device = self.devices[index]
+        if int(rate) not in device.supported_rates:
+            raise ValueError("Invalid sample rate", paInvalidSampleRate)
+        if format not in device.supported_formats:
+            raise ValueError("Sample format not supported", paSampleFormatNotSupported)
+        if self.open_latency_ms:
+            time.sleep(self.open_latency_ms / 1000.0)
+        stream = FakeStream(self, rate, channels, format, input=input, output=output,
+                            input_device_index=input_device_index, output_device_index=output_device_index,
+                            device=device, **kwargs)
+        self.streams.append(stream)
+        return stream
+
+    def close(self, stream):
+        stream.close()
+
+    def terminate(self):
+        self.terminated = True
+        for stream in self.streams:
+            if not stream._closed:
+                stream.close()
+
+    get_sample_size = staticmethod(get_sample_size)
+    get_format_from_width = staticmethod(get_format_from_width)
+
+
+def install(force: bool = False) -> types.ModuleType:
+    """pyaudio 모듈 자리에 이 모듈을 등록합니다. 실제 PyAudio가 있으면 force일 때만 바꿉니다."""
+    if not force and importlib.util.find_spec('pyaudio') is not None:
+        return importlib.import_module('pyaudio')
+    module = sys.modules[__name__]
+    module.PyAudio = FakePyAudio
+    module.Stream = FakeStream
+    sys.modules['pyaudio'] = module
+    return module
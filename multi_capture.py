@@ -0,0 +1,501 @@
+"""여러 입력 장치 동시 녹음
+
+장치마다 전용 캡처 스레드가 stream.read를 반복하며 자기 버퍼에 쌓고, 청크가 도착한 시각을
+공유 시계(time.perf_counter)로 기록합니다. 장치별로 (누적 프레임, 시각) 관계를 직선으로 맞춰
+실제 샘플레이트를 추정하므로, 정렬 스레드는 기준 장치(첫 번째 장치)의 각 프레임이 다른 장치의
+어느 위치에 해당하는지 계산해 선형 보간으로 맞춥니다. 장치 간 클록 차이(drift)는 이 비율로
+보정되고, 시작 시각 차이는 공통 시작 시각 이전 샘플을 버려서 맞춥니다.
+
+결과는 채널을 이어 붙인 다채널 파일 하나(multichannel) 또는 길이와 시작이 같은 장치별
+파일(separate)로 기록합니다. 한 장치가 늦어도 다른 장치의 캡처는 계속되고, 늦은 장치의
+빈 구간은 무음으로 채웁니다. 16비트 PCM만 지원합니다.
+"""
+import math
+import time
+import threading
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+import pyaudio
+
+from capture_stats import CaptureStats, OverflowDetector, stream_clock
+from wav_writer import StreamingWavWriter
+
+logger = logging.getLogger(__name__)
+
+LAYOUTS = ("multichannel", "separate")
+
+# 공유 시계 (모든 장치의 청크 시각을 같은 기준으로 기록)
+shared_clock = time.perf_counter
+
+# 정렬 중 한 블록에서 허용하는 최대 재생 속도 보정 (0.5%)
+MAX_SLEW = 0.005
+
+
+class ClockTracker:
+    """장치 하나의 (누적 프레임, 도착 시각)을 최소제곱 직선으로 맞춰 실제 샘플레이트를 추정합니다.
+
+    청크 도착 시각의 지터는 점이 쌓일수록 평균되어 줄어듭니다.
+    """
+
+    def __init__(self, nominal_rate: float, min_span: float = 0.5):
+        self.nominal_rate = float(nominal_rate)
+        self.min_span = min_span
+        self._lock = threading.Lock()
+        self.count = 0
+        self._first = None
+        self._mean_f = self._mean_t = 0.0
+        self._m2_f = self._c_ft = 0.0
+        self._span = 0.0
+
+    def observe(self, frame: int, timestamp: float) -> None:
+        """frame번째 프레임(누적 프레임 수)까지가 timestamp에 도착했다고 기록합니다."""
+        with self._lock:
+            if self._first is None:
+                self._first = (frame, timestamp)
+            # 큰 값끼리의 뺄셈 오차를 줄이도록 첫 점 기준 상대값으로 온라인 공분산 계산
+            f = float(frame - self._first[0])
+            t = timestamp - self._first[1]
+            self.count += 1
+            df = f - self._mean_f
+            self._mean_f += df / self.count
+            self._mean_t += (t - self._mean_t) / self.count
+            self._m2_f += df * (f - self._mean_f)
+            self._c_ft += df * (t - self._mean_t)
+            self._span = t
+
+    @property
+    def ready(self) -> bool:
+        return self._first is not None
+
+    def _fit(self):
+        """(초당 프레임, 첫 점 기준 절편)을 반환합니다. 점이 모자라면 공칭 샘플레이트를 씁니다."""
+        if self.count >= 3 and self._span >= self.min_span and self._m2_f > 0 and self._c_ft > 0:
+            slope = self._c_ft / self._m2_f
+            return 1.0 / slope, self._mean_t - slope * self._mean_f
+        return self.nominal_rate, 0.0
+
+    @property
+    def rate(self) -> float:
+        with self._lock:
+            return self._fit()[0]
+
+    @property
+    def drift_ppm(self) -> float:
+        return (self.rate / self.nominal_rate - 1.0) * 1e6
+
+    def frame_at(self, timestamp: float) -> float:
+        """공유 시계 시각에 해당하는 장치 프레임 위치(소수)를 반환합니다."""
+        with self._lock:
+            rate, intercept = self._fit()
+            first_frame, first_time = self._first
+        return first_frame + (timestamp - first_time - intercept) * rate
+
+    def time_at(self, frame: float) -> float:
+        """장치 프레임 위치에 해당하는 공유 시계 시각을 반환합니다."""
+        with self._lock:
+            rate, intercept = self._fit()
+            first_frame, first_time = self._first
+        return first_time + intercept + (frame - first_frame) / rate
+
+
+class FrameBuffer:
+    """절대 프레임 번호로 읽는 장치별 버퍼입니다 (생산자 1, 소비자 1)."""
+
+    def __init__(self, channels: int, max_frames: int):
+        self.channels = channels
+        self.max_frames = max_frames
+        self._chunks = deque()
+        self.base = 0   # 가지고 있는 첫 프레임 번호
+        self.end = 0    # 마지막 프레임 다음 번호
+        self.finished = False
+        self.trimmed_frames = 0
+        self._cond = threading.Condition()
+
+    def append(self, samples: np.ndarray) -> None:
+        with self._cond:
+            self._chunks.append(samples)
+            self.end += len(samples)
+            # 소비가 멈춰도 메모리가 무한히 늘지 않도록 오래된 데이터부터 버림
+            while self.end - self.base > self.max_frames and len(self._chunks) > 1:
+                old = self._chunks.popleft()
+                self.base += len(old)
+                self.trimmed_frames += len(old)
+            self._cond.notify_all()
+
+    def finish(self) -> None:
+        with self._cond:
+            self.finished = True
+            self._cond.notify_all()
+
+    def wait_for(self, frame: int, timeout: float) -> bool:
+        """frame 직전까지의 데이터가 들어올 때까지 기다립니다."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.end >= frame or self.finished, timeout=max(0.0, timeout)) \
+                and self.end >= frame
+
+    def window(self, start: int, stop: int) -> np.ndarray:
+        """[start, stop) 프레임을 float32로 반환합니다. 없는 부분은 0으로 채웁니다."""
+        out = np.zeros((max(0, stop - start), self.channels), dtype=np.float32)
+        with self._cond:
+            position = self.base
+            for chunk in self._chunks:
+                chunk_end = position + len(chunk)
+                lo, hi = max(start, position), min(stop, chunk_end)
+                if lo < hi:
+                    out[lo - start:hi - start] = chunk[lo - position:hi - position]
+                if chunk_end >= stop:
+                    break
+                position = chunk_end
+        return out
+
+    def discard_before(self, frame: int) -> None:
+        with self._cond:
+            while self._chunks and self.base + len(self._chunks[0]) <= frame:
+                self.base += len(self._chunks.popleft())
+
+
+@dataclass
+class DeviceReport:
+    """장치 하나의 동시 녹음 결과"""
+    index: int
+    name: str
+    channels: int
+    frames_captured: int
+    overflows: int
+    drift_ppm: float
+    start_offset_ms: float
+    silence_frames: int
+
+    def describe(self) -> str:
+        return (f"{self.index}: {self.name} - 오버플로 {self.overflows}회, 클록 차이 {self.drift_ppm:+.0f}ppm, "
+                f"시작 보정 {self.start_offset_ms:.1f}ms, 무음 보충 {self.silence_frames}프레임")
+
+
+@dataclass
+class MultiRecordingResult:
+    """동시 녹음 종료 결과. paths는 multichannel이면 하나, separate면 장치 순서대로입니다."""
+    paths: List[str]
+    frames: int
+    duration: float
+    devices: List[DeviceReport] = field(default_factory=list)
+
+    @property
+    def summary(self) -> str:
+        return f"{len(self.devices)}개 장치, {self.duration:.1f}초 / " + " / ".join(d.describe() for d in self.devices)
+
+
+class DeviceCapture:
+    """장치 하나의 캡처 스레드입니다. 다른 장치와 상관없이 자기 버퍼에만 쌓습니다."""
+
+    def __init__(self, audio, index: int, name: str, sample_rate: int, channels: int,
+                 chunk_size: int, sample_format: int, buffer_seconds: float = 10.0):
+        self.audio = audio
+        self.index = index
+        self.name = name
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.chunk_size = chunk_size
+        self.format = sample_format
+        self.buffer = FrameBuffer(channels, int(sample_rate * buffer_seconds))
+        self.clock = ClockTracker(sample_rate)
+        self.stats = CaptureStats()
+        self.error: Optional[Exception] = None
+        self.on_log: Callable[[str], None] = logger.info
+        self.stream = None
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.stream = self.audio.open(
+            format=self.format,
+            channels=self.channels,
+            rate=self.sample_rate,
+            input=True,
+            input_device_index=self.index,
+            frames_per_buffer=self.chunk_size
+        )
+        try:
+            # 입력 지연만큼 앞당겨 실제로 소리가 들어온 시각에 가깝게 기록
+            self.latency = float(self.stream.get_input_latency())
+        except Exception:
+            self.latency = 0.0
+        self.stats.reset(self.sample_rate, self.chunk_size, "blocking")
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"capture-{self.index}", daemon=True)
+        self._thread.start()
+        self.stats.start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.stats.stop()
+        if self.stream:
+            try:
+                self.stream.stop_stream()
+                self.stream.close()
+            except Exception as e:
+                self.on_log(f"장치 {self.index} 스트림 닫기 오류: {e}")
+            self.stream = None
+        self.buffer.finish()
+
+    def _queued_frames(self):
+        try:
+            return self.stream.get_read_available()
+        except Exception:
+            return 0
+
+    def _chunk_end_time(self, now, queued):
+        """방금 읽은 청크의 마지막 샘플이 들어온 시각을 어림합니다.
+
+        장치 버퍼에 아직 남아 있는 프레임(queued)만큼은 그보다 나중에 들어온 것이므로 빼 줍니다.
+        """
+        return now - queued / float(self.sample_rate) - self.latency
+
+    def _run(self):
+        overflow = OverflowDetector(self.sample_rate, self.chunk_size)
+        clock = None
+        while self._running:
+            started = shared_clock()
+            try:
+                # 오버플로 예외를 내면 이미 받은 청크까지 버려지므로 데이터는 받고 오버플로는 따로 셈
+                data = self.stream.read(self.chunk_size, exception_on_overflow=False)
+            except Exception as e:
+                self.error = e
+                self.stats.record_error()
+                self.on_log(f"장치 {self.index} 녹음 오류: {e}")
+                break
+            now = shared_clock()
+            queued = self._queued_frames()
+            end_time = self._chunk_end_time(now, queued)
+            samples = np.frombuffer(data, dtype='<i2').reshape(-1, self.channels)
+            if clock is None:
+                clock = stream_clock(self.stream)
+            if overflow.observe(clock(), len(samples), queued):
+                # 장치가 이 청크 앞에서 버린 구간은 시계로 길이를 어림해 무음으로 채워 다른 장치와의 시간 관계를 유지
+                self.stats.record_overflow()
+                missing = int(round(self.clock.frame_at(end_time))) - self.buffer.end - len(samples)
+                if missing > 0:
+                    self.buffer.append(np.zeros((missing, self.channels), dtype=np.int16))
+            self.buffer.append(samples)
+            self.clock.observe(self.buffer.end, end_time)
+            self.stats.record_read(now - started, len(samples))
+        self.buffer.finish()
+
+
+class MultiDeviceRecorder:
+    """여러 입력 장치를 동시에 녹음하고 샘플 단위로 맞춰 기록합니다.
+
+    devices는 (장치 ID, 이름) 목록이며 첫 번째 장치가 시간 기준이 됩니다.
+    max_lag초 넘게 데이터가 늦는 장치는 기다리지 않고 그 구간을 무음으로 채웁니다.
+    """
+
+    def __init__(self, audio, devices: Sequence, sample_rate: int = 44100, chunk_size: int = 1024,
+                 channels: int = 1, sample_format: int = pyaudio.paInt16, layout: str = "multichannel",
+                 max_lag: float = 0.25):
+        if len(devices) < 1:
+            raise ValueError("녹음할 장치를 하나 이상 선택하세요.")
+        if layout not in LAYOUTS:
+            raise ValueError(f"알 수 없는 출력 방식입니다: {layout}")
+        if audio.get_sample_size(sample_format) != 2:
+            raise ValueError("동시 녹음은 16비트 샘플만 지원합니다.")
+        self.audio = audio
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.layout = layout
+        self.max_lag = max_lag
+        # 장치가 지원하는 채널 수가 더 적으면 그만큼만 녹음
+        self.captures = [
+            DeviceCapture(audio, index, name, sample_rate, self._device_channels(index, channels),
+                          chunk_size, sample_format)
+            for index, name in devices
+        ]
+        self.on_log: Callable[[str], None] = logger.info
+        self.writers: List[StreamingWavWriter] = []
+        self.frames_written = 0
+        self._silence = [0] * len(self.captures)
+        self._offsets = [0.0] * len(self.captures)
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def _device_channels(self, index, channels):
+        try:
+            available = int(self.audio.get_device_info_by_index(index).get('maxInputChannels', channels))
+        except Exception:
+            return channels
+        return max(1, min(channels, available))
+
+    @property
+    def is_recording(self) -> bool:
+        return self._running
+
+    def start(self, file_paths: Sequence[str]) -> None:
+        """녹음을 시작합니다. multichannel은 경로 하나, separate는 장치 수만큼 경로가 필요합니다."""
+        if self._running:
+            raise RuntimeError("이미 녹음 중입니다.")
+        expected = 1 if self.layout == "multichannel" else len(self.captures)
+        if len(file_paths) != expected:
+            raise ValueError(f"출력 파일 경로가 {expected}개 필요합니다.")
+
+        # 모든 장치가 이 샘플레이트로 열리는지 먼저 확인 (하나라도 안 되면 시작하지 않음)
+        for capture in self.captures:
+            try:
+                self.audio.is_format_supported(self.sample_rate, input_device=capture.index,
+                                               input_channels=capture.channels, input_format=capture.format)
+            except ValueError:
+                raise ValueError(f"장치 {capture.index}({capture.name})를 {self.sample_rate}Hz "
+                                 f"{capture.channels}채널로 열 수 없습니다.") from None
+
+        if self.layout == "multichannel":
+            total_channels = sum(capture.channels for capture in self.captures)
+            self.writers = [StreamingWavWriter(file_paths[0], total_channels, 2, self.sample_rate, rf64=True)]
+        else:
+            self.writers = [StreamingWavWriter(path, capture.channels, 2, self.sample_rate, rf64=True)
+                            for path, capture in zip(file_paths, self.captures)]
+
+        started = []
+        try:
+            for capture in self.captures:
+                capture.on_log = self.on_log
+                capture.start()
+                started.append(capture)
+        except Exception:
+            for capture in started:
+                capture.stop()
+            for writer in self.writers:
+                writer.close()
+            raise
+
+        self.frames_written = 0
+        self._silence = [0] * len(self.captures)
+        self._running = True
+        self._thread = threading.Thread(target=self._align, name="multi-align", daemon=True)
+        self._thread.start()
+        self.on_log(f"동시 녹음 시작: {', '.join(f'{c.index}: {c.name}' for c in self.captures)}")
+
+    def stop(self) -> MultiRecordingResult:
+        """캡처를 멈추고 버퍼에 남은 데이터까지 정렬해 기록한 뒤 파일을 닫습니다."""
+        self._running = False
+        for capture in self.captures:
+            capture.stop()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        for writer in self.writers:
+            try:
+                writer.close()
+            except Exception as e:
+                self.on_log(f"파일 기록 오류: {e}")
+
+        reports = [
+            DeviceReport(c.index, c.name, c.channels, c.stats.frames_captured, c.stats.overflows,
+                         c.clock.drift_ppm, self._offsets[i] * 1000.0, self._silence[i])
+            for i, c in enumerate(self.captures)
+        ]
+        result = MultiRecordingResult(
+            [writer.file_path for writer in self.writers], self.frames_written,
+            self.frames_written / float(self.sample_rate), reports
+        )
+        self.on_log(f"동시 녹음 통계: {result.summary}")
+        return result
+
+    # ------------------------------------------------------------------
+    # 정렬 스레드
+    # ------------------------------------------------------------------
+    def _wait_first_chunks(self):
+        """모든 장치의 첫 청크를 기다립니다. 끝내 오지 않는 장치는 무음으로 기록됩니다."""
+        deadline = shared_clock() + 2.0
+        for capture in self.captures:
+            capture.buffer.wait_for(1, deadline - shared_clock())
+        return [capture for capture in self.captures if capture.clock.ready]
+
+    def _align(self):
+        try:
+            self._align_loop()
+        except Exception as e:
+            logger.exception("동시 녹음 정렬 오류")
+            self.on_log(f"동시 녹음 정렬 오류: {e}")
+            self._running = False
+
+    def _align_loop(self):
+        ready = self._wait_first_chunks()
+        reference = self.captures[0]
+        if reference not in ready:
+            self.on_log(f"기준 장치 {reference.index}에서 데이터가 들어오지 않습니다.")
+            return
+
+        # 공통 시작 시각: 가장 늦게 시작한 장치의 첫 샘플 시각
+        starts = {id(c): c.clock.time_at(0) for c in ready}
+        common_start = max(starts.values())
+        for i, capture in enumerate(self.captures):
+            if id(capture) in starts:
+                self._offsets[i] = common_start - starts[id(capture)]
+        ref_pos = int(math.ceil(reference.clock.frame_at(common_start)))
+        positions = [c.clock.frame_at(common_start) if c.clock.ready else 0.0 for c in self.captures]
+
+        block = self.chunk_size
+        while True:
+            if not reference.buffer.wait_for(ref_pos + block, 0.1):
+                if self._running or not reference.buffer.finished:
+                    continue
+                # 녹음이 끝났으면 기준 장치에 남은 만큼만 처리하고 종료
+                block = reference.buffer.end - ref_pos
+                if block <= 0:
+                    break
+            deadline = shared_clock() + self.max_lag
+
+            ref_end = ref_pos + block
+            outputs = [reference.buffer.window(ref_pos, ref_end)]
+            end_time = reference.clock.time_at(ref_end)
+            ref_rate = reference.clock.rate
+            for i in range(1, len(self.captures)):
+                capture = self.captures[i]
+                outputs.append(self._resample_block(i, capture, positions, end_time, ref_rate, block, deadline))
+
+            reference.buffer.discard_before(ref_end)
+            ref_pos = ref_end
+            self._write(outputs)
+            if block < self.chunk_size:
+                break
+
+    def _resample_block(self, i, capture, positions, end_time, ref_rate, block, deadline):
+        """기준 장치의 block 프레임에 해당하는 구간을 장치 i의 버퍼에서 보간해 꺼냅니다."""
+        if not capture.clock.ready:
+            self._silence[i] += block
+            return np.zeros((block, capture.channels), dtype=np.float32)
+
+        start = positions[i]
+        # 클록 비율(장치 실제 샘플레이트 / 기준 장치 실제 샘플레이트) 근처에서 목표 위치를 따라감
+        nominal = capture.clock.rate / ref_rate
+        ratio = (capture.clock.frame_at(end_time) - start) / block
+        ratio = min(max(ratio, nominal * (1 - MAX_SLEW)), nominal * (1 + MAX_SLEW))
+        offsets = start + ratio * np.arange(block)
+        first = int(math.floor(offsets[0]))
+        last = int(math.floor(offsets[-1])) + 2
+
+        capture.buffer.wait_for(last, deadline - shared_clock())
+        missing = max(0, last - 1 - max(capture.buffer.end, first))
+        if missing:
+            self._silence[i] += min(block, missing)
+        window = capture.buffer.window(first, last)
+        index = np.floor(offsets).astype(np.int64) - first
+        frac = (offsets - np.floor(offsets))[:, None].astype(np.float32)
+        result = window[index] * (1 - frac) + window[index + 1] * frac
+
+        positions[i] = start + ratio * block
+        capture.buffer.discard_before(int(positions[i]) - 1)
+        return result
+
+    def _write(self, outputs):
+        blocks = [np.clip(np.round(block), -32768, 32767).astype('<i2') for block in outputs]
+        if self.layout == "multichannel":
+            self.writers[0].write(np.concatenate(blocks, axis=1).tobytes())
+        else:
+            for writer, block in zip(self.writers, blocks):
+                writer.write(block.tobytes())
+        self.frames_written += len(blocks[0])
@@ -0,0 +1,485 @@
+"""재생 엔진
+
+재생 전용 작업자 스레드 하나가 재생 큐를 처리합니다. 출력 스트림은 형식(샘플 폭, 채널,
+샘플레이트)별로 열어 두고 재사용하며, 동시에 열어 두는 스트림 수는 max_streams로 제한합니다.
+WAV 파일은 메모리 매핑으로 읽으므로 재생 시작과 위치 이동이 파일 크기와 무관하게 즉시 이루어집니다.
+여러 세그먼트로 나눠 저장한 녹음(세션 파일)은 세그먼트 경계 없이 한 파일처럼 재생합니다.
+"""
+import os
+import mmap
+import bisect
+import struct
+import threading
+import logging
+from collections import OrderedDict, deque
+from typing import Callable, Optional
+
+from session_manifest import SessionManifest, is_session
+
+logger = logging.getLogger(__name__)
+
+# 이 간격(초)마다 재생 위치를 알림
+POSITION_INTERVAL = 0.05
+
+
+class WavSource:
+    """메모리 매핑으로 여는 PCM WAV 파일입니다."""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self):
+        mm = self._mm
+        if len(mm) < 12 or mm[0:4] not in (b'RIFF', b'RF64') or mm[8:12] != b'WAVE':
+            raise ValueError(f"WAV 파일이 아닙니다: {self.file_path}")
+
+        fmt = None
+        data_offset = data_size = None
+        ds64_data_size = None
+        offset = 12
+        while offset + 8 <= len(mm):
+            chunk_id = mm[offset:offset + 4]
+            chunk_size = struct.unpack_from('<I', mm, offset + 4)[0]
+            body = offset + 8
+            if chunk_id == b'ds64':
+                # RF64: 32비트 크기 필드 대신 사용하는 64비트 data 크기
+                ds64_data_size = struct.unpack_from('<Q', mm, body + 8)[0]
+            elif chunk_id == b'fmt ':
+                fmt = struct.unpack_from('<HHIIHH', mm, body)
+            elif chunk_id == b'data':
+                if chunk_size == 0xFFFFFFFF and ds64_data_size is not None:
+                    chunk_size = ds64_data_size
+                data_offset, data_size = body, chunk_size
+                break
+            offset = body + chunk_size + (chunk_size & 1)
+
+        if fmt is None or data_offset is None:
+            raise ValueError(f"WAV 헤더를 읽을 수 없습니다: {self.file_path}")
+
+        _, self.channels, self.sample_rate, _, _, bits = fmt
+        self.sample_width = bits // 8
+        self.frame_size = self.channels * self.sample_width
+        # 헤더가 확정되지 않은 파일(녹음 중 등)은 실제 파일 길이까지 사용
+        available = len(mm) - data_offset
+        if data_size == 0 or data_size == 0xFFFFFFFF or data_size > available:
+            data_size = available
+        self.data_offset = data_offset
+        self.frames = data_size // self.frame_size
+
+    @property
+    def duration(self) -> float:
+        return self.frames / float(self.sample_rate) if self.sample_rate else 0.0
+
+    def read(self, frame: int, count: int) -> bytes:
+        """frame 위치부터 최대 count 프레임을 반환합니다."""
+        start = self.data_offset + frame * self.frame_size
+        end = self.data_offset + min(self.frames, frame + count) * self.frame_size
+        return self._mm[start:end] if end > start else b''
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        finally:
+            self._file.close()
+
+
+class SessionSource:
+    """세션 파일로 묶인 세그먼트들을 하나의 WavSource처럼 읽습니다."""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        manifest = SessionManifest.load(file_path)
+        self._sources = []
+        try:
+            for path in manifest.segment_paths(file_path):
+                source = WavSource(path)
+                self._sources.append(source)
+                if (source.sample_rate, source.channels, source.sample_width) != \
+                        (manifest.sample_rate, manifest.channels, manifest.sample_width):
+                    raise ValueError(f"세그먼트 형식이 세션과 다릅니다: {path}")
+        except Exception:
+            self.close()
+            raise
+
+        self.sample_rate = manifest.sample_rate
+        self.channels = manifest.channels
+        self.sample_width = manifest.sample_width
+        self.frame_size = self.channels * self.sample_width
+        # 세그먼트별 시작 프레임 (세션 파일 값 대신 실제 파일 길이 기준)
+        self._starts = []
+        frames = 0
+        for source in self._sources:
+            self._starts.append(frames)
+            frames += source.frames
+        self.frames = frames
+
+    @property
+    def duration(self) -> float:
+        return self.frames / float(self.sample_rate) if self.sample_rate else 0.0
+
+    def read(self, frame: int, count: int) -> bytes:
+        """frame 위치부터 최대 count 프레임을 반환합니다 (세그먼트 경계를 넘어 이어 읽음)."""
+        parts = []
+        index = bisect.bisect_right(self._starts, frame) - 1
+        while count > 0 and 0 <= index < len(self._sources):
+            data = self._sources[index].read(frame - self._starts[index], count)
+            if data:
+                parts.append(data)
+                read = len(data) // self.frame_size
+                frame += read
+                count -= read
+            index += 1
+        return parts[0] if len(parts) == 1 else b''.join(parts)
+
+    def close(self) -> None:
+        for source in self._sources:
+            source.close()
+        self._sources = []
+
+
+def open_source(file_path: str):
+    """WAV 파일이나 세션 파일을 읽기용으로 엽니다."""
+    if is_session(file_path):
+        return SessionSource(file_path)
+    return WavSource(file_path)
+
+
+class PlaybackItem:
+    """재생 큐의 항목 하나입니다."""
+
+    def __init__(self, file_path: str, start: float = 0.0):
+        self.file_path = file_path
+        self.start = start
+        self.status = "queued"  # queued, playing, done, stopped, failed
+        self.error: Optional[Exception] = None
+        self._done = threading.Event()
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.file_path)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """재생이 끝날 때까지 기다립니다."""
+        return self._done.wait(timeout)
+
+    def _finish(self, status, error=None):
+        self.status = status
+        self.error = error
+        self._done.set()
+
+
+class PlaybackEngine:
+    """출력 스트림을 재사용하는 단일 재생 엔진입니다.
+
+    진행 상황은 on_position(경로, 위치 초, 전체 초), on_state(상태, 경로), on_log(메시지) 콜백으로 알립니다.
+    콜백은 재생 스레드에서 호출되므로 GUI는 자체 이벤트 큐를 거쳐 반영해야 합니다.
+    """
+
+    def __init__(self, audio, chunk_frames: int = 1024, max_streams: int = 2):
+        self.audio = audio
+        self.chunk_frames = chunk_frames
+        self.max_streams = max(1, max_streams)
+
+        self.on_position: Optional[Callable[[str, float, float], None]] = None
+        self.on_state: Optional[Callable[[str, Optional[str]], None]] = None
+        self.on_log: Callable[[str], None] = logger.info
+
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._current: Optional[PlaybackItem] = None
+        self._paused = False
+        self._stop_current = False
+        self._seek_to: Optional[float] = None
+        self._closed = False
+        self._position = 0.0
+        self._duration = 0.0
+
+        # (샘플 폭, 채널, 샘플레이트) -> 출력 스트림 (가장 오래 안 쓴 것부터 닫음)
+        self._streams = OrderedDict()
+        self.streams_opened = 0
+
+        self._thread = threading.Thread(target=self._run, name="playback", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # 제어
+    # ------------------------------------------------------------------
+    @property
+    def state(self) -> str:
+        with self._cond:
+            if self._current is None and not self._queue:
+                return "stopped"
+            return "paused" if self._paused else "playing"
+
+    @property
+    def current_path(self) -> Optional[str]:
+        with self._cond:
+            return self._current.file_path if self._current else None
+
+    @property
+    def position(self) -> float:
+        return self._position
+
+    def play(self, file_path: str, start: float = 0.0) -> PlaybackItem:
+        """대기 중인 항목과 현재 재생을 멈추고 file_path를 start초 위치부터 바로 재생합니다."""
+        item = PlaybackItem(file_path, start)
+        with self._cond:
+            self._clear_queue()
+            self._stop_current = self._current is not None
+            self._paused = False
+            self._queue.append(item)
+            self._cond.notify_all()
+        return item
+
+    def enqueue(self, file_path: str) -> PlaybackItem:
+        """file_path를 재생 큐 끝에 추가합니다."""
+        item = PlaybackItem(file_path)
+        with self._cond:
+            self._queue.append(item)
+            self._cond.notify_all()
+        return item
+
+    def stop(self) -> None:
+        """현재 재생을 멈추고 재생 큐를 비웁니다."""
+        with self._cond:
+            self._clear_queue()
+            self._stop_current = self._current is not None
+            self._paused = False
+            self._cond.notify_all()
+
+    def cancel(self, item: PlaybackItem) -> None:
+        """항목 하나만 취소합니다 (재생 중이면 멈추고 다음 항목으로 넘어감)."""
+        with self._cond:
+            if item is self._current:
+                self._stop_current = True
+                self._paused = False
+            elif item in self._queue:
+                self._queue.remove(item)
+                item._finish("stopped")
+            self._cond.notify_all()
+
+    def pause(self) -> None:
+        with self._cond:
+            if self._current is not None:
+                self._paused = True
+                self._cond.notify_all()
+
+    def resume(self) -> None:
+        with self._cond:
+            self._paused = False
+            self._cond.notify_all()
+
+    def toggle_pause(self) -> None:
+        """일시정지 상태를 전환합니다."""
+        with self._cond:
+            if self._paused:
+                self._paused = False
+            elif self._current is not None:
+                self._paused = True
+            self._cond.notify_all()
+
+    def seek(self, seconds: float) -> None:
+        """현재 항목의 재생 위치를 옮깁니다."""
+        with self._cond:
+            if self._current is not None:
+                self._seek_to = max(0.0, seconds)
+                self._cond.notify_all()
+
+    def play_file(self, file_path: str, stop_event: Optional[threading.Event] = None) -> None:
+        """file_path를 재생하고 끝날 때까지 기다립니다 (호출한 스레드에서 블로킹).
+
+        stop_event가 설정되면 재생을 멈춥니다. TTS 작업자의 재생 함수로 사용합니다.
+        """
+        item = self.play(file_path)
+        while not item.wait(0.02):
+            if stop_event is not None and stop_event.is_set():
+                self.cancel(item)
+                item.wait()
+                break
+        if item.status == "failed":
+            raise item.error
+
+    def close(self) -> None:
+        """재생을 멈추고 열려 있는 출력 스트림을 모두 닫습니다."""
+        with self._cond:
+            self._clear_queue()
+            self._stop_current = True
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=2.0)
+        for stream in self._streams.values():
+            self._close_stream(stream)
+        self._streams.clear()
+
+    def release_streams(self) -> bool:
+        """재생할 것이 없으면 열어 둔 출력 스트림을 모두 닫고 True를 반환합니다 (PortAudio 재초기화 전).
+
+        재생 중이거나 대기 중인 항목이 있으면 그대로 두고 False를 반환합니다.
+        """
+        with self._cond:
+            if self._current is not None or self._queue:
+                return False
+            streams = list(self._streams.values())
+            self._streams.clear()
+        for stream in streams:
+            self._close_stream(stream)
+        return True
+
+    def _clear_queue(self):
+        while self._queue:
+            self._queue.popleft()._finish("stopped")
+
+    # ------------------------------------------------------------------
+    # 출력 스트림
+    # ------------------------------------------------------------------
+    def _get_stream(self, source: WavSource):
+        key = (source.sample_width, source.channels, source.sample_rate)
+        stream = self._streams.get(key)
+        if stream is not None:
+            self._streams.move_to_end(key)
+            if stream.is_stopped():
+                stream.start_stream()
+            return stream
+
+        stream = self.audio.open(
+            format=self.audio.get_format_from_width(source.sample_width),
+            channels=source.channels,
+            rate=source.sample_rate,
+            output=True,
+            frames_per_buffer=self.chunk_frames
+        )
+        self.streams_opened += 1
+        self._streams[key] = stream
+        while len(self._streams) > self.max_streams:
+            _, old = self._streams.popitem(last=False)
+            self._close_stream(old)
+        return stream
+
+    def _idle_streams(self):
+        """재생할 것이 없을 때 스트림은 열어 둔 채로 멈춰 둡니다."""
+        for stream in self._streams.values():
+            try:
+                if not stream.is_stopped():
+                    stream.stop_stream()
+            except Exception as e:
+                logger.error(f"출력 스트림 정지 오류: {e}")
+
+    @staticmethod
+    def _close_stream(stream):
+        try:
+            stream.stop_stream()
+            stream.close()
+        except Exception as e:
+            logger.error(f"출력 스트림 닫기 오류: {e}")
+
+    # ------------------------------------------------------------------
+    # 재생 스레드
+    # ------------------------------------------------------------------
+    def _notify_state(self, state, path=None):
+        if self.on_state:
+            try:
+                self.on_state(state, path)
+            except Exception as e:
+                logger.error(f"재생 상태 알림 오류: {e}")
+
+    def _notify_position(self, path):
+        if self.on_position:
+            try:
+                self.on_position(path, self._position, self._duration)
+            except Exception as e:
+                logger.error(f"재생 위치 알림 오류: {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and not self._queue:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                item = self._current = self._queue.popleft()
+                self._stop_current = False
+                self._seek_to = item.start or None
+
+            status, error = self._play_item(item)
+
+            with self._cond:
+                self._current = None
+                self._paused = False
+                idle = not self._queue
+            item._finish(status, error)
+            if status == "failed":
+                self.on_log(f"재생 오류 ({item.name}): {error}")
+            if idle:
+                self._idle_streams()
+                self._notify_state("stopped", None)
+
+    def _play_item(self, item):
+        try:
+            source = open_source(item.file_path)
+        except Exception as e:
+            return "failed", e
+
+        try:
+            stream = self._get_stream(source)
+            item.status = "playing"
+            self._duration = source.duration
+            self._position = 0.0
+            self._notify_state("playing", item.file_path)
+
+            frame = 0
+            report_frames = max(1, int(source.sample_rate * POSITION_INTERVAL))
+            last_report = -report_frames
+            while True:
+                with self._cond:
+                    if self._paused and not self._stop_current and not self._closed:
+                        if not stream.is_stopped():
+                            stream.stop_stream()
+                            self._notify_state("paused", item.file_path)
+                        while self._paused and not self._stop_current and not self._closed and self._seek_to is None:
+                            self._cond.wait()
+                    if self._stop_current or self._closed:
+                        return "stopped", None
+                    if not self._paused and stream.is_stopped():
+                        stream.start_stream()
+                        self._notify_state("playing", item.file_path)
+                    if self._seek_to is not None:
+                        frame = min(source.frames, int(self._seek_to * source.sample_rate))
+                        self._seek_to = None
+                        last_report = -report_frames
+                    paused = self._paused
+
+                if paused:
+                    # 일시정지 중 위치 이동: 위치만 알리고 계속 대기
+                    self._position = frame / float(source.sample_rate)
+                    self._notify_position(item.file_path)
+                    continue
+
+                data = source.read(frame, self.chunk_frames)
+                if not data:
+                    break
+                stream.write(data)
+                frame += len(data) // source.frame_size
+
+                if frame - last_report >= report_frames:
+                    self._position = frame / float(source.sample_rate)
+                    self._notify_position(item.file_path)
+                    last_report = frame
+
+            self._position = self._duration
+            self._notify_position(item.file_path)
+            return "done", None
+        except Exception as e:
+            return "failed", e
+        finally:
+            source.close()
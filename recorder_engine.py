@@ -0,0 +1,791 @@
+"""녹음 엔진
+
+장치 조회, 녹음(블로킹/콜백 캡처), 레벨 측정, 입력 모니터(스펙트럼), 파일 재생을 담당합니다.
+Tk에 의존하지 않으므로 GUI 없이 스크립트나 CLI에서 바로 사용할 수 있습니다.
+"""
+import threading
+import queue
+import time
+import logging
+import functools
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+import pyaudio
+
+from audio_meter import AudioMeter, SILENCE_DBFS
+from capture import CallbackCapture
+from capture_profiles import CaptureProfile
+from capture_stats import CaptureStats, OverflowDetector, StatsExporter, stream_clock
+from device_probe import DeviceProber
+from playback_engine import open_source
+from resampler import StreamingResampler
+from segment_writer import SegmentPolicy, SegmentedWavWriter
+from spectrum import LiveMonitor
+from vad import VAD_MODES, SpeechSegment, VoiceActivityDetector
+from wav_writer import StreamingWavWriter
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_MODES = ("blocking", "callback")
+
+# 녹음 대기 중 링 버퍼에 프리롤 외에 더 잡아 두는 여유 (녹음을 시작한 뒤 기록이 잠시 밀려도 잃지 않도록)
+ARM_HEADROOM_SECONDS = 2.0
+
+
+def _uses_audio(method):
+    """PortAudio를 다시 초기화하는 중이면 기다리지 않고 실패하고, 실행하는 동안에는 재초기화를 막습니다."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self._audio_lock.acquire(blocking=False):
+            raise RuntimeError("오디오 장치를 다시 찾는 중입니다. 잠시 후 다시 시도하세요.")
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._audio_lock.release()
+    return wrapper
+
+
+@dataclass
+class RecordingResult:
+    """녹음 종료 결과 (분할 녹음이면 files에 세그먼트 임시 파일이 순서대로 들어 있음)
+
+    peak_dbfs는 녹음 중 레벨 측정에서 얻은 피크입니다. 분석을 건너뛴 청크가 있으면 None입니다.
+    """
+    path: str
+    frames: int
+    duration: float
+    summary: str
+    segments: List[SpeechSegment] = field(default_factory=list)
+    files: List[str] = field(default_factory=list)
+    peak_dbfs: Optional[float] = None
+
+
+class RecordingEngine:
+    """녹음 세션 하나를 관리하는 엔진입니다.
+
+    진행 상황은 on_level(레벨 0-100), on_log(메시지), on_error(예외) 콜백으로 알립니다.
+    콜백은 녹음 스레드에서 호출되므로 GUI는 자체 이벤트 큐를 거쳐 반영해야 합니다.
+    """
+
+    def __init__(self, audio=None, sample_rate: int = 44100, chunk_size: int = 1024,
+                 channels: int = 1, sample_format: int = pyaudio.paInt16):
+        self.audio = audio or pyaudio.PyAudio()
+        # 직접 만든 백엔드만 다시 초기화할 수 있음 (reinitialize_audio)
+        self._audio_factory = None if audio else pyaudio.PyAudio
+        self._audio_lock = threading.RLock()
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.channels = channels
+        self.format = sample_format
+        self.meter = AudioMeter(chunk_size, channels)
+
+        self.on_level: Optional[Callable[[int], None]] = None
+        self.on_log: Callable[[str], None] = logger.info
+        self.on_error: Optional[Callable[[Exception], None]] = None
+
+        # 이 청크 수만큼 무음이 이어지면 경고 (약 5초)
+        self.silence_warning_chunks = 50
+        
+        # 음성 구간 감지 (off, keep: 구간만 기록, drop: 무음 제거, compress: 무음 단축)
+        self.vad_mode = "off"
+        self.vad: Optional[VoiceActivityDetector] = None
+
+        # 장치가 sample_rate를 지원하지 않으면 장치 기본 샘플레이트로 캡처한 뒤 변환
+        self.capture_rate = sample_rate
+        self.capture_chunk = chunk_size
+        self.resampler: Optional[StreamingResampler] = None
+
+        # 장치 형식 확인 결과가 있으면 스트림을 열기 전에 지원 여부를 판단 (없으면 is_format_supported로 확인)
+        self.capabilities: Optional[DeviceProber] = None
+
+        # 캡처 계측 (오버플로, 읽기 지연, 손실 프레임, 기록 큐 깊이)
+        # stats_export_path를 지정하면 녹음 중 stats_export_interval초마다 파일로 내보냄 (.prom이면 Prometheus 형식)
+        self.stats = CaptureStats()
+        self.stats_export_path: Optional[str] = None
+        self.stats_export_interval = 5.0
+        self._exporter: Optional[StatsExporter] = None
+
+        # 녹음 대기: 입력 스트림을 열어 둔 채 최근 preroll_seconds초를 링 버퍼에 보관하고,
+        # start하면 스트림을 새로 열지 않고 프리롤부터 기록
+        self.preroll_seconds = 2.0
+        self._armed: Optional[CallbackCapture] = None
+        self._armed_device: Optional[int] = None
+        self._monitor: Optional[threading.Thread] = None
+        self._monitor_stop = threading.Event()
+
+        # 입력 모니터: 캡처한 청크를 모두 스펙트럼 분석기로 복사 (녹음 중에는 녹음 스트림,
+        # 녹음 대기 중에는 대기 스트림을 쓰고, 둘 다 없으면 입력을 따로 엶)
+        self.monitor: Optional[LiveMonitor] = None
+        self._monitor_device: Optional[int] = None
+        self._monitor_capture: Optional[CallbackCapture] = None
+        self._monitor_thread: Optional[threading.Thread] = None
+
+        # 분할 녹음 기준 (None이면 파일 하나에 기록하고, 4GB를 넘으면 RF64로 전환)
+        self.segment_policy: Optional[SegmentPolicy] = None
+
+        self.stream = None
+        self.writer = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._silent_chunks = 0
+        # 콜백 녹음에서 분석이 밀려 측정하지 못한 청크 수
+        self._analysis_skipped = 0
+
+    def apply_profile(self, profile: CaptureProfile) -> None:
+        """녹음 프로필(샘플레이트, 채널, 샘플 폭, 버퍼 크기)을 적용합니다."""
+        if self._running:
+            raise RuntimeError("녹음 중에는 프로필을 바꿀 수 없습니다.")
+        armed, device_index = self.armed, self._armed_device
+        self.disarm()
+        self._close_monitor_capture()
+        self.sample_rate = profile.sample_rate
+        self.channels = profile.channels
+        self.chunk_size = profile.chunk_size
+        self.format = self.audio.get_format_from_width(profile.sample_width)
+        self.meter = AudioMeter(self.chunk_size, self.channels)
+        self.on_log(f"녹음 프로필: {profile.describe()}")
+        if armed:
+            # 새 형식으로 대기 스트림을 다시 엶
+            self.arm(device_index, self.preroll_seconds)
+        self._resume_monitor()
+
+    @property
+    def sample_width(self) -> int:
+        return self.audio.get_sample_size(self.format)
+
+    @property
+    def is_recording(self) -> bool:
+        return self._running
+
+    # ------------------------------------------------------------------
+    # 장치
+    # ------------------------------------------------------------------
+    def reinitialize_audio(self):
+        """열린 입력 스트림이 없으면 PortAudio를 다시 초기화하고 새 오디오 객체를 반환합니다.
+
+        PortAudio는 초기화할 때의 장치 목록을 유지하므로 새로 꽂거나 뺀 장치는 이렇게 해야 보입니다.
+        녹음, 녹음 대기, 입력 모니터 중이거나 audio를 넘겨받아 만든 엔진이면 그대로 두고 None을 반환합니다.
+        같은 오디오 객체로 연 다른 스트림(재생 등)은 부르기 전에 닫아야 합니다.
+        """
+        if self._audio_factory is None:
+            return None
+        with self._audio_lock:
+            if (self._running or self.writer is not None or self._armed is not None
+                    or self._monitor_capture is not None):
+                return None
+            self.audio.terminate()
+            self.audio = self._audio_factory()
+        self.on_log("오디오 백엔드를 다시 초기화했습니다.")
+        return self.audio
+
+    def negotiate_rate(self, device_index: Optional[int] = None) -> int:
+        """장치가 sample_rate로 열리면 그대로, 아니면 장치 기본 샘플레이트를 반환합니다.
+
+        확인해 둔 장치 형식이 있으면 그것으로 고르고, 현재 샘플 폭과 채널 수를 어떤 샘플레이트로도
+        열 수 없으면 스트림을 열어 보기 전에 ValueError를 냅니다.
+        """
+        device = self.capabilities.find(device_index) if self.capabilities else None
+        if device is not None and device.probed:
+            rate = device.best_rate(self.sample_rate, self.sample_width, self.channels)
+            if rate is None:
+                raise ValueError(f"{device.name} 장치는 {self.sample_width * 8}bit {self.channels}채널 녹음을 "
+                                 f"지원하지 않습니다 ({device.describe()}).")
+            return rate
+
+        try:
+            if device_index is None:
+                device_info = self.audio.get_default_input_device_info()
+            else:
+                device_info = self.audio.get_device_info_by_index(device_index)
+        except Exception as e:
+            logger.error(f"장치 정보 조회 오류: {e}")
+            return self.sample_rate
+
+        default_rate = int(device_info.get('defaultSampleRate', self.sample_rate))
+        for rate in (self.sample_rate, default_rate):
+            try:
+                self.audio.is_format_supported(
+                    rate,
+                    input_device=device_info.get('index', device_index),
+                    input_channels=self.channels,
+                    input_format=self.format
+                )
+                return rate
+            except ValueError:
+                continue
+        raise ValueError(f"{device_info.get('name', device_index)} 장치는 {self.sample_width * 8}bit "
+                         f"{self.channels}채널 녹음을 지원하지 않습니다.")
+
+    def _capture_format(self, device_index: Optional[int]) -> Tuple[int, int]:
+        """장치에서 실제로 열 (샘플레이트, 청크 프레임 수)를 정합니다."""
+        rate = self.negotiate_rate(device_index)
+        if rate == self.sample_rate:
+            return rate, self.chunk_size
+        if self.sample_width != 2:
+            raise ValueError("샘플레이트 변환은 16비트 녹음에서만 지원합니다.")
+        return rate, max(1, round(self.chunk_size * rate / self.sample_rate))
+
+    def default_device_names(self) -> Tuple[str, str]:
+        """기본 입력/출력 장치 이름을 반환합니다."""
+        default_input = self.audio.get_default_input_device_info().get('name', '알 수 없음')
+        default_output = self.audio.get_default_output_device_info().get('name', '알 수 없음')
+        return default_input, default_output
+
+    # ------------------------------------------------------------------
+    # 녹음
+    # ------------------------------------------------------------------
+    @_uses_audio
+    def start(self, file_path: str, device_index: Optional[int] = None,
+              capture_mode: str = "blocking") -> None:
+        """file_path에 기록하는 녹음을 시작합니다. 캡처는 별도 스레드에서 진행됩니다."""
+        if self._running:
+            raise RuntimeError("이미 녹음 중입니다.")
+        if capture_mode not in CAPTURE_MODES:
+            raise ValueError(f"알 수 없는 캡처 방식입니다: {capture_mode}")
+        if self.vad_mode not in VAD_MODES:
+            raise ValueError(f"알 수 없는 VAD 모드입니다: {self.vad_mode}")
+
+        self.vad = None
+        if self.vad_mode != "off":
+            self.vad = VoiceActivityDetector(
+                self.sample_rate, self.channels, self.sample_width, mode=self.vad_mode
+            )
+
+        if self._armed is not None:
+            if device_index != self._armed_device:
+                self.on_log("선택한 장치가 달라 녹음 대기 스트림을 다시 엽니다.")
+                self.arm(device_index, self.preroll_seconds)
+            # 링 버퍼의 최근 preroll_seconds초부터 읽어 녹음 앞에 붙임.
+            # 대기 중 덮어쓴 데이터는 손실이 아니므로 손실 계수도 여기서 초기화
+            armed = self._armed
+            armed.ring.seek_latest(int(self.preroll_seconds * armed.rate) * armed.channels * self.sample_width)
+            armed.ring.overrun_bytes = 0
+            armed.input_overflows = 0
+            capture_mode = "callback"
+            self.capture_rate, self.capture_chunk = armed.rate, armed.chunk_size
+        else:
+            # 지원하지 않는 형식이면 파일을 만들거나 스트림을 열기 전에 실패
+            self.capture_rate, self.capture_chunk = self._capture_format(device_index)
+
+        if self.segment_policy is not None and self.segment_policy.enabled:
+            self.writer = SegmentedWavWriter(
+                file_path,
+                channels=self.channels,
+                sample_width=self.sample_width,
+                sample_rate=self.sample_rate,
+                policy=self.segment_policy,
+                rf64=True
+            )
+            self.on_log(f"분할 녹음: {self.segment_policy.describe()}")
+        else:
+            self.writer = StreamingWavWriter(
+                file_path,
+                channels=self.channels,
+                sample_width=self.sample_width,
+                sample_rate=self.sample_rate,
+                rf64=True
+            )
+        self.resampler = None
+        if self.capture_rate != self.sample_rate:
+            self.resampler = StreamingResampler(self.capture_rate, self.sample_rate, self.channels)
+            self.on_log(f"장치가 {self.sample_rate}Hz를 지원하지 않아 {self.capture_rate}Hz로 캡처한 뒤 변환합니다.")
+
+        self.meter.reset()
+        self._analysis_skipped = 0
+        self.stats.reset(self.capture_rate, self.capture_chunk, capture_mode)
+        self._exporter = None
+        if self.stats_export_path:
+            self._exporter = StatsExporter(self.stats, self.stats_export_path, self.stats_export_interval)
+            self._exporter.start()
+        self._silent_chunks = 0
+        self._running = True
+        # 모니터는 이제 녹음 스트림에서 데이터를 받음 (따로 연 입력은 닫음)
+        self._sync_monitor_source()
+        if self.monitor is not None:
+            self.monitor.configure(self.capture_rate, self.channels)
+
+        self._thread = threading.Thread(
+            target=self._record, args=(device_index, capture_mode), name="recorder", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> RecordingResult:
+        """녹음을 멈추고 파일을 확정합니다."""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.stats.stop()
+
+        if self.stream:
+            try:
+                self.stream.stop_stream()
+                self.stream.close()
+                self.on_log("스트림 닫기 성공")
+            except Exception as e:
+                self.on_log(f"스트림 닫기 오류: {e}")
+            self.stream = None
+
+        if self.writer is None:
+            raise RuntimeError("녹음 중이 아닙니다.")
+        vad = self.vad
+        try:
+            # 변환기와 VAD에 남아 있는 꼬리까지 기록
+            if self.resampler:
+                self._write(self.resampler.flush())
+            if vad:
+                tail = vad.flush()
+                if tail:
+                    self.writer.write(tail)
+        except Exception as e:
+            self.on_log(f"파일 기록 오류: {e}")
+        writer, self.writer = self.writer, None
+        self.vad = None
+        self.resampler = None
+        try:
+            writer.close()
+        except Exception as e:
+            self.on_log(f"파일 기록 오류: {e}")
+        if self._exporter:
+            self._exporter.stop()
+            self._exporter = None
+
+        summary = f"{self.meter.summary()}, {self.stats.summary()}"
+        segments = []
+        if vad:
+            summary = f"{summary}, {vad.summary()}"
+            segments = vad.segments
+        self.on_log(f"녹음 통계: {summary}")
+        self._resume_monitor()
+        files = list(getattr(writer, "paths", [writer.file_path]))
+        # 모든 청크를 측정했으면 그 피크를 색인에 그대로 쓸 수 있음 (파일을 다시 읽지 않음)
+        peak_dbfs = self.meter.peak_dbfs if not self._analysis_skipped else None
+        return RecordingResult(writer.file_path, writer.frames_written, writer.duration, summary, segments, files,
+                               peak_dbfs)
+
+    def record_for(self, file_path: str, seconds: float, device_index: Optional[int] = None,
+                   capture_mode: str = "blocking") -> RecordingResult:
+        """지정한 시간 동안 녹음하고 결과를 반환합니다."""
+        self.start(file_path, device_index, capture_mode)
+        try:
+            deadline = time.monotonic() + seconds
+            while self._running and time.monotonic() < deadline:
+                time.sleep(0.05)
+        finally:
+            result = self.stop()
+        return result
+
+    def _record(self, device_index, capture_mode):
+        try:
+            if self._armed is not None:
+                self._record_callback(device_index, self._armed)
+            elif capture_mode == "callback":
+                self._record_callback(device_index)
+            else:
+                self._record_blocking(device_index)
+        except Exception as e:
+            self.on_log(f"녹음 스트림 생성 오류: {e}")
+            self._running = False
+            if self.on_error:
+                self.on_error(e)
+
+    def _record_blocking(self, device_index):
+        """stream.read를 반복 호출하는 방식으로 녹음합니다."""
+        self.stream = self.audio.open(
+            format=self.format,
+            channels=self.channels,
+            rate=self.capture_rate,
+            input=True,
+            input_device_index=device_index,
+            frames_per_buffer=self.capture_chunk
+        )
+
+        self.on_log(f"녹음 스트림 생성 성공 (장치 ID: {device_index if device_index is not None else '기본'})")
+        self.stats.start()
+
+        frame_bytes = self.channels * self.sample_width
+        overflow = OverflowDetector(self.capture_rate, self.capture_chunk)
+        clock = None
+        while self._running:
+            started = time.perf_counter()
+            try:
+                # 오버플로 예외를 내면 이미 받은 청크까지 버려지므로 데이터는 받고 오버플로는 따로 셈
+                raw = self.stream.read(self.capture_chunk, exception_on_overflow=False)
+            except Exception as e:
+                self.stats.record_error()
+                self.on_log(f"녹음 중 오류: {e}")
+                break
+            frames = len(raw) // frame_bytes
+            self.stats.record_read(time.perf_counter() - started, frames)
+            if clock is None:
+                clock = stream_clock(self.stream)
+            if overflow.observe(clock(), frames, self._read_available()):
+                self.stats.record_overflow()
+                if self.stats.overflows == 1 or self.stats.overflows % 100 == 0:
+                    self.on_log(f"입력 오버플로 {self.stats.overflows}회 (녹음은 계속됩니다)")
+            self._feed_monitor(raw)
+
+            try:
+                data = self._convert(raw)
+                if data:
+                    self._write(data)
+                    self.analyze(data)
+            except Exception as e:
+                self.stats.record_error()
+                self.on_log(f"녹음 중 오류: {e}")
+                break
+
+        self.on_log(
+            f"캡처 통계 (블로킹): 입력 오버플로 {self.stats.overflows}회, 읽기 오류 {self.stats.read_errors}회"
+        )
+
+    def _read_available(self):
+        try:
+            return self.stream.get_read_available()
+        except Exception:
+            return 0
+
+    def _record_callback(self, device_index, capture: Optional[CallbackCapture] = None):
+        """stream_callback과 링 버퍼를 사용해 녹음합니다.
+
+        capture가 주어지면 녹음 대기 중 열어 둔 스트림을 그대로 쓰고, 끝나도 닫지 않습니다.
+        """
+        owned = capture is None
+        if owned:
+            capture = CallbackCapture(
+                self.audio,
+                format=self.format,
+                channels=self.channels,
+                rate=self.capture_rate,
+                chunk_size=self.capture_chunk,
+                device_index=device_index,
+                stats=self.stats
+            )
+            capture.start()
+        self.stats.start()
+
+        if owned:
+            self.on_log(f"콜백 녹음 스트림 생성 성공 (장치 ID: {device_index if device_index is not None else '기본'})")
+        else:
+            preroll = capture.ring.available / float(capture.rate * capture.channels * self.sample_width)
+            self.on_log(f"녹음 대기 스트림에서 녹음 시작 (프리롤 {preroll:.2f}초 포함)")
+
+        # 분석(레벨, 무음 감지)은 별도 작업자가 처리하며, 밀리면 건너뜀
+        analysis_queue = queue.Queue(maxsize=32)
+        analysis_thread = threading.Thread(target=self._analysis_worker, args=(analysis_queue,), daemon=True)
+        analysis_thread.start()
+        skipped = 0
+
+        def dispatch(data):
+            nonlocal skipped
+            self.stats.ring_dropped_bytes = capture.dropped_bytes
+            if owned:
+                # 녹음 대기 스트림은 대기 감시 스레드가 모니터에 넘김
+                self._feed_monitor(data)
+            data = self._convert(data)
+            if not data:
+                return
+            self._write(data)
+            try:
+                analysis_queue.put_nowait(data)
+            except queue.Full:
+                skipped += 1
+
+        try:
+            while self._running:
+                data = capture.read_chunk(timeout=0.5)
+                if data:
+                    dispatch(data)
+        finally:
+            if owned:
+                capture.stop()
+                # 스트림을 닫은 뒤 링 버퍼에 남은 데이터까지 기록
+                while True:
+                    data = capture.read_chunk(timeout=0)
+                    if not data:
+                        break
+                    dispatch(data)
+            analysis_queue.put(None)
+            analysis_thread.join(timeout=1.0)
+            self._analysis_skipped = skipped + analysis_thread.is_alive()
+
+        self.on_log(
+            f"캡처 통계 (콜백): 입력 오버플로 {capture.input_overflows}회, "
+            f"버퍼 초과 손실 {capture.dropped_bytes}바이트, 분석 생략 {skipped}청크"
+        )
+
+    def _feed_monitor(self, data):
+        monitor = self.monitor
+        if monitor is not None:
+            monitor.feed(data)
+
+    def _convert(self, data):
+        """캡처 샘플레이트가 다르면 녹음 샘플레이트로 변환합니다."""
+        if self.resampler is not None:
+            return self.resampler.process(data)
+        return data
+
+    def _write(self, data):
+        """VAD를 거쳐 남은 데이터만 파일에 기록합니다."""
+        if not data:
+            return
+        if self.vad is not None:
+            data = self.vad.process(data)
+            if not data:
+                return
+        self.writer.write(data)
+        self.stats.record_queue_depth(self.writer.queue_depth)
+
+    def _analysis_worker(self, analysis_queue):
+        """분석 큐에 쌓인 청크를 모아서 한 번에 처리합니다."""
+        running = True
+        while running:
+            batch = [analysis_queue.get()]
+            while True:
+                try:
+                    batch.append(analysis_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                batch = batch[:batch.index(None)]
+                running = False
+            if batch:
+                self.analyze(b''.join(batch))
+
+    def analyze(self, data: bytes) -> None:
+        """하나 이상의 청크에 대해 레벨 측정과 무음 감지를 수행합니다."""
+        try:
+            readings = self.meter.measure_batch(data)
+        except Exception as e:
+            logger.error(f"오디오 레벨 계산 오류: {e}")
+            return
+
+        # 오디오 레벨 알림 (가장 최근 청크 기준)
+        if self.on_level:
+            self.on_level(readings[-1].level)
+
+        # 무음 감지 (너무 오랫동안 무음이면 경고)
+        for reading in readings:
+            if reading.dbfs < SILENCE_DBFS:
+                self._silent_chunks += 1
+                if self._silent_chunks >= self.silence_warning_chunks:
+                    self.on_log("주의: 오디오 입력이 감지되지 않습니다. 마이크가 제대로 연결되어 있는지 확인하세요.")
+                    self._silent_chunks = 0
+            else:
+                self._silent_chunks = 0
+
+    # ------------------------------------------------------------------
+    # 녹음 대기 (프리롤)
+    # ------------------------------------------------------------------
+    @property
+    def armed(self) -> bool:
+        return self._armed is not None
+
+    @_uses_audio
+    def arm(self, device_index: Optional[int] = None, preroll_seconds: float = 2.0) -> None:
+        """입력 스트림을 미리 열어 두고 최근 preroll_seconds초를 계속 보관합니다.
+
+        대기 중에 start하면 스트림을 새로 열지 않고 보관해 둔 프리롤부터 파일에 기록합니다.
+        메모리는 링 버퍼 크기(프리롤 + ARM_HEADROOM_SECONDS)로 고정됩니다.
+        """
+        if self._running:
+            raise RuntimeError("녹음 중에는 녹음 대기를 바꿀 수 없습니다.")
+        self.disarm()
+        rate, chunk = self._capture_format(device_index)
+        capture = CallbackCapture(
+            self.audio,
+            format=self.format,
+            channels=self.channels,
+            rate=rate,
+            chunk_size=chunk,
+            device_index=device_index,
+            buffer_seconds=preroll_seconds + ARM_HEADROOM_SECONDS,
+            stats=self.stats
+        )
+        self._close_monitor_capture()
+        capture.start()
+        self._armed = capture
+        self._armed_device = device_index
+        self.preroll_seconds = preroll_seconds
+        if self.monitor is not None:
+            self.monitor.configure(rate, self.channels)
+
+        self._monitor_stop.clear()
+        self._monitor = threading.Thread(target=self._armed_monitor, args=(capture,), name="armed-monitor", daemon=True)
+        self._monitor.start()
+        self.on_log(f"녹음 대기: 입력을 열어 두고 최근 {preroll_seconds:g}초를 보관합니다 "
+                    f"(장치 ID: {device_index if device_index is not None else '기본'}, "
+                    f"버퍼 {capture.ring.capacity // 1024}KB)")
+
+    def disarm(self) -> None:
+        """녹음 대기를 끝내고 열어 둔 입력 스트림을 닫습니다."""
+        if self._armed is None:
+            return
+        if self._running:
+            raise RuntimeError("녹음 중에는 녹음 대기를 해제할 수 없습니다.")
+        capture, self._armed = self._armed, None
+        self._monitor_stop.set()
+        if self._monitor is not None:
+            self._monitor.join(timeout=1.0)
+            self._monitor = None
+        capture.stop()
+        self.on_log("녹음 대기 해제")
+        self._resume_monitor()
+
+    def _armed_monitor(self, capture: CallbackCapture):
+        """대기 중에는 링 버퍼의 최근 청크로 레벨을 알리고, 입력 모니터가 켜져 있으면
+        새로 들어온 데이터를 모두 넘깁니다 (어느 쪽도 버퍼에서 꺼내지 않음)."""
+        meter = AudioMeter(capture.chunk_size, capture.channels)
+        position = capture.ring.write_position
+        while not self._monitor_stop.wait(0.05):
+            # 녹음 중에도 모니터에는 계속 여기서 넘김 (프리롤을 두 번 분석하지 않도록)
+            if self.monitor is not None:
+                data, position = capture.ring.copy_since(position)
+                if data:
+                    self.monitor.feed(data)
+            else:
+                position = capture.ring.write_position
+            if self._running or not self.on_level:
+                # 녹음 중 레벨은 녹음 경로가 알림
+                continue
+            data = capture.ring.peek_latest(capture.chunk_bytes)
+            if data:
+                try:
+                    self.on_level(meter.measure(data).level)
+                except Exception as e:
+                    logger.error(f"오디오 레벨 계산 오류: {e}")
+
+    # ------------------------------------------------------------------
+    # 입력 모니터 (스펙트럼)
+    # ------------------------------------------------------------------
+    @_uses_audio
+    def start_monitor(self, device_index: Optional[int] = None) -> LiveMonitor:
+        """입력 모니터를 시작합니다. 녹음이나 녹음 대기와 함께 계속 켜 둘 수 있습니다.
+
+        녹음 중이면 녹음 스트림, 녹음 대기 중이면 대기 스트림의 데이터를 분석하고,
+        둘 다 없을 때만 device_index 입력을 콜백 방식으로 따로 엽니다.
+        """
+        self.stop_monitor()
+        rate = self.capture_rate if self._running else None
+        if self._armed is not None:
+            rate = self._armed.rate
+        if rate is None:
+            rate = self._capture_format(device_index)[0]
+        monitor = LiveMonitor(rate, self.channels)
+        monitor.start()
+        self.monitor = monitor
+        self._monitor_device = device_index
+        try:
+            self._sync_monitor_source()
+        except Exception:
+            self.stop_monitor()
+            raise
+        return monitor
+
+    def stop_monitor(self) -> None:
+        """입력 모니터를 끄고 따로 연 입력이 있으면 닫습니다."""
+        monitor, self.monitor = self.monitor, None
+        self._close_monitor_capture()
+        if monitor is not None:
+            monitor.stop()
+
+    @_uses_audio
+    def _sync_monitor_source(self) -> None:
+        """녹음 스트림이나 녹음 대기 스트림이 없을 때만 모니터용 입력을 열어 둡니다."""
+        wanted = self.monitor is not None and not self._running and self._armed is None
+        if not wanted:
+            self._close_monitor_capture()
+        elif self._monitor_capture is None:
+            rate, chunk = self._capture_format(self._monitor_device)
+            self.monitor.configure(rate, self.channels)
+            capture = CallbackCapture(
+                self.audio,
+                format=self.format,
+                channels=self.channels,
+                rate=rate,
+                chunk_size=chunk,
+                device_index=self._monitor_device
+            )
+            capture.start()
+            self._monitor_capture = capture
+            self._monitor_thread = threading.Thread(
+                target=self._monitor_capture_loop, args=(capture,), name="input-monitor", daemon=True
+            )
+            self._monitor_thread.start()
+
+    def _resume_monitor(self) -> None:
+        """녹음이나 녹음 대기가 끝난 뒤 모니터용 입력을 다시 엽니다 (실패해도 녹음 흐름은 막지 않음)."""
+        try:
+            self._sync_monitor_source()
+        except Exception as e:
+            self.on_log(f"입력 모니터를 다시 열 수 없습니다: {e}")
+            self.stop_monitor()
+
+    def _close_monitor_capture(self) -> None:
+        capture, self._monitor_capture = self._monitor_capture, None
+        if capture is None:
+            return
+        capture.stop()
+        if self._monitor_thread is not None:
+            self._monitor_thread.join(timeout=1.0)
+            self._monitor_thread = None
+
+    def _monitor_capture_loop(self, capture: CallbackCapture):
+        """모니터용 입력의 청크를 모두 분석기로 넘기고 레벨을 알립니다."""
+        meter = AudioMeter(capture.chunk_size, capture.channels)
+        while True:
+            data = capture.read_chunk(timeout=0.5)
+            if not data:
+                if capture.ring.closed:
+                    break
+                continue
+            self._feed_monitor(data)
+            if self.on_level:
+                try:
+                    self.on_level(meter.measure(data).level)
+                except Exception as e:
+                    logger.error(f"오디오 레벨 계산 오류: {e}")
+
+    # ------------------------------------------------------------------
+    # 재생
+    # ------------------------------------------------------------------
+    def play_file(self, file_path: str, stop_event: Optional[threading.Event] = None) -> None:
+        """WAV 파일(RF64, 세션 파일 포함)을 끝까지 재생합니다 (호출한 스레드에서 블로킹).
+
+        stop_event가 설정되면 다음 청크에서 재생을 멈춥니다.
+        """
+        source = open_source(file_path)
+        try:
+            stream = self.audio.open(
+                format=self.audio.get_format_from_width(source.sample_width),
+                channels=source.channels,
+                rate=source.sample_rate,
+                output=True
+            )
+            try:
+                frame = 0
+                data = source.read(frame, self.chunk_size)
+                while data and not (stop_event and stop_event.is_set()):
+                    stream.write(data)
+                    frame += len(data) // source.frame_size
+                    data = source.read(frame, self.chunk_size)
+            finally:
+                stream.stop_stream()
+                stream.close()
+        finally:
+            source.close()
+
+    def close(self) -> None:
+        """진행 중인 녹음을 정리하고 오디오 백엔드를 종료합니다."""
+        if self._running or self.writer:
+            try:
+                self.stop()
+            except Exception:
+                pass
+        self.stop_monitor()
+        try:
+            self.disarm()
+        except Exception as e:
+            logger.error(f"녹음 대기 해제 오류: {e}")
+        self.audio.terminate()
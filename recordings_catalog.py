@@ -0,0 +1,228 @@
+"""녹음 파일 색인 (SQLite)
+
+녹음 디렉토리의 각 WAV 파일과 분할 녹음 세션에 대해 길이, 형식, 크기, 수정 시각, 피크 레벨을 저장합니다.
+다시 스캔할 때는 크기와 수정 시각이 바뀐 파일만 새로 읽고,
+목록 화면은 색인에서 필요한 범위만 정렬/필터링해서 가져갑니다.
+"""
+import os
+import sqlite3
+import threading
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from audio_meter import to_dbfs
+from playback_engine import open_source
+from session_manifest import SessionManifest, is_session
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILE = ".catalog.sqlite3"
+
+# 정렬에 사용할 수 있는 열
+SORT_COLUMNS = ("name", "duration", "size", "mtime", "peak_dbfs")
+
+# 샘플 폭(바이트)별 NumPy 자료형과 최대값
+_SAMPLE_TYPES = {1: (np.uint8, 128.0), 2: (np.int16, 32768.0), 4: (np.int32, 2147483648.0)}
+
+
+def format_duration(seconds):
+    mins, secs = divmod(int(seconds), 60)
+    hours, mins = divmod(mins, 60)
+    return f"{hours}:{mins:02d}:{secs:02d}" if hours else f"{mins:02d}:{secs:02d}"
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024.0
+
+
+@dataclass
+class RecordingInfo:
+    """색인에 저장된 녹음 파일 정보"""
+    name: str
+    size: int
+    mtime: float
+    duration: float
+    channels: int
+    sample_rate: int
+    sample_width: int
+    peak_dbfs: Optional[float]
+
+    @property
+    def format(self) -> str:
+        return f"{self.sample_rate / 1000:g}kHz {self.sample_width * 8}bit {'모노' if self.channels == 1 else f'{self.channels}ch'}"
+
+
+def probe_wav(file_path: str, block_frames: int = 65536,
+              scan_peak: bool = True) -> Tuple[float, int, int, int, Optional[float]]:
+    """WAV 파일(RF64, 세션 파일 포함)의 (길이, 채널, 샘플레이트, 샘플 폭, 피크 dBFS)를 읽습니다.
+
+    피크는 파일 전체를 읽어야 하므로, scan_peak가 거짓이면 헤더만 읽고 피크는 None으로 반환합니다.
+    """
+    source = open_source(file_path)
+    try:
+        channels = source.channels
+        sample_rate = source.sample_rate
+        sample_width = source.sample_width
+        duration = source.duration
+
+        if not scan_peak or sample_width not in _SAMPLE_TYPES:
+            return duration, channels, sample_rate, sample_width, None
+
+        dtype, full_scale = _SAMPLE_TYPES[sample_width]
+        peak = 0.0
+        for frame in range(0, source.frames, block_frames):
+            samples = np.frombuffer(source.read(frame, block_frames), dtype=dtype)
+            if sample_width == 1:
+                samples = samples.astype(np.int16) - 128
+            peak = max(peak, float(np.abs(samples.astype(np.int64)).max()))
+    finally:
+        source.close()
+
+    # 16비트 기준 dBFS로 환산
+    peak_dbfs = float(to_dbfs(peak / full_scale * 32768.0))
+    return duration, channels, sample_rate, sample_width, peak_dbfs
+
+
+class RecordingsCatalog:
+    """녹음 디렉토리에 대한 SQLite 색인입니다. 여러 스레드에서 사용할 수 있습니다."""
+
+    def __init__(self, directory: str, db_name: str = CATALOG_FILE):
+        self.directory = directory
+        self.db_path = os.path.join(directory, db_name)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS recordings (
+                name TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                duration REAL NOT NULL,
+                channels INTEGER NOT NULL,
+                sample_rate INTEGER NOT NULL,
+                sample_width INTEGER NOT NULL,
+                peak_dbfs REAL
+            )
+        """)
+        for column in SORT_COLUMNS[1:]:
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_recordings_{column} ON recordings({column})")
+        self._conn.commit()
+
+    def _probe_row(self, name, stat, peak_dbfs=None):
+        file_path = os.path.join(self.directory, name)
+        duration, channels, sample_rate, sample_width, scanned = probe_wav(file_path, scan_peak=peak_dbfs is None)
+        if peak_dbfs is None:
+            peak_dbfs = scanned
+        size = stat.st_size
+        if is_session(name):
+            # 세션은 세그먼트 파일 크기의 합으로 표시 (변경 감지는 세션 파일 크기/시각으로)
+            size = sum(os.path.getsize(path) for path in SessionManifest.load(file_path).segment_paths(file_path))
+        return (name, size, stat.st_mtime, duration, channels, sample_rate, sample_width, peak_dbfs)
+
+    def _upsert(self, rows):
+        self._conn.executemany("""
+            INSERT OR REPLACE INTO recordings
+                (name, size, mtime, duration, channels, sample_rate, sample_width, peak_dbfs)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+    def rescan(self) -> Tuple[int, int, int]:
+        """디렉토리를 다시 읽어 바뀐 파일만 갱신합니다. (추가, 변경, 삭제) 수를 반환합니다."""
+        with self._lock:
+            known = {
+                name: (size, mtime)
+                for name, size, mtime in self._conn.execute("SELECT name, size, mtime FROM recordings")
+            }
+
+        seen = set()
+        rows = []
+        added = updated = 0
+        for entry in os.scandir(self.directory):
+            if not (entry.name.endswith(".wav") or is_session(entry.name)) or not entry.is_file():
+                continue
+            seen.add(entry.name)
+            stat = entry.stat()
+            previous = known.get(entry.name)
+            if previous is not None and previous[1] == stat.st_mtime and \
+                    (previous[0] == stat.st_size or is_session(entry.name)):
+                continue
+            try:
+                rows.append(self._probe_row(entry.name, stat))
+            except Exception as e:
+                logger.error(f"녹음 파일 정보 읽기 오류 ({entry.name}): {e}")
+                continue
+            if previous is None:
+                added += 1
+            else:
+                updated += 1
+
+        removed = [(name,) for name in known if name not in seen]
+        with self._lock:
+            self._upsert(rows)
+            self._conn.executemany("DELETE FROM recordings WHERE name = ?", removed)
+            self._conn.commit()
+        return added, updated, len(removed)
+
+    def update_file(self, name: str, peak_dbfs: Optional[float] = None) -> None:
+        """파일 하나의 정보를 다시 읽어 색인에 반영합니다.
+
+        녹음 중에 측정한 peak_dbfs를 넘기면 헤더만 읽고, 없으면 파일 전체를 읽어 피크를 구합니다
+        (긴 파일은 오래 걸리므로 UI 스레드에서 호출하지 않음).
+        """
+        stat = os.stat(os.path.join(self.directory, name))
+        row = self._probe_row(name, stat, peak_dbfs)
+        with self._lock:
+            self._upsert([row])
+            self._conn.commit()
+
+    def remove(self, name: str) -> None:
+        """파일 하나를 색인에서 지웁니다."""
+        with self._lock:
+            self._conn.execute("DELETE FROM recordings WHERE name = ?", (name,))
+            self._conn.commit()
+
+    def _where(self, filter_text):
+        if not filter_text:
+            return "", ()
+        escaped = filter_text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return "WHERE name LIKE ? ESCAPE '\\'", (f"%{escaped}%",)
+
+    def count(self, filter_text: str = "") -> int:
+        """조건에 맞는 파일 수를 반환합니다."""
+        where, params = self._where(filter_text)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM recordings {where}", params).fetchone()[0]
+
+    def query(self, sort: str = "name", descending: bool = False, filter_text: str = "",
+              offset: int = 0, limit: int = 100) -> List[RecordingInfo]:
+        """정렬/필터링된 목록에서 offset부터 limit개를 반환합니다."""
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"정렬할 수 없는 열입니다: {sort}")
+        where, params = self._where(filter_text)
+        order = "DESC" if descending else "ASC"
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT name, size, mtime, duration, channels, sample_rate, sample_width, peak_dbfs
+                FROM recordings {where}
+                ORDER BY {sort} {order}, name ASC
+                LIMIT ? OFFSET ?
+            """, params + (limit, offset)).fetchall()
+        return [RecordingInfo(*row) for row in rows]
+
+    def get(self, name: str) -> Optional[RecordingInfo]:
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT name, size, mtime, duration, channels, sample_rate, sample_width, peak_dbfs
+                FROM recordings WHERE name = ?
+            """, (name,)).fetchone()
+        return RecordingInfo(*row) if row else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
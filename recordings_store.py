@@ -0,0 +1,183 @@
+"""녹음 파일 저장소
+
+recordings 디렉토리의 파일 목록, 이름 규칙, 임시 파일 확정/삭제를 담당합니다.
+여러 세그먼트로 나눠 녹음한 경우 세그먼트는 이름.segments/ 디렉토리로 옮기고
+이름.session.json 세션 파일 하나를 녹음 목록에 남깁니다.
+"""
+import os
+import json
+import shutil
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from playback_engine import WavSource
+from session_manifest import SEGMENTS_DIR_SUFFIX, SESSION_SUFFIX, SessionManifest, SessionSegment, is_session
+from wav_writer import PARTIAL_SUFFIX, recover_partial_recordings, repair_wav_header
+
+logger = logging.getLogger(__name__)
+
+
+def default_recording_name() -> str:
+    """현재 시각으로 기본 녹음 이름을 만듭니다."""
+    return f"recording_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+
+class RecordingsStore:
+    """녹음 파일이 저장되는 디렉토리를 관리합니다."""
+
+    def __init__(self, directory: str = "recordings"):
+        self.directory = directory
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+            logger.info(f"녹음 디렉토리 생성: {self.directory}")
+
+    @property
+    def tts_cache_dir(self) -> str:
+        """합성 음성 캐시 디렉토리 (녹음 목록에는 나타나지 않음)"""
+        return os.path.join(self.directory, ".tts_cache")
+
+    @property
+    def segments_dir(self) -> str:
+        """음성 구간 정보 디렉토리 (녹음 파일마다 이름.json)"""
+        return os.path.join(self.directory, ".segments")
+
+    def segments_path(self, name: str) -> str:
+        return os.path.join(self.segments_dir, os.path.basename(self.path_for(name)) + ".json")
+
+    def save_segments(self, name: str, segments, mode: str) -> str:
+        """VAD가 찾은 음성 구간을 녹음 파일 옆 정보 파일로 저장합니다."""
+        os.makedirs(self.segments_dir, exist_ok=True)
+        file_path = self.segments_path(name)
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"mode": mode, "segments": [s.to_dict() for s in segments]}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, file_path)
+        return file_path
+
+    def load_segments(self, name: str) -> Optional[dict]:
+        """저장된 음성 구간 정보를 읽습니다. 없으면 None입니다."""
+        try:
+            with open(self.segments_path(name), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def recover(self) -> List[str]:
+        """비정상 종료로 남은 녹음 파일을 복구합니다.
+
+        분할 녹음의 세그먼트 임시 파일은 녹음 하나로 묶어 세션 파일을 다시 만들고,
+        나머지 임시 파일은 각각 .wav 파일로 복구합니다.
+        """
+        recovered = self._recover_sessions()
+        return recovered + recover_partial_recordings(self.directory)
+
+    def _recover_sessions(self) -> List[str]:
+        # segment_writer는 NumPy를 불러오므로 시작 화면 경로에서 빼 둠 (복구는 백그라운드에서 실행)
+        from segment_writer import parse_segment_path
+
+        sessions = {}
+        for file in os.listdir(self.directory):
+            parsed = parse_segment_path(file)
+            if parsed is not None:
+                base, number = parsed
+                sessions.setdefault(base, []).append((number, os.path.join(self.directory, file)))
+
+        recovered = []
+        for base, parts in sessions.items():
+            try:
+                paths = []
+                for _, part_path in sorted(parts):
+                    # 회전 직후 중단되어 비어 있는 세그먼트는 버림
+                    if repair_wav_header(part_path) == 0:
+                        os.remove(part_path)
+                    else:
+                        paths.append(part_path)
+                if not paths:
+                    continue
+                file_path = self.finalize_files(paths, f"{base}_recovered")
+                recovered.append(file_path)
+                logger.info(f"중단된 분할 녹음 복구 (세그먼트 {len(paths)}개): {file_path}")
+            except Exception as e:
+                # 묶지 못한 세그먼트는 아래에서 낱개 파일로라도 복구됨
+                logger.error(f"분할 녹음 복구 오류 ({base}): {e}")
+        return recovered
+
+    def list_recordings(self) -> List[str]:
+        """저장된 .wav 파일과 세션 파일 이름 목록을 반환합니다."""
+        return [file for file in os.listdir(self.directory) if file.endswith(".wav") or is_session(file)]
+
+    def path_for(self, name: str) -> str:
+        """녹음 이름(확장자 생략 가능)에 해당하는 파일 경로를 반환합니다 (분할 녹음이면 세션 파일)."""
+        if not name.endswith(".wav") and not is_session(name):
+            session_path = os.path.join(self.directory, name + SESSION_SUFFIX)
+            if os.path.exists(session_path):
+                return session_path
+            name = f"{name}.wav"
+        return os.path.join(self.directory, name)
+
+    def new_partial_path(self, suffix: str = "") -> str:
+        """녹음 중에 기록할 임시 파일 경로를 만듭니다. 동시에 여러 파일을 쓸 때는 suffix로 구분합니다."""
+        return os.path.join(
+            self.directory,
+            f".{default_recording_name()}{suffix}.wav{PARTIAL_SUFFIX}"
+        )
+
+    def finalize(self, partial_path: str, name: str) -> str:
+        """임시 파일을 최종 이름으로 바꾸고 경로를 반환합니다."""
+        file_path = self.path_for(name or default_recording_name())
+        os.replace(partial_path, file_path)
+        return file_path
+
+    def finalize_session(self, partial_paths: List[str], name: str) -> str:
+        """세그먼트 임시 파일들을 이름.segments/로 옮기고 세션 파일 경로를 반환합니다."""
+        name = name or default_recording_name()
+        if name.endswith(".wav"):
+            name = name[:-len(".wav")]
+        segments_dir = os.path.join(self.directory, name + SEGMENTS_DIR_SUFFIX)
+        os.makedirs(segments_dir, exist_ok=True)
+
+        # 세그먼트 형식과 실제 길이는 파일 헤더에서 읽음 (재생 엔진과 같은 기준)
+        manifest = None
+        for number, partial_path in enumerate(partial_paths, 1):
+            source = WavSource(partial_path)
+            try:
+                if manifest is None:
+                    manifest = SessionManifest(source.sample_rate, source.channels, source.sample_width)
+                frames = source.frames
+            finally:
+                source.close()
+            file_name = f"{name}_{number:03d}.wav"
+            os.replace(partial_path, os.path.join(segments_dir, file_name))
+            manifest.segments.append(SessionSegment(f"{name}{SEGMENTS_DIR_SUFFIX}/{file_name}", frames))
+
+        file_path = os.path.join(self.directory, name + SESSION_SUFFIX)
+        manifest.save(file_path)
+        return file_path
+
+    def finalize_files(self, partial_paths: List[str], name: str) -> str:
+        """녹음 결과 파일을 확정합니다. 세그먼트가 여러 개면 세션으로, 하나면 일반 파일로 저장합니다."""
+        if len(partial_paths) > 1:
+            return self.finalize_session(partial_paths, name)
+        return self.finalize(partial_paths[0], name)
+
+    def discard(self, partial_path: str) -> None:
+        """쓸모없는 임시 파일을 지웁니다."""
+        try:
+            os.remove(partial_path)
+        except OSError:
+            pass
+
+    def delete(self, name: str) -> bool:
+        """녹음 파일을 삭제합니다. 파일이 없으면 False를 반환합니다."""
+        file_path = self.path_for(name)
+        if not os.path.exists(file_path):
+            return False
+        os.remove(file_path)
+        if is_session(file_path):
+            shutil.rmtree(file_path[:-len(SESSION_SUFFIX)] + SEGMENTS_DIR_SUFFIX, ignore_errors=True)
+        try:
+            os.remove(self.segments_path(name))
+        except OSError:
+            pass
+        return True
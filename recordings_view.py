@@ -0,0 +1,223 @@
+"""가상화된 녹음 목록 위젯
+
+녹음 색인에서 화면에 보이는 행만 가져와 그립니다. 파일이 수만 개여도
+스크롤할 때마다 보이는 범위만 조회하므로 목록 갱신이 UI를 막지 않습니다.
+"""
+import tkinter as tk
+from tkinter import ttk
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from recordings_catalog import RecordingsCatalog, format_duration, format_size
+from session_manifest import is_session, session_name
+from waveform_peaks import PeakStore
+from waveform_view import POLL_MS, render_thumbnail
+
+# 열 ID, 제목, 너비, 정렬 키
+COLUMNS = (
+    ("name", "파일 이름", 260, "name"),
+    ("duration", "길이", 70, "duration"),
+    ("format", "형식", 130, None),
+    ("size", "크기", 80, "size"),
+    ("mtime", "수정 시각", 130, "mtime"),
+    ("peak", "피크", 70, "peak_dbfs"),
+)
+
+
+class VirtualRecordingsList(tk.Frame):
+    """보이는 행만 색인에서 조회해 표시하는 녹음 목록입니다."""
+
+    ROW_HEIGHT = 20
+    THUMBNAIL_SIZE = (100, 16)
+    MAX_THUMBNAILS = 200
+
+    def __init__(self, master, catalog: RecordingsCatalog, peak_store: Optional[PeakStore] = None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.catalog = catalog
+        self.peak_store = peak_store
+        # 이름 -> (수정 시각, 미리보기 이미지)
+        self._thumbnails = OrderedDict()
+        self._poll_id = None
+        self.sort = "mtime"
+        self.descending = True
+        self.filter_text = ""
+        self.offset = 0
+        self.total = 0
+        self.visible_rows = 15
+        self.selected_name = None
+        self.on_select = None
+
+        # 필터 입력
+        filter_frame = tk.Frame(self)
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+        tk.Label(filter_frame, text="검색:").pack(side=tk.LEFT, padx=5)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *args: self._on_filter())
+        tk.Entry(filter_frame, textvariable=self.filter_var, width=30).pack(side=tk.LEFT, padx=5)
+        self.count_label = tk.Label(filter_frame, text="")
+        self.count_label.pack(side=tk.RIGHT, padx=5)
+
+        # 목록 (Treeview는 보이는 행만 담고, 스크롤은 offset으로 처리)
+        body = tk.Frame(self)
+        body.pack(fill=tk.BOTH, expand=True)
+
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree = ttk.Treeview(body, columns=[c[0] for c in COLUMNS],
+                                 show="tree headings" if peak_store else "headings",
+                                 selectmode="browse", height=self.visible_rows)
+        if peak_store:
+            self.tree.heading("#0", text="파형")
+            self.tree.column("#0", width=self.THUMBNAIL_SIZE[0] + 10, stretch=False)
+        for column, title, width, sort_key in COLUMNS:
+            command = (lambda key=sort_key: self.sort_by(key)) if sort_key else ""
+            self.tree.heading(column, text=title, command=command)
+            self.tree.column(column, width=width, anchor=tk.W if column == "name" else tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_rows(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_rows(3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+
+    # ------------------------------------------------------------------
+    def refresh(self):
+        """색인에서 현재 범위를 다시 조회해 그립니다."""
+        self.total = self.catalog.count(self.filter_text)
+        self.offset = max(0, min(self.offset, self.total - self.visible_rows))
+        rows = self.catalog.query(self.sort, self.descending, self.filter_text,
+                                  self.offset, self.visible_rows)
+
+        self.tree.delete(*self.tree.get_children())
+        waiting = False
+        for info in rows:
+            image = self._thumbnail(info) if self.peak_store else None
+            waiting = waiting or (self.peak_store is not None and image is None
+                                  and self.peak_store.is_pending(info.name))
+            self.tree.insert("", tk.END, iid=info.name, values=self.format_row(info), image=image or "")
+        if self.selected_name and self.tree.exists(self.selected_name):
+            self.tree.selection_set(self.selected_name)
+
+        self._update_scrollbar()
+        self.count_label.config(text=f"{self.total}개")
+
+        # 피크 파일이 만들어지는 대로 미리보기를 채움
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        if waiting:
+            self._poll_id = self.after(POLL_MS, self._poll_thumbnails)
+
+    def _thumbnail(self, info):
+        """보이는 행의 파형 미리보기를 만듭니다. 피크 파일이 없으면 생성을 요청합니다."""
+        cached = self._thumbnails.get(info.name)
+        if cached and cached[0] == info.mtime:
+            self._thumbnails.move_to_end(info.name)
+            return cached[1]
+
+        peaks = self.peak_store.get(info.name)
+        if peaks is None:
+            self.peak_store.request(info.name)
+            return None
+
+        image = render_thumbnail(peaks, *self.THUMBNAIL_SIZE)
+        self._thumbnails[info.name] = (info.mtime, image)
+        while len(self._thumbnails) > self.MAX_THUMBNAILS:
+            self._thumbnails.popitem(last=False)
+        return image
+
+    def _poll_thumbnails(self):
+        self._poll_id = None
+        self.refresh()
+
+    def format_row(self, info):
+        peak = f"{info.peak_dbfs:.1f}dB" if info.peak_dbfs is not None else "-"
+        name = f"{session_name(info.name)} [분할]" if is_session(info.name) else info.name
+        return (
+            name,
+            format_duration(info.duration),
+            info.format,
+            format_size(info.size),
+            datetime.fromtimestamp(info.mtime).strftime('%Y-%m-%d %H:%M'),
+            peak,
+        )
+
+    def sort_by(self, key):
+        """열 제목을 누르면 정렬 기준을 바꿉니다 (같은 열이면 방향 전환)."""
+        if self.sort == key:
+            self.descending = not self.descending
+        else:
+            self.sort = key
+            self.descending = key != "name"
+        self.offset = 0
+        self.refresh()
+
+    def scroll_rows(self, delta):
+        new_offset = max(0, min(self.offset + delta, self.total - self.visible_rows))
+        if new_offset != self.offset:
+            self.offset = new_offset
+            self.refresh()
+
+    # ------------------------------------------------------------------
+    def _on_filter(self):
+        self.filter_text = self.filter_var.get().strip()
+        self.offset = 0
+        self.refresh()
+
+    def _on_tree_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            self.selected_name = selection[0]
+            if self.on_select:
+                self.on_select(self.selected_name)
+
+    def _move_selection(self, delta):
+        """키보드로 보이는 범위 밖까지 선택을 옮길 수 있게 합니다."""
+        children = self.tree.get_children()
+        if not children:
+            return "break"
+        selection = self.tree.selection()
+        index = children.index(selection[0]) if selection else -1
+        target = index + delta
+        if target < 0:
+            self.scroll_rows(-1)
+            target = 0
+        elif target >= len(children):
+            self.scroll_rows(1)
+            target = len(self.tree.get_children()) - 1
+        children = self.tree.get_children()
+        if children:
+            self.tree.selection_set(children[max(0, min(target, len(children) - 1))])
+        return "break"
+
+    def _on_wheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == tk.MOVETO:
+            self.offset = int(float(value) * self.total)
+            self.refresh()
+        elif action == tk.SCROLL:
+            step = self.visible_rows if unit == tk.PAGES else 1
+            self.scroll_rows(int(value) * step)
+
+    def _on_resize(self, event):
+        rows = max(1, (event.height - self.ROW_HEIGHT) // self.ROW_HEIGHT)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.tree.configure(height=rows)
+            self.refresh()
+
+    def _update_scrollbar(self):
+        if self.total <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        first = self.offset / self.total
+        last = min(1.0, (self.offset + self.visible_rows) / self.total)
+        self.scrollbar.set(first, last)
@@ -0,0 +1,126 @@
+"""스트리밍 샘플레이트 변환기
+
+카이저 창을 씌운 sinc 저역 통과 필터를 폴리페이즈로 나눠 NumPy로 한 번에 계산합니다.
+청크 단위로 넣으면 이전 청크의 끝부분을 이어 붙여 처리하므로 청크 경계에서 끊김이 없고,
+필터 지연을 보정해 출력 시작 위치가 입력과 맞습니다. 16비트 PCM만 지원합니다.
+"""
+from math import gcd
+from typing import Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def design_polyphase_filter(up: int, down: int, zero_crossings: int = 24,
+                            rolloff: float = 0.9, beta: float = 8.0) -> Tuple[np.ndarray, float]:
+    """(up, 탭 수) 폴리페이즈 필터 행렬과 필터 지연(올림 샘플레이트 기준 샘플 수)을 반환합니다.
+
+    각 행은 입력 창에 바로 곱할 수 있게 시간 역순으로 정렬되어 있습니다.
+    """
+    # 올림 샘플레이트 기준 차단 주파수 (더 낮은 쪽 나이퀴스트의 rolloff배)
+    cutoff = rolloff * 0.5 / max(up, down)
+    taps = int(np.ceil(zero_crossings / cutoff / up))
+    if up % 2 and taps % 2 == 0:
+        # 전체 길이를 홀수로 맞춰 지연이 정수 샘플이 되게 함
+        taps += 1
+    length = taps * up
+    n = np.arange(length) - (length - 1) / 2.0
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, beta) * up
+    # h[p + k*up]가 위상 p의 k번째 탭. 입력 창과 바로 곱할 수 있게 탭 순서를 뒤집어 둠
+    return h.reshape(taps, up).T[:, ::-1].astype(np.float64), (length - 1) / 2.0
+
+
+def _to_pcm(samples):
+    """실수 샘플을 반올림해 16비트 PCM 바이트로 바꿉니다."""
+    return np.clip(np.round(samples), -32768, 32767).astype('<i2').tobytes()
+
+
+class StreamingResampler:
+    """in_rate에서 out_rate로 16비트 PCM 청크를 변환합니다."""
+
+    def __init__(self, in_rate: int, out_rate: int, channels: int = 1, zero_crossings: int = 24):
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.channels = channels
+        divisor = gcd(in_rate, out_rate)
+        self.up = out_rate // divisor
+        self.down = in_rate // divisor
+        self.passthrough = self.up == self.down
+
+        if not self.passthrough:
+            self.filters, delay = design_polyphase_filter(self.up, self.down, zero_crossings)
+            self.taps = self.filters.shape[1]
+            # 필터 지연만큼 계산 위치를 뒤로 미뤄 출력 시각을 입력과 맞추고, 끝날 때 그만큼 0을 넣어 꼬리를 내보냄
+            self._offset = int(round(delay))
+            self._flush_samples = self._offset // self.up + 1
+        self.reset()
+
+    def reset(self) -> None:
+        self._history = np.zeros((self.taps - 1 if not self.passthrough else 0, self.channels), dtype=np.float64)
+        self._pending = b''
+        self._consumed = 0   # 지금까지 받은 입력 샘플 수 (채널당)
+        self._next_out = 0   # 다음에 계산할 출력 샘플 번호
+        self._emitted = 0    # 지금까지 내보낸 출력 샘플 수 (채널당)
+
+    def process(self, data: bytes) -> bytes:
+        """청크를 변환해 반환합니다. 출력 길이는 청크마다 조금씩 다를 수 있습니다."""
+        if self.passthrough:
+            return data
+        frame_bytes = 2 * self.channels
+        data = self._pending + data
+        usable = len(data) - len(data) % frame_bytes
+        self._pending = data[usable:]
+        if not usable:
+            return b''
+        samples = np.frombuffer(data[:usable], dtype='<i2').reshape(-1, self.channels)
+        return _to_pcm(self._run(samples.astype(np.float64)))
+
+    def flush(self) -> bytes:
+        """남은 입력을 모두 내보냅니다."""
+        if self.passthrough:
+            return b''
+        return _to_pcm(self.flush_array())
+
+    def process_array(self, samples: np.ndarray) -> np.ndarray:
+        """(프레임, 채널) float64 배열을 변환합니다. 반올림이나 16비트 범위 제한 없이 실수로 반환합니다."""
+        if self.passthrough:
+            return samples
+        return self._run(np.asarray(samples, dtype=np.float64))
+
+    def flush_array(self) -> np.ndarray:
+        """process_array로 넣은 입력의 남은 출력을 실수 배열로 내보냅니다."""
+        if self.passthrough:
+            return np.empty((0, self.channels), dtype=np.float64)
+        expected = -(-self._consumed * self.up // self.down)
+        out = self._run(np.zeros((self._flush_samples, self.channels), dtype=np.float64))
+        # 넣은 0 때문에 입력 길이보다 길어진 부분은 잘라 냄
+        excess = max(0, self._emitted - expected)
+        self._emitted -= excess
+        return out[:len(out) - excess]
+
+    def _run(self, samples):
+        extended = np.concatenate((self._history, samples))
+        start = self._consumed
+        self._consumed += len(samples)
+
+        # base = (m * down + offset) // up 가 이미 받은 입력 안에 있는 출력만 계산
+        last = (self._consumed * self.up - 1 - self._offset) // self.down
+        outputs = np.arange(self._next_out, last + 1, dtype=np.int64)
+        self._history = extended[len(extended) - (self.taps - 1):]
+        if not len(outputs):
+            return np.empty((0, self.channels), dtype=np.float64)
+        self._next_out = int(outputs[-1]) + 1
+
+        positions = outputs * self.down + self._offset
+        base = positions // self.up
+        phase = positions % self.up
+        # extended[i]는 입력 샘플 (start - taps + 1 + i). 창은 base - taps + 1부터 taps개
+        index = base - start
+        coefficients = self.filters[phase]
+        result = np.empty((len(outputs), self.channels), dtype=np.float64)
+        for channel in range(self.channels):
+            windows = sliding_window_view(extended[:, channel], self.taps)[index]
+            result[:, channel] = np.einsum('ij,ij->i', windows, coefficients)
+
+        self._emitted += len(result)
+        return result
@@ -0,0 +1,216 @@
+"""분할 녹음 기록기
+
+긴 녹음을 정해진 길이, 크기, 또는 무음 구간에서 새 세그먼트 파일로 넘기며 기록합니다.
+청크를 프레임 단위로 잘라 다음 세그먼트에 이어 쓰므로 세그먼트를 차례로 이어 붙이면
+원래 녹음과 샘플 단위로 같습니다. 다 쓴 세그먼트는 백그라운드에서 닫아 캡처를 막지 않습니다.
+"""
+import os
+import re
+import threading
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from audio_meter import to_dbfs
+from wav_writer import PARTIAL_SUFFIX, StreamingWavWriter
+
+logger = logging.getLogger(__name__)
+
+# segment_path가 만든 세그먼트 임시 파일 이름 (.이름_001.wav.part). 녹음 이름 끝의 시각(6자리)과 구분되도록 3-5자리
+_SEGMENT_PARTIAL = re.compile(r'^\.(?P<base>.+)_(?P<number>\d{3,5})' + re.escape(".wav" + PARTIAL_SUFFIX) + '$')
+
+# 샘플 폭(바이트)별 NumPy 자료형과 16비트 기준 배율
+_SAMPLE_TYPES = {1: (np.uint8, 256.0), 2: (np.int16, 1.0), 4: (np.int32, 1.0 / 65536.0)}
+
+
+@dataclass
+class SegmentPolicy:
+    """세그먼트를 나누는 기준 (0이면 해당 기준을 쓰지 않음)
+
+    silence_after초를 넘긴 세그먼트는 다음 무음 청크(silence_dbfs 미만)에서 나누고,
+    max_seconds나 max_bytes에 닿으면 무음이 없어도 정확히 그 프레임에서 나눕니다.
+    """
+    max_seconds: float = 0.0
+    max_bytes: int = 0
+    silence_after: float = 0.0
+    silence_dbfs: float = -45.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_seconds or self.max_bytes or self.silence_after)
+
+    def describe(self) -> str:
+        parts = []
+        if self.max_seconds:
+            parts.append(f"{self.max_seconds / 60:g}분")
+        if self.max_bytes:
+            parts.append(f"{self.max_bytes / (1024 * 1024):g}MB")
+        if self.silence_after:
+            parts.append(f"{self.silence_after / 60:g}분 이후 무음")
+        return ", ".join(parts) if parts else "나누지 않음"
+
+
+def segment_path(base_path: str, number: int) -> str:
+    """녹음 경로에 세그먼트 번호를 붙입니다 (.이름.wav.part -> .이름_001.wav.part)."""
+    suffix = ".wav" + PARTIAL_SUFFIX
+    if base_path.endswith(suffix):
+        return f"{base_path[:-len(suffix)]}_{number:03d}{suffix}"
+    root, ext = os.path.splitext(base_path)
+    return f"{root}_{number:03d}{ext}"
+
+
+def parse_segment_path(file_name: str) -> Optional[Tuple[str, int]]:
+    """세그먼트 임시 파일 이름에서 (녹음 이름, 세그먼트 번호)를 얻습니다. 세그먼트가 아니면 None입니다."""
+    match = _SEGMENT_PARTIAL.match(os.path.basename(file_name))
+    if match is None:
+        return None
+    return match.group('base'), int(match.group('number'))
+
+
+def chunk_dbfs(data, sample_width: int) -> float:
+    """청크의 RMS 레벨(16비트 기준 dBFS)을 계산합니다."""
+    dtype, scale = _SAMPLE_TYPES[sample_width]
+    samples = np.frombuffer(data, dtype=dtype).astype(np.float64)
+    if sample_width == 1:
+        samples -= 128.0
+    if samples.size == 0:
+        return float(to_dbfs(0.0))
+    return float(to_dbfs(np.sqrt(np.mean(np.square(samples))) * scale))
+
+
+class SegmentedWavWriter:
+    """StreamingWavWriter와 같은 방식으로 쓰지만 정책에 따라 세그먼트 파일을 바꿔 가며 기록합니다."""
+
+    def __init__(self, base_path, channels, sample_width, sample_rate, policy: SegmentPolicy, **writer_options):
+        if policy.silence_after and sample_width not in _SAMPLE_TYPES:
+            raise ValueError(f"무음 분할을 지원하지 않는 샘플 폭입니다: {sample_width}")
+        self.base_path = base_path
+        self.channels = channels
+        self.sample_width = sample_width
+        self.sample_rate = sample_rate
+        self.policy = policy
+        self.writer_options = writer_options
+
+        self.paths: List[str] = []
+        # 세그먼트별 기록한 프레임 수 (마지막 항목이 현재 세그먼트)
+        self.segment_frames: List[int] = []
+        self._closing: List[threading.Thread] = []
+        self._close_errors: List[Exception] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._writer: Optional[StreamingWavWriter] = None
+        self._open_segment()
+        self.header_size = self._writer.header_size
+
+        self._max_frames = None
+        limits = []
+        if policy.max_seconds:
+            limits.append(int(policy.max_seconds * sample_rate))
+        if policy.max_bytes:
+            limits.append((policy.max_bytes - self.header_size) // self.frame_size)
+        if limits:
+            self._max_frames = max(1, min(limits))
+        self._silence_frames = int(policy.silence_after * sample_rate)
+
+    @property
+    def frame_size(self):
+        return self.channels * self.sample_width
+
+    @property
+    def file_path(self):
+        """첫 세그먼트 경로 (세그먼트가 하나뿐이면 일반 녹음 파일과 같음)"""
+        return self.paths[0]
+
+    @property
+    def frames_written(self):
+        return sum(self.segment_frames)
+
+    @property
+    def bytes_written(self):
+        return self.frames_written * self.frame_size
+
+    @property
+    def duration(self):
+        return self.frames_written / float(self.sample_rate)
+
+    @property
+    def queue_depth(self):
+        return self._writer.queue_depth if self._writer else 0
+
+    @property
+    def error(self):
+        with self._lock:
+            if self._close_errors:
+                return self._close_errors[0]
+        return self._writer.error if self._writer else None
+
+    def write(self, data):
+        """청크를 기록합니다. 세그먼트 경계에 걸치면 프레임 단위로 나눠 다음 세그먼트에 이어 씁니다."""
+        if self._closed:
+            raise ValueError("이미 닫힌 WAV 기록기입니다.")
+        error = self.error
+        if error is not None:
+            raise error
+
+        view = memoryview(data)
+        if (self._silence_frames and self.segment_frames[-1] >= self._silence_frames
+                and chunk_dbfs(view, self.sample_width) < self.policy.silence_dbfs):
+            self._rotate("무음")
+
+        while len(view):
+            take = len(view)
+            if self._max_frames is not None:
+                remaining = self._max_frames - self.segment_frames[-1]
+                if remaining <= 0:
+                    self._rotate("길이/크기 한도")
+                    continue
+                take = min(take, remaining * self.frame_size)
+            self._writer.write(bytes(view[:take]))
+            self.segment_frames[-1] += take // self.frame_size
+            view = view[take:]
+
+    def close(self):
+        """현재 세그먼트를 닫고, 백그라운드에서 닫던 세그먼트도 모두 끝날 때까지 기다립니다."""
+        if self._closed:
+            return
+        self._closed = True
+        errors = []
+        try:
+            self._writer.close()
+        except Exception as e:
+            errors.append(e)
+        for thread in self._closing:
+            thread.join()
+        with self._lock:
+            errors = self._close_errors + errors
+        if errors:
+            raise errors[0]
+
+    def _open_segment(self):
+        path = segment_path(self.base_path, len(self.paths) + 1)
+        self._writer = StreamingWavWriter(path, self.channels, self.sample_width, self.sample_rate,
+                                          **self.writer_options)
+        self.paths.append(path)
+        self.segment_frames.append(0)
+
+    def _rotate(self, reason):
+        """현재 세그먼트를 백그라운드에서 닫고 새 세그먼트를 엽니다."""
+        if self.segment_frames[-1] == 0:
+            return
+        finished = self._writer
+        self._open_segment()
+        logger.info(f"새 세그먼트로 전환 ({reason}): {os.path.basename(self._writer.file_path)}")
+        thread = threading.Thread(target=self._close_segment, args=(finished,), name="segment-close", daemon=True)
+        thread.start()
+        self._closing = [t for t in self._closing if t.is_alive()] + [thread]
+
+    def _close_segment(self, writer):
+        try:
+            writer.close()
+        except Exception as e:
+            logger.error(f"세그먼트 닫기 오류 ({writer.file_path}): {e}")
+            with self._lock:
+                self._close_errors.append(e)
@@ -0,0 +1,85 @@
+"""분할 녹음 세션 정보
+
+긴 녹음을 여러 세그먼트 파일로 나눠 저장했을 때, 세그먼트 순서와 프레임 수를 담은
+세션 파일(이름.session.json)로 하나의 녹음처럼 묶습니다. 세그먼트 파일은 세션 파일 옆의
+이름.segments/ 디렉토리에 있고, 세션 파일에는 그 디렉토리 기준 상대 경로가 기록됩니다.
+"""
+import os
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List
+
+SESSION_SUFFIX = ".session.json"
+SEGMENTS_DIR_SUFFIX = ".segments"
+MANIFEST_VERSION = 1
+
+
+def is_session(path: str) -> bool:
+    return path.endswith(SESSION_SUFFIX)
+
+
+def session_name(path: str) -> str:
+    """세션 파일 경로에서 녹음 이름(확장자 제외)을 얻습니다."""
+    return os.path.basename(path)[:-len(SESSION_SUFFIX)]
+
+
+@dataclass
+class SessionSegment:
+    """세그먼트 파일 하나 (file은 세션 파일 디렉토리 기준 상대 경로)"""
+    file: str
+    frames: int
+
+
+@dataclass
+class SessionManifest:
+    """세그먼트 파일들을 이어 붙인 하나의 녹음"""
+    sample_rate: int
+    channels: int
+    sample_width: int
+    segments: List[SessionSegment] = field(default_factory=list)
+    created: str = ""
+
+    @property
+    def frames(self) -> int:
+        return sum(segment.frames for segment in self.segments)
+
+    @property
+    def duration(self) -> float:
+        return self.frames / float(self.sample_rate) if self.sample_rate else 0.0
+
+    def segment_paths(self, manifest_path: str) -> List[str]:
+        directory = os.path.dirname(manifest_path)
+        return [os.path.join(directory, segment.file) for segment in self.segments]
+
+    def to_dict(self) -> dict:
+        return {
+            "version": MANIFEST_VERSION,
+            "created": self.created or datetime.now().isoformat(timespec="seconds"),
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "sample_width": self.sample_width,
+            "frames": self.frames,
+            "segments": [{"file": s.file, "frames": s.frames} for s in self.segments],
+        }
+
+    def save(self, path: str) -> None:
+        """임시 파일에 쓴 뒤 교체합니다."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SessionManifest":
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"지원하지 않는 세션 파일 버전입니다: {path}")
+        return cls(
+            sample_rate=data["sample_rate"],
+            channels=data["channels"],
+            sample_width=data["sample_width"],
+            segments=[SessionSegment(s["file"], s["frames"]) for s in data["segments"]],
+            created=data.get("created", ""),
+        )
@@ -0,0 +1,200 @@
+"""실시간 입력 스펙트럼 분석
+
+캡처한 청크를 하나도 빼지 않고 받아 창 함수를 씌운 FFT 스펙트럼, 스펙트로그램, 레벨 기록을 계산합니다.
+LiveMonitor.feed()는 미리 할당한 링 버퍼에 복사만 하므로 캡처 스레드를 막지 않고,
+FFT는 전용 작업자 스레드가 계산합니다. 분석이 밀리면 분석용 버퍼에서만 오래된 데이터를 버리고
+녹음 데이터에는 영향이 없습니다. 결과 배열은 모두 미리 할당해 두고 재사용합니다.
+"""
+import threading
+import logging
+
+import numpy as np
+
+from audio_meter import FULL_SCALE, METER_FLOOR_DB
+from capture import RingBuffer
+
+logger = logging.getLogger(__name__)
+
+# 스펙트럼 표시 하한 (dBFS)
+FLOOR_DB = -100.0
+
+FFT_SIZE = 2048
+
+# 스펙트로그램/레벨 기록에 보관하는 열 수
+HISTORY = 512
+
+
+class SpectrumAnalyzer:
+    """16비트 PCM을 모노로 섞어 FFT_SIZE 창, 50% 겹침으로 분석합니다.
+
+    spectrogram은 HISTORY개 행을 돌려 쓰는 링이고, copy_into로 오래된 순서대로 복사해 갑니다.
+    """
+
+    def __init__(self, sample_rate: int, channels: int = 1, fft_size: int = FFT_SIZE, history: int = HISTORY):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.fft_size = fft_size
+        self.history = history
+        self.hop = fft_size // 2
+
+        self.window = np.hanning(fft_size).astype(np.float32)
+        # 창 함수 이득을 보정해 최대 진폭 사인파가 0dB 근처에 오도록 함
+        self._scale = 2.0 / (float(self.window.sum()) * FULL_SCALE)
+        self.frequencies = np.fft.rfftfreq(fft_size, 1.0 / sample_rate)
+        self.bins = len(self.frequencies)
+
+        self._frame = np.zeros(fft_size, dtype=np.float32)
+        self._windowed = np.empty(fft_size, dtype=np.float32)
+        self._magnitude = np.empty(self.bins, dtype=np.float32)
+        self._pending = 0
+
+        self._lock = threading.Lock()
+        self.spectrum = np.full(self.bins, FLOOR_DB, dtype=np.float32)
+        self.spectrogram = np.full((history, self.bins), FLOOR_DB, dtype=np.float32)
+        self.levels = np.full(history, METER_FLOOR_DB, dtype=np.float32)
+        self.ffts = 0
+        self.chunks = 0
+        self.samples = 0
+
+    @property
+    def level_dbfs(self) -> float:
+        """가장 최근 청크의 RMS 레벨"""
+        with self._lock:
+            return float(self.levels[(self.chunks - 1) % self.history]) if self.chunks else METER_FLOOR_DB
+
+    def process(self, data: bytes) -> None:
+        """청크 하나(인터리브된 16비트 PCM)를 분석합니다."""
+        samples = np.frombuffer(data, dtype='<i2')
+        if self.channels > 1:
+            samples = samples[:len(samples) - len(samples) % self.channels]
+            mono = samples.reshape(-1, self.channels).mean(axis=1, dtype=np.float32)
+        else:
+            mono = samples.astype(np.float32)
+        if not len(mono):
+            return
+
+        rms = float(np.sqrt(np.dot(mono, mono) / len(mono)))
+        level = 20.0 * np.log10(max(rms, 1.0) / FULL_SCALE)
+        with self._lock:
+            self.levels[self.chunks % self.history] = level
+            self.chunks += 1
+            self.samples += len(mono)
+
+        # hop 샘플이 모일 때마다 창을 밀고 FFT 한 번
+        offset = 0
+        while offset < len(mono):
+            take = min(self.hop - self._pending, len(mono) - offset)
+            self._frame[:-take] = self._frame[take:]
+            self._frame[-take:] = mono[offset:offset + take]
+            self._pending += take
+            offset += take
+            if self._pending == self.hop:
+                self._pending = 0
+                self._transform()
+
+    def _transform(self):
+        np.multiply(self._frame, self.window, out=self._windowed)
+        np.abs(np.fft.rfft(self._windowed), out=self._magnitude, casting='same_kind')
+        self._magnitude *= self._scale
+        np.maximum(self._magnitude, 1e-10, out=self._magnitude)
+        np.log10(self._magnitude, out=self._magnitude)
+        self._magnitude *= 20.0
+        np.maximum(self._magnitude, FLOOR_DB, out=self._magnitude)
+        with self._lock:
+            self.spectrum[:] = self._magnitude
+            self.spectrogram[self.ffts % self.history] = self._magnitude
+            self.ffts += 1
+
+    def copy_into(self, spectrum_out: np.ndarray, spectrogram_out: np.ndarray, levels_out: np.ndarray,
+                  bins: np.ndarray) -> int:
+        """현재 결과를 미리 할당한 배열에 오래된 순서대로 복사합니다. 지금까지의 FFT 수를 반환합니다.
+
+        스펙트로그램은 표시할 주파수 빈(bins)만 골라 (HISTORY, len(bins)) 배열에 복사합니다.
+        """
+        with self._lock:
+            spectrum_out[:] = self.spectrum
+            start = self.ffts % self.history
+            tail = self.history - start
+            np.take(self.spectrogram[start:], bins, axis=1, out=spectrogram_out[:tail])
+            np.take(self.spectrogram[:start], bins, axis=1, out=spectrogram_out[tail:])
+            start = self.chunks % self.history
+            tail = self.history - start
+            levels_out[:tail] = self.levels[start:]
+            levels_out[tail:] = self.levels[:start]
+            return self.ffts
+
+
+class LiveMonitor:
+    """입력 청크를 받아 백그라운드에서 SpectrumAnalyzer로 분석합니다.
+
+    feed()는 어느 스레드에서든 호출할 수 있고 복사만 합니다. 형식이 바뀌면 configure()로 분석기를 새로 만듭니다.
+    """
+
+    def __init__(self, sample_rate: int, channels: int = 1, buffer_seconds: float = 1.0):
+        self.buffer_seconds = buffer_seconds
+        self.analyzer: SpectrumAnalyzer = None
+        self.ring: RingBuffer = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.configure(sample_rate, channels)
+
+    @property
+    def sample_rate(self) -> int:
+        return self.analyzer.sample_rate
+
+    @property
+    def channels(self) -> int:
+        return self.analyzer.channels
+
+    @property
+    def skipped_bytes(self) -> int:
+        """분석이 밀려 건너뛴 양 (녹음 데이터와는 무관)"""
+        return self.ring.overrun_bytes
+
+    def configure(self, sample_rate: int, channels: int) -> None:
+        """분석 형식을 맞춥니다. 바뀌었으면 분석기와 버퍼를 새로 만듭니다."""
+        with self._lock:
+            analyzer = self.analyzer
+            if analyzer is not None and (analyzer.sample_rate, analyzer.channels) == (sample_rate, channels):
+                return
+            self.analyzer = SpectrumAnalyzer(sample_rate, channels)
+            frame_bytes = channels * 2
+            capacity = max(self.analyzer.hop * 4, int(sample_rate * self.buffer_seconds)) * frame_bytes
+            if self.ring is not None:
+                self.ring.close()
+            self.ring = RingBuffer(capacity)
+
+    def feed(self, data: bytes) -> None:
+        """캡처한 청크를 분석 버퍼에 복사합니다 (가득 차면 가장 오래된 분석 데이터를 버림)."""
+        self.ring.write(data)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="spectrum", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._lock:
+            self.ring.close()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                analyzer, ring = self.analyzer, self.ring
+            data = ring.read(analyzer.hop * analyzer.channels * 2, timeout=0.1)
+            if not data:
+                if ring.closed:
+                    # configure로 버퍼가 바뀌었으면 새 버퍼를 읽음
+                    self._stop.wait(0.01)
+                continue
+            try:
+                analyzer.process(data)
+            except Exception as e:
+                logger.error(f"스펙트럼 계산 오류: {e}")
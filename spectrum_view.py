@@ -0,0 +1,146 @@
+"""입력 스펙트럼 표시 위젯
+
+LiveMonitor의 분석 결과를 일정한 프레임 간격으로 캔버스에 그립니다.
+위쪽은 로그 주파수 축의 스펙트럼, 가운데는 스크롤되는 스펙트로그램, 아래쪽은 레벨 기록입니다.
+그릴 때마다 새 캔버스 항목이나 배열을 만들지 않고, 미리 만든 선의 좌표와 이미지 내용만 바꿉니다.
+"""
+import tkinter as tk
+from typing import Optional
+
+import numpy as np
+
+from audio_meter import METER_FLOOR_DB
+from spectrum import FLOOR_DB, HISTORY, LiveMonitor
+
+# 초당 그리기 횟수
+MONITOR_FPS = 20
+
+# 표시할 가장 낮은 주파수 (Hz)
+MIN_FREQUENCY = 30.0
+
+SPECTRUM_COLOR = "#2980b9"
+LEVEL_COLOR = "#27ae60"
+
+
+def _colormap():
+    """어두운 파랑 -> 빨강 -> 노랑 -> 흰색 256단계 색표 (uint8 RGB)"""
+    stops = np.array([[0, 0, 16], [40, 0, 110], [190, 30, 60], [250, 160, 0], [255, 255, 230]], dtype=np.float64)
+    positions = np.linspace(0.0, 1.0, len(stops))
+    x = np.linspace(0.0, 1.0, 256)
+    return np.stack([np.interp(x, positions, stops[:, i]) for i in range(3)], axis=1).astype(np.uint8)
+
+
+class SpectrumView(tk.Canvas):
+    """입력 모니터의 스펙트럼, 스펙트로그램, 레벨 기록을 그리는 캔버스입니다."""
+
+    def __init__(self, master, height: int = 240, fps: int = MONITOR_FPS, **kwargs):
+        kwargs.setdefault("bg", "black")
+        kwargs.setdefault("highlightthickness", 0)
+        super().__init__(master, height=height, **kwargs)
+        self.interval_ms = max(1, int(1000 / fps))
+        self.monitor: Optional[LiveMonitor] = None
+        self.frames_drawn = 0
+
+        self._analyzer = None
+        self._size = None
+        self._after_id = None
+        self._lut = _colormap()
+        self._image = tk.PhotoImage(width=1, height=1)
+        self._image_item = self.create_image(0, 0, anchor=tk.NW, image=self._image)
+        self._spectrum_line = self.create_line(0, 0, 0, 0, fill=SPECTRUM_COLOR)
+        self._level_line = self.create_line(0, 0, 0, 0, fill=LEVEL_COLOR)
+        self._label = self.create_text(4, 2, anchor=tk.NW, fill="gray", text="")
+        self.bind("<Configure>", lambda e: self._layout())
+
+    def attach(self, monitor: Optional[LiveMonitor]) -> None:
+        """monitor의 결과를 그리기 시작합니다. None이면 멈춥니다."""
+        self.monitor = monitor
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        if monitor is not None:
+            self._after_id = self.after(self.interval_ms, self._tick)
+
+    # ------------------------------------------------------------------
+    def _layout(self):
+        """캔버스 크기나 분석기가 바뀌면 그리기용 배열을 새로 할당합니다."""
+        analyzer = self.monitor.analyzer if self.monitor else None
+        width, height = self.winfo_width(), self.winfo_height()
+        if analyzer is None or width <= 1 or height <= 1:
+            return False
+        if self._size == (width, height) and self._analyzer is analyzer:
+            return True
+        self._size = (width, height)
+        self._analyzer = analyzer
+
+        self._spectrum_height = int(height * 0.4)
+        self._level_height = max(12, int(height * 0.15))
+        self._image_height = height - self._spectrum_height - self._level_height
+        self._columns = min(width, HISTORY)
+
+        # 로그 주파수 축: 화면 x와 스펙트로그램 행마다 쓸 FFT 빈
+        nyquist = analyzer.sample_rate / 2.0
+        low = min(MIN_FREQUENCY, nyquist / 2.0)
+        resolution = analyzer.sample_rate / float(analyzer.fft_size)
+        x_bins = np.round(np.geomspace(low, nyquist, width) / resolution).astype(np.intp)
+        self._x_bins = np.clip(x_bins, 1, analyzer.bins - 1)
+        row_bins = np.round(np.geomspace(nyquist, low, self._image_height) / resolution).astype(np.intp)
+        self._row_bins = np.clip(row_bins, 1, analyzer.bins - 1)
+
+        self._spectrum = np.empty(analyzer.bins, dtype=np.float32)
+        self._spectrogram = np.empty((HISTORY, self._image_height), dtype=np.float32)
+        self._levels = np.empty(HISTORY, dtype=np.float32)
+        self._scaled = np.empty((self._image_height, self._columns), dtype=np.float32)
+        self._indices = np.empty((self._image_height, self._columns), dtype=np.uint8)
+        self._rgb = np.empty((self._image_height, self._columns, 3), dtype=np.uint8)
+        self._ppm_header = f"P6 {self._columns} {self._image_height} 255\n".encode("ascii")
+
+        xs = np.arange(width, dtype=np.float32)
+        self._spectrum_coords = np.empty((width, 2), dtype=np.float32)
+        self._spectrum_coords[:, 0] = xs
+        level_xs = np.linspace(0, width - 1, HISTORY, dtype=np.float32)
+        self._level_coords = np.empty((HISTORY, 2), dtype=np.float32)
+        self._level_coords[:, 0] = level_xs
+
+        self._image = tk.PhotoImage(width=self._columns, height=self._image_height)
+        self.itemconfigure(self._image_item, image=self._image)
+        self.coords(self._image_item, width - self._columns, self._spectrum_height)
+        return True
+
+    def _tick(self):
+        self._after_id = self.after(self.interval_ms, self._tick)
+        if self.monitor is None or not self._layout():
+            return
+        analyzer = self._analyzer
+        ffts = analyzer.copy_into(self._spectrum, self._spectrogram, self._levels, self._row_bins)
+        width, height = self._size
+
+        # 스펙트럼 (FLOOR_DB ~ 0dB를 위쪽 영역 높이에 맞춤)
+        top = self._spectrum_height
+        ys = self._spectrum_coords[:, 1]
+        np.take(self._spectrum, self._x_bins, out=ys)
+        ys *= top / FLOOR_DB
+        np.clip(ys, 0, top - 1, out=ys)
+        self.coords(self._spectrum_line, self._spectrum_coords.ravel().tolist())
+
+        # 스펙트로그램 (가장 최근 열이 오른쪽)
+        recent = self._spectrogram[HISTORY - self._columns:].T
+        np.subtract(recent, FLOOR_DB, out=self._scaled)
+        self._scaled *= 255.0 / -FLOOR_DB
+        np.clip(self._scaled, 0, 255, out=self._scaled)
+        np.copyto(self._indices, self._scaled, casting='unsafe')
+        np.take(self._lut, self._indices, axis=0, out=self._rgb)
+        self._image.configure(data=self._ppm_header + self._rgb.tobytes(), format="ppm")
+
+        # 레벨 기록 (METER_FLOOR_DB ~ 0dB)
+        bottom = height - 1
+        ys = self._level_coords[:, 1]
+        np.multiply(self._levels, (self._level_height - 1) / METER_FLOOR_DB, out=ys)
+        np.clip(ys, 0, self._level_height - 1, out=ys)
+        ys += bottom - (self._level_height - 1)
+        self.coords(self._level_line, self._level_coords.ravel().tolist())
+
+        peak = analyzer.frequencies[int(np.argmax(self._spectrum))]
+        self.itemconfigure(self._label, text=f"{analyzer.sample_rate / 1000:g}kHz  최대 {peak:.0f}Hz  "
+                                             f"레벨 {self._levels[-1]:.1f}dBFS  FFT {ffts}")
+        self.frames_drawn += 1
@@ -0,0 +1,98 @@
+"""시작 시간 측정
+
+프로그램 시작 단계(모듈 가져오기, 오디오 백엔드 초기화, 장치 조회 등)마다 걸린 시간을 기록하고,
+창이 처음 뜰 때까지와 모든 기능이 준비될 때까지의 시간이 정해 둔 예산을 넘으면 경고합니다.
+"""
+import time
+import threading
+import importlib
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 시작 예산 (초): 창이 뜰 때까지 / 오디오, 녹음 목록, TTS 등 모든 기능이 준비될 때까지
+WINDOW_BUDGET = 0.5
+READY_BUDGET = 3.0
+
+
+@dataclass
+class StartupStage:
+    """시작 단계 하나"""
+    name: str
+    start: float
+    duration: float
+    thread: str
+
+
+class StartupTimer:
+    """시작 단계별 시간을 기록합니다. 여러 스레드에서 함께 사용할 수 있습니다."""
+
+    def __init__(self, budgets: Optional[Dict[str, float]] = None):
+        self.origin = time.perf_counter()
+        self.budgets = budgets if budgets is not None else {"window": WINDOW_BUDGET, "ready": READY_BUDGET}
+        self.stages: List[StartupStage] = []
+        self.marks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.origin
+
+    @contextmanager
+    def stage(self, name: str):
+        """with 블록 하나를 시작 단계로 기록합니다."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            with self._lock:
+                self.stages.append(StartupStage(name, started - self.origin, duration,
+                                                threading.current_thread().name))
+            logger.debug(f"시작 단계 {name}: {duration * 1000:.0f}ms")
+
+    def timed_import(self, module_name: str):
+        """모듈을 가져오면서 걸린 시간을 기록합니다 (이미 가져온 모듈이면 바로 반환)."""
+        with self.stage(f"import {module_name}"):
+            return importlib.import_module(module_name)
+
+    def mark(self, milestone: str) -> float:
+        """시작 후 milestone까지의 시간을 기록하고, 예산이 있으면 넘었는지 확인합니다."""
+        elapsed = self.elapsed()
+        with self._lock:
+            self.marks[milestone] = elapsed
+        budget = self.budgets.get(milestone)
+        if budget is not None and elapsed > budget:
+            logger.warning(f"시작 시간 예산 초과: {milestone} {elapsed:.2f}초 (예산 {budget:.2f}초)")
+        else:
+            logger.info(f"시작 {milestone}: {elapsed:.2f}초")
+        return elapsed
+
+    @property
+    def within_budget(self) -> bool:
+        return all(self.marks.get(name, float("inf")) <= budget for name, budget in self.budgets.items())
+
+    def report(self) -> str:
+        """단계별 시간을 시작 순서대로 정리한 여러 줄 문자열입니다."""
+        with self._lock:
+            stages = sorted(self.stages, key=lambda s: s.start)
+            marks = sorted(self.marks.items(), key=lambda item: item[1])
+        lines = [f"{s.start * 1000:7.0f}ms  +{s.duration * 1000:6.0f}ms  {s.name} [{s.thread}]" for s in stages]
+        for name, elapsed in marks:
+            budget = self.budgets.get(name)
+            limit = f" (예산 {budget * 1000:.0f}ms)" if budget is not None else ""
+            lines.append(f"{elapsed * 1000:7.0f}ms  {name}{limit}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "marks": {name: round(value, 4) for name, value in self.marks.items()},
+                "budgets": dict(self.budgets),
+                "stages": [
+                    {"name": s.name, "start": round(s.start, 4), "duration": round(s.duration, 4), "thread": s.thread}
+                    for s in sorted(self.stages, key=lambda s: s.start)
+                ],
+            }
@@ -0,0 +1,176 @@
+"""성능 시나리오 회귀 테스트
+
+benchmarks.py의 측정 시나리오를 가상 오디오 장치로 짧게 돌리고, 숫자를 기록하는 대신
+넘으면 안 되는 기준을 확인합니다.
+
+    python -m pytest -q
+"""
+import time
+
+import pytest
+
+import fake_pyaudio
+
+fake_pyaudio.install()
+
+import benchmarks  # noqa: E402
+from benchmarks import quiet_engine  # noqa: E402
+from resampler import StreamingResampler  # noqa: E402
+from text_segmenter import split_sentences  # noqa: E402
+from vad import VoiceActivityDetector  # noqa: E402
+
+
+def chunks(data, size):
+    return [data[offset:offset + size] for offset in range(0, len(data), size)]
+
+
+# ----------------------------------------------------------------------
+# 캡처 손실
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("mode", ["blocking", "callback"])
+@pytest.mark.parametrize("options", [dict(time_scale=5.0), dict(time_scale=5.0, jitter_ms=5.0)],
+                         ids=["steady", "jitter"])
+def test_capture_drops_nothing(tmp_path, mode, options):
+    audio = fake_pyaudio.FakePyAudio(seed=1, **options)
+    engine = quiet_engine(audio)
+    try:
+        result = engine.record_for(str(tmp_path / "capture.wav"), 1.0, capture_mode=mode)
+    finally:
+        engine.close()
+    stream = audio.streams[0]
+    assert stream.stats.frames_dropped == 0
+    assert stream.stats.overflows == 0
+    assert engine.stats.overflows == 0
+    assert engine.stats.frames_captured == stream.stats.frames_delivered
+    device_seconds = (stream.stats.closed_at - stream.stats.opened_at) * audio.time_scale
+    assert result.duration / device_seconds >= 0.99
+
+
+def test_blocking_overflow_keeps_read_data(tmp_path):
+    # 장치 버퍼(8192프레임)보다 긴 멈춤: 장치가 버린 구간만 잃고 읽은 청크는 모두 남아야 함
+    audio = fake_pyaudio.FakePyAudio(seed=1, time_scale=5.0, stall_every=0.5, stall_ms=400.0)
+    engine = quiet_engine(audio)
+    try:
+        engine.record_for(str(tmp_path / "overflow.wav"), 1.0, capture_mode="blocking")
+    finally:
+        engine.close()
+    stream = audio.streams[0]
+    assert stream.stats.overflows > 0
+    assert engine.stats.frames_captured == stream.stats.frames_delivered
+    assert engine.stats.overflows == stream.stats.overflows
+
+
+def test_multi_device_overflow_keeps_read_data(tmp_path):
+    from multi_capture import MultiDeviceRecorder
+
+    # 장치 간 정렬은 실제 시계를 기준으로 하므로 가상 시간을 빠르게 돌리지 않음
+    audio = fake_pyaudio.FakePyAudio(seed=1, stall_every=0.5, stall_ms=300.0)
+    recorder = MultiDeviceRecorder(audio, [(0, "mic"), (2, "usb")], sample_rate=48000)
+    recorder.on_log = lambda message: None
+    recorder.start([str(tmp_path / "multi.wav")])
+    time.sleep(1.5)
+    result = recorder.stop()
+    assert sum(stream.stats.overflows for stream in audio.streams) > 0
+    for capture, stream, report in zip(recorder.captures, audio.streams, result.devices):
+        assert capture.stats.frames_captured == stream.stats.frames_delivered
+        assert report.overflows == stream.stats.overflows
+    # 장치가 버린 구간은 무음으로 채워지므로 파일 길이는 장치가 만든 분량과 같아야 함
+    device_seconds = (audio.streams[0].stats.closed_at - audio.streams[0].stats.opened_at) * audio.time_scale
+    assert result.duration == pytest.approx(device_seconds, abs=0.1)
+
+
+@pytest.mark.parametrize("mode", ["blocking", "callback"])
+def test_monitor_analyzes_every_chunk(tmp_path, mode):
+    audio = fake_pyaudio.FakePyAudio(seed=3, time_scale=5.0, jitter_ms=5.0)
+    engine = quiet_engine(audio)
+    try:
+        monitor = engine.start_monitor()
+        opened = len(audio.streams)
+        result = engine.record_for(str(tmp_path / "monitor.wav"), 1.0, capture_mode=mode)
+        engine.stop_monitor()
+    finally:
+        engine.close()
+    assert audio.streams[opened].stats.frames_dropped == 0
+    assert monitor.skipped_bytes == 0
+    assert monitor.analyzer.samples / float(monitor.sample_rate) == pytest.approx(result.duration, abs=0.05)
+
+
+# ----------------------------------------------------------------------
+# 메모리 (soak)
+# ----------------------------------------------------------------------
+def test_memory_stays_flat(tmp_path):
+    results = benchmarks.bench_memory(str(tmp_path), quick=True, soak_seconds=60.0)
+    for vad_mode, result in results.items():
+        assert result["recorded_seconds"] > 0, vad_mode
+        # 녹음 길이에 비례해 늘어나는 버퍼가 없어야 함
+        assert result["growth_mb"] < 0.5, vad_mode
+        assert result["peak_mb"] < 5.0, vad_mode
+
+
+# ----------------------------------------------------------------------
+# 변환기
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize("in_rate,out_rate", [(44100, 16000), (48000, 16000), (16000, 44100)])
+def test_resampler_chunking_is_seamless(in_rate, out_rate):
+    data = fake_pyaudio.speech_like()(0, in_rate * 2, in_rate, 1).tobytes()
+
+    whole = StreamingResampler(in_rate, out_rate)
+    expected = whole.process(data) + whole.flush()
+
+    # 홀수 크기로 잘라 넣어도 청크 경계에서 샘플이 어긋나거나 빠지지 않아야 함
+    chunked = StreamingResampler(in_rate, out_rate)
+    actual = b''.join(chunked.process(chunk) for chunk in chunks(data, 2 * 997)) + chunked.flush()
+
+    assert actual == expected
+    assert abs(len(actual) // 2 - 2 * out_rate) <= 1
+
+
+# ----------------------------------------------------------------------
+# VAD
+# ----------------------------------------------------------------------
+def run_vad(data, rate, channels=1, mode="drop"):
+    vad = VoiceActivityDetector(rate, channels=channels, mode=mode)
+    out = b''.join(vad.process(chunk) for chunk in chunks(data, 1024 * 2 * channels)) + vad.flush()
+    return out, vad
+
+
+def test_vad_keep_mode_is_identity():
+    rate = 16000
+    data = fake_pyaudio.speech_like()(0, rate * 10, rate, 2).tobytes()
+    out, vad = run_vad(data, rate, channels=2, mode="keep")
+    assert out == data
+    assert vad.segments
+
+
+def test_vad_keeps_speech_at_start():
+    # 첫 프레임부터 말하는 녹음: 잡음 기준을 말소리로 잡으면 전부 버려짐
+    rate = 16000
+    data = fake_pyaudio.speech_like(talk_seconds=3.0, pause_seconds=1.0)(0, rate * 4, rate, 1).tobytes()
+    out, vad = run_vad(data, rate)
+    assert len(out) / 2.0 / rate > 2.5
+    assert vad.segments[0].source_start == pytest.approx(0.0, abs=0.05)
+
+
+def test_vad_drops_silence():
+    rate = 16000
+    data = fake_pyaudio.noise(-70.0)(0, rate * 4, rate, 1).tobytes()
+    out, vad = run_vad(data, rate)
+    assert out == b''
+    assert not vad.segments
+
+
+# ----------------------------------------------------------------------
+# 문장 분리
+# ----------------------------------------------------------------------
+def test_segmenter_splits_unspaced_cjk():
+    assert split_sentences("今日は晴れです。明日は雨です。") == ["今日は晴れです。", "明日は雨です。"]
+
+
+def test_segmenter_hard_wraps_long_runs():
+    pieces = split_sentences("あ" * 450, max_chars=200)
+    assert "".join(pieces) == "あ" * 450
+    assert all(len(piece) <= 200 for piece in pieces)
+
+
+def test_segmenter_keeps_decimals():
+    assert split_sentences("원주율은 3.14입니다.") == ["원주율은 3.14입니다."]
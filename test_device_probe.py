@@ -0,0 +1,69 @@
+"""입력 장치 조회 테스트 (가상 오디오 장치)"""
+import threading
+import time
+
+import fake_pyaudio
+
+fake_pyaudio.install()
+
+from device_probe import DeviceProber  # noqa: E402
+
+
+class SlowAudio(fake_pyaudio.FakePyAudio):
+    """형식 확인 한 번에 시간이 걸리는 장치 (실제 드라이버처럼)"""
+
+    def __init__(self, delay=0.005, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.probing = threading.Event()
+
+    def is_format_supported(self, *args, **kwargs):
+        self.probing.set()
+        time.sleep(self.delay)
+        return super().is_format_supported(*args, **kwargs)
+
+
+def test_find_does_not_wait_for_probe():
+    audio = SlowAudio()
+    prober = DeviceProber(audio)
+    prober.refresh(probe=False)
+    done = threading.Event()
+    prober.refresh_async(force=True, on_done=lambda changes: done.set())
+    assert audio.probing.wait(2.0)
+
+    # 녹음 시작 경로(negotiate_rate -> find)는 형식 확인이 끝나기를 기다리면 안 됨
+    started = time.perf_counter()
+    assert prober.find(0) is not None
+    assert prober.list()
+    assert time.perf_counter() - started < 0.05
+    assert not done.is_set()
+
+    assert done.wait(10.0)
+    assert prober.find(0).probed
+
+
+def test_rescan_reports_hotplugged_device(monkeypatch):
+    from recorder_engine import RecordingEngine
+
+    engine = RecordingEngine()
+    engine.on_log = lambda message: None
+    prober = DeviceProber(engine.audio)
+    prober.reinitialize = engine.reinitialize_audio
+    prober.refresh(probe=False)
+
+    # PortAudio는 초기화할 때의 목록을 유지하므로 새 백엔드를 만들어야 새 장치가 보임
+    plugged = fake_pyaudio.default_devices() + [fake_pyaudio.FakeDevice("Fake USB Mic", max_output_channels=0)]
+    monkeypatch.setattr(fake_pyaudio, "default_devices", lambda: list(plugged))
+    assert not prober.refresh(probe=False)
+    changes = prober.refresh(probe=False, rescan=True)
+    assert [device.name for device in changes.added] == ["Fake USB Mic"]
+    assert prober.audio is engine.audio
+
+    # 녹음 대기처럼 입력 스트림이 열려 있으면 다시 초기화하지 않음
+    engine.arm()
+    audio = engine.audio
+    try:
+        prober.refresh(probe=False, rescan=True)
+        assert engine.audio is audio and not audio.terminated
+    finally:
+        engine.close()
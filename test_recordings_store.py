@@ -0,0 +1,35 @@
+"""녹음 저장소 복구 테스트"""
+import os
+
+import fake_pyaudio
+from recordings_store import RecordingsStore
+from segment_writer import segment_path
+from session_manifest import SessionManifest, is_session
+from wav_writer import PARTIAL_SUFFIX, build_wav_header
+
+
+def write_partial(path, frames, rate=16000):
+    samples = fake_pyaudio.sine()(0, frames, rate, 1)
+    with open(path, 'wb') as f:
+        # 크기 필드를 채우지 못한 채 중단된 헤더
+        f.write(build_wav_header(1, 2, rate, 0))
+        f.write(samples.tobytes())
+
+
+def test_recover_rebuilds_segmented_session(tmp_path):
+    store = RecordingsStore(str(tmp_path))
+    base = store.new_partial_path()
+    for number, frames in ((1, 16000), (2, 16000), (3, 8000)):
+        write_partial(segment_path(base, number), frames)
+    write_partial(segment_path(base, 4), 0)
+    write_partial(store.new_partial_path("_dev0"), 4000)
+
+    recovered = store.recover()
+
+    sessions = [path for path in recovered if is_session(path)]
+    assert len(sessions) == 1 and len(recovered) == 2
+    manifest = SessionManifest.load(sessions[0])
+    assert [segment.frames for segment in manifest.segments] == [16000, 16000, 8000]
+    assert all(os.path.exists(path) for path in manifest.segment_paths(sessions[0]))
+    assert sorted(store.list_recordings()) == sorted(os.path.basename(path) for path in recovered)
+    assert not [file for file in os.listdir(tmp_path) if file.endswith(PARTIAL_SUFFIX)]
@@ -0,0 +1,81 @@
+"""문장 분할기
+
+긴 텍스트를 문장(필요하면 절) 단위로 나눠 앞부분부터 바로 합성할 수 있게 합니다.
+한국어/중국어/일본어 문장부호도 처리합니다.
+"""
+import re
+from typing import List
+
+# 문장 끝: 마침표, 물음표, 느낌표, 말줄임표(전각 포함) 뒤의 닫는 따옴표/괄호까지.
+# 반각 부호는 뒤에 공백이 있어야 하고(3.14 등), 전각 부호(。！？)는 띄어 쓰지 않은 중국어/일본어를 위해 공백 없이도 나눔
+_SENTENCE_END = re.compile(
+    r'([.!?。！？…]+["\'”’)\]」』]*)'
+    r'(\s+|$|(?:(?<=[。！？])|(?<=[。！？]["\'”’)\]」』]))(?=\S))'
+)
+
+# 절 경계: 쉼표, 세미콜론, 콜론 (전각 부호는 공백 없이도 나눔)
+_CLAUSE_END = re.compile(r'([,;:，、；：])(\s+|(?<=[，、；：])(?=\S))')
+
+
+def _split_keep(pattern, text):
+    """구분 기호는 앞 조각에 붙여 두고 공백 기준으로 나눕니다."""
+    parts = []
+    start = 0
+    for match in pattern.finditer(text):
+        end = match.end(1)
+        piece = text[start:end].strip()
+        if piece:
+            parts.append(piece)
+        start = match.end()
+    rest = text[start:].strip()
+    if rest:
+        parts.append(rest)
+    return parts
+
+
+def _split_long(sentence, max_chars):
+    """max_chars보다 긴 문장을 절, 그래도 길면 공백 단위로 나눕니다.
+
+    공백 없이 max_chars를 넘는 덩어리(띄어 쓰지 않은 중국어/일본어 등)는 글자 수로 자릅니다.
+    """
+    if len(sentence) <= max_chars:
+        return [sentence]
+
+    pieces = []
+    for clause in _split_keep(_CLAUSE_END, sentence):
+        if len(clause) <= max_chars:
+            pieces.append(clause)
+            continue
+        current = ""
+        for word in clause.split():
+            while len(word) > max_chars:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.append(word[:max_chars])
+                word = word[max_chars:]
+            if current and len(current) + 1 + len(word) > max_chars:
+                pieces.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+        if current:
+            pieces.append(current)
+
+    # 너무 짧은 절은 앞 조각과 합쳐 합성 횟수를 줄임
+    merged = []
+    for piece in pieces:
+        if merged and len(merged[-1]) + 1 + len(piece) <= max_chars // 2:
+            merged[-1] = f"{merged[-1]} {piece}"
+        else:
+            merged.append(piece)
+    return merged
+
+
+def split_sentences(text: str, max_chars: int = 200) -> List[str]:
+    """텍스트를 합성 단위(문장 또는 절) 목록으로 나눕니다."""
+    segments = []
+    for paragraph in re.split(r'\n\s*\n|\r?\n', text):
+        for sentence in _split_keep(_SENTENCE_END, paragraph):
+            segments.extend(_split_long(sentence, max_chars))
+    return segments
@@ -0,0 +1,317 @@
+"""텍스트 일괄 음성 변환
+
+(id, text, voice, rate) 행이 담긴 CSV 또는 JSONL 목록을 읽어 행마다 WAV 파일로 합성합니다.
+프로세스 풀의 작업자마다 TTS 엔진을 하나씩 만들어 두고 재사용하며, 결과는 녹음 디렉토리에
+접두사 + id 이름으로 저장되어 녹음 목록에 나타납니다. 이미 합성한 행은 진행 기록으로 확인해
+건너뛰므로 중단한 일괄 변환을 다시 실행하면 남은 행만 합성합니다.
+
+CSV는 첫 줄이 머리글이어야 하고 id, text 열은 필수, voice, rate 열은 생략할 수 있습니다:
+
+    id,text,voice,rate
+    greeting,안녕하세요,korean,150
+
+JSONL은 한 줄에 객체 하나입니다: {"id": "greeting", "text": "안녕하세요", "rate": 150}
+"""
+import os
+import re
+import csv
+import json
+import time
+import shutil
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from tts_cache import cache_key
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_FILE = ".tts_batch.json"
+
+# 작업자가 합성 중인 파일을 두는 디렉토리 (녹음 디렉토리 안, 목록에는 나타나지 않음)
+WORK_DIR = ".tts_batch_tmp"
+
+_UNSAFE_CHARS = re.compile(r"[^\w.-]+")
+
+
+@dataclass
+class BatchItem:
+    """합성할 행 하나 (voice, rate가 None이면 일괄 변환 기본값 사용)"""
+    id: str
+    text: str
+    voice: Optional[str] = None
+    rate: Optional[int] = None
+
+    def file_name(self, prefix: str = "") -> str:
+        """녹음 디렉토리에 저장할 파일 이름 (파일 이름에 쓸 수 없는 문자는 _로 바꿈)"""
+        return f"{prefix}{_UNSAFE_CHARS.sub('_', self.id).strip('.')}.wav"
+
+
+def _parse_row(row: dict, where: str) -> BatchItem:
+    item_id = str(row.get("id") or "").strip()
+    text = str(row.get("text") or "").strip()
+    if not item_id:
+        raise ValueError(f"{where}: id가 없습니다.")
+    if not text:
+        raise ValueError(f"{where}: text가 없습니다 (id: {item_id}).")
+    voice = str(row.get("voice") or "").strip() or None
+    rate = row.get("rate")
+    if rate in (None, ""):
+        rate = None
+    else:
+        try:
+            rate = int(rate)
+        except (TypeError, ValueError):
+            raise ValueError(f"{where}: rate가 정수가 아닙니다: {rate}") from None
+    return BatchItem(item_id, text, voice, rate)
+
+
+def load_items(path: str) -> List[BatchItem]:
+    """CSV(.csv) 또는 JSONL(그 밖의 확장자) 목록을 읽습니다. 형식 오류는 줄 번호와 함께 ValueError로 알립니다."""
+    items = []
+    if path.lower().endswith(".csv"):
+        # 엑셀에서 저장한 CSV의 BOM도 허용
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            missing = {"id", "text"} - set(reader.fieldnames or ())
+            if missing:
+                raise ValueError(f"{path}: CSV 머리글에 {', '.join(sorted(missing))} 열이 없습니다.")
+            for row in reader:
+                items.append(_parse_row(row, f"{path}:{reader.line_num}"))
+    else:
+        with open(path, encoding='utf-8-sig') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                where = f"{path}:{line_number}"
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{where}: JSON 형식 오류 ({e})") from None
+                if not isinstance(row, dict):
+                    raise ValueError(f"{where}: 객체가 아닙니다.")
+                items.append(_parse_row(row, where))
+
+    seen = set()
+    for item in items:
+        if item.id in seen:
+            raise ValueError(f"{path}: id가 중복됩니다: {item.id}")
+        seen.add(item.id)
+    return items
+
+
+# ----------------------------------------------------------------------
+# 행 하나 합성 (작업자 프로세스)
+# ----------------------------------------------------------------------
+# 작업자 프로세스마다 하나씩 만드는 엔진과 음성 검색 결과
+_worker_engine = None
+_worker_voices: Dict[str, str] = {}
+
+
+def _init_worker(driver_name):
+    """작업자 프로세스에서 TTS 엔진을 한 번만 만듭니다."""
+    global _worker_engine
+    from tts_engine import TTSEngine
+
+    _worker_engine = TTSEngine(driver_name=driver_name)
+
+
+def _resolve_voice(voice):
+    if not voice:
+        return None
+    if voice not in _worker_voices:
+        voice_id = _worker_engine.find_voice(voice)
+        if voice_id is None:
+            raise ValueError(f"음성을 찾을 수 없습니다: {voice}")
+        _worker_voices[voice] = voice_id
+    return _worker_voices[voice]
+
+
+def render_item(text: str, rate: int, voice: Optional[str], work_path: str, out_path: str) -> dict:
+    """작업자 프로세스에서 한 행을 work_path에 합성하고, 읽을 수 있는 WAV이면 out_path로 옮깁니다."""
+    from playback_engine import WavSource
+
+    started = time.perf_counter()
+    try:
+        _worker_engine.save_to_file(text, work_path, rate=rate, voice=_resolve_voice(voice))
+        synthesized = time.perf_counter()
+        if not os.path.exists(work_path):
+            raise RuntimeError("합성 결과 파일이 만들어지지 않았습니다.")
+        source = WavSource(work_path)
+        try:
+            duration = source.duration
+        finally:
+            source.close()
+        if duration <= 0:
+            raise RuntimeError("합성 결과가 비어 있습니다.")
+        os.replace(work_path, out_path)
+    except Exception:
+        try:
+            os.remove(work_path)
+        except OSError:
+            pass
+        raise
+    return {
+        "output": os.path.basename(out_path),
+        "duration": duration,
+        "synth_time": synthesized - started,
+        "elapsed": time.perf_counter() - started,
+    }
+
+
+# ----------------------------------------------------------------------
+# 일괄 변환
+# ----------------------------------------------------------------------
+@dataclass
+class TTSBatchReport:
+    """일괄 변환 결과 (timings는 id별 합성 시간)"""
+    total: int = 0
+    rendered: int = 0
+    skipped: int = 0
+    cancelled: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    audio_seconds: float = 0.0
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        text = (f"합성 {self.rendered}개, 건너뜀 {self.skipped}개, 실패 {len(self.failed)}개"
+                + (f", 취소 {self.cancelled}개" if self.cancelled else "")
+                + f" / 전체 {self.total}개, {self.elapsed:.1f}초 (오디오 {self.audio_seconds:.0f}초")
+        if self.timings:
+            slowest = max(self.timings, key=self.timings.get)
+            average = sum(self.timings.values()) / len(self.timings)
+            text += f", 항목당 평균 {average:.2f}초, 최대 {self.timings[slowest]:.2f}초 [{slowest}]"
+        return text + ")"
+
+
+class TTSBatchRenderer:
+    """목록의 행을 프로세스 풀에서 합성해 녹음 디렉토리에 저장합니다."""
+
+    def __init__(self, directory: str, items: List[BatchItem], prefix: str = "",
+                 workers: Optional[int] = None, driver_name: Optional[str] = None,
+                 rate: int = 150, voice: Optional[str] = None):
+        self.directory = directory
+        self.items = items
+        self.prefix = prefix
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.driver_name = driver_name
+        self.rate = rate
+        self.voice = voice
+        self.progress_path = os.path.join(directory, PROGRESS_FILE)
+        self.work_dir = os.path.join(directory, WORK_DIR)
+
+        names = {}
+        for item in items:
+            name = item.file_name(prefix)
+            if name in names:
+                raise ValueError(f"id {names[name]}와 {item.id}의 파일 이름이 같습니다: {name}")
+            names[name] = item.id
+        self.progress = self._load_progress()
+
+    def _load_progress(self):
+        try:
+            with open(self.progress_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_progress(self):
+        tmp_path = f"{self.progress_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.progress, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.progress_path)
+
+    def settings_for(self, item: BatchItem):
+        """행에 적용할 (속도, 음성)"""
+        return item.rate or self.rate, item.voice or self.voice
+
+    def _key(self, item: BatchItem) -> str:
+        rate, voice = self.settings_for(item)
+        # 합성 캐시와 같은 키: 텍스트, 음성, 속도, 엔진이 같으면 같은 결과
+        return cache_key(item.text, voice, rate, self.driver_name or "")
+
+    def is_up_to_date(self, item: BatchItem) -> bool:
+        """같은 내용으로 합성한 파일이 그대로 남아 있으면 참입니다."""
+        name = item.file_name(self.prefix)
+        entry = self.progress.get(name)
+        if not entry or entry.get("key") != self._key(item):
+            return False
+        try:
+            return os.path.getsize(os.path.join(self.directory, name)) == entry.get("size")
+        except OSError:
+            return False
+
+    def pending(self, force: bool = False) -> List[BatchItem]:
+        """합성해야 할 행 목록을 반환합니다."""
+        return [item for item in self.items if force or not self.is_up_to_date(item)]
+
+    def run(self, force: bool = False,
+            on_progress: Optional[Callable[[int, int, str, Optional[dict]], None]] = None,
+            cancel_event=None) -> TTSBatchReport:
+        """남은 행을 프로세스 풀에서 합성합니다.
+
+        on_progress(완료 수, 대상 수, id, 결과 또는 None)는 행 하나가 끝날 때마다 호출되고,
+        실패한 행의 오류는 report.failed에 남습니다. cancel_event가 설정되면 아직 시작하지 않은 행은 취소합니다.
+        기존 녹음을 덮어쓰지 않도록, 진행 기록에 없는 같은 이름의 파일이 있으면 force일 때만 합성합니다.
+        """
+        todo = self.pending(force)
+        report = TTSBatchReport(total=len(self.items), skipped=len(self.items) - len(todo))
+        started = time.perf_counter()
+        if not todo:
+            return report
+
+        os.makedirs(self.work_dir, exist_ok=True)
+        last_save = time.monotonic()
+        cancelling = False
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(todo)), initializer=_init_worker,
+                                     initargs=(self.driver_name,)) as pool:
+                futures = {}
+                for item in todo:
+                    name = item.file_name(self.prefix)
+                    out_path = os.path.join(self.directory, name)
+                    if not force and name not in self.progress and os.path.exists(out_path):
+                        report.failed[item.id] = f"같은 이름의 녹음이 이미 있습니다: {name}"
+                        continue
+                    rate, voice = self.settings_for(item)
+                    future = pool.submit(render_item, item.text, rate, voice,
+                                         os.path.join(self.work_dir, name), out_path)
+                    futures[future] = item
+
+                for done, future in enumerate(as_completed(futures), 1):
+                    item = futures[future]
+                    if cancel_event is not None and cancel_event.is_set() and not cancelling:
+                        cancelling = True
+                        report.cancelled = sum(f.cancel() for f in futures)
+                    if future.cancelled():
+                        continue
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        report.failed[item.id] = str(e)
+                        logger.error(f"일괄 음성 변환 오류 ({item.id}): {e}")
+                        result = None
+                    else:
+                        report.rendered += 1
+                        report.audio_seconds += result["duration"]
+                        report.timings[item.id] = result["elapsed"]
+                        self.progress[result["output"]] = {
+                            "id": item.id,
+                            "key": self._key(item),
+                            "size": os.path.getsize(os.path.join(self.directory, result["output"])),
+                        }
+                    report.elapsed = time.perf_counter() - started
+                    if on_progress:
+                        on_progress(done, len(futures), item.id, result)
+                    # 중간에 멈춰도 다시 합성하지 않도록 진행 기록을 주기적으로 저장
+                    if time.monotonic() - last_save > 2.0:
+                        self._save_progress()
+                        last_save = time.monotonic()
+        finally:
+            self._save_progress()
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+        report.elapsed = time.perf_counter() - started
+        return report
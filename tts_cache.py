@@ -0,0 +1,140 @@
+"""합성 음성 디스크 캐시
+
+(텍스트, 음성 ID, 속도, 엔진)을 해시한 키로 합성 결과 WAV를 저장해 두고,
+같은 문구를 다시 요청하면 합성 없이 바로 재생할 수 있게 합니다.
+전체 크기가 한도를 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다.
+"""
+import os
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(text: str, voice: Optional[str], rate: int, engine: str) -> str:
+    """캐시 키(SHA-256 16진 문자열)를 만듭니다."""
+    raw = "\x1f".join([engine, voice or "default", str(rate), text])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class TTSCache:
+    """합성 결과 WAV 파일을 내용 주소 방식으로 저장하는 LRU 캐시입니다."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # 키 -> 파일 크기 (앞쪽이 가장 오래 사용하지 않은 항목)
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        """디렉토리를 읽어 마지막 사용 시각 순으로 색인을 만듭니다."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.startswith(".tmp_"):
+                # 합성 도중 중단된 파일
+                os.remove(entry.path)
+                continue
+            if entry.name.endswith(".wav"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def lookup(self, key: str) -> Optional[str]:
+        """캐시된 파일 경로를 반환합니다. 없으면 None을 반환합니다."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            path = self.path_for(key)
+            if not os.path.exists(path):
+                self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # 재시작 후에도 LRU 순서가 유지되도록 사용 시각 기록
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def store(self, key: str, render: Callable[[str], None]) -> str:
+        """render(임시 경로)로 파일을 만들고 캐시에 등록한 뒤 경로를 반환합니다."""
+        path = self.path_for(key)
+        # 일부 드라이버는 확장자로 형식을 정하므로 임시 파일도 .wav로 끝나게 함
+        tmp_path = os.path.join(self.cache_dir, f".tmp_{key}_{threading.get_ident()}.wav")
+        try:
+            render(tmp_path)
+            size = os.path.getsize(tmp_path)
+            if size == 0:
+                raise RuntimeError("합성 결과가 비어 있습니다.")
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict()
+        return path
+
+    def adopt(self, key: str, file_path: str) -> str:
+        """다른 곳에서 합성한 파일을 캐시로 옮겨 등록하고 캐시 경로를 반환합니다."""
+        return self.store(key, lambda tmp_path: os.replace(file_path, tmp_path))
+
+    def get_or_render(self, key: str, render: Callable[[str], None]) -> Tuple[str, bool]:
+        """캐시에 있으면 그 경로를, 없으면 새로 합성한 경로를 (경로, 적중 여부)로 반환합니다."""
+        path = self.lookup(key)
+        if path is not None:
+            return path, True
+        return self.store(key, render), False
+
+    def _evict(self):
+        # 가장 최근 항목 하나는 방금 넣은 것이므로 남겨 둠
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self.path_for(key))
+            except OSError as e:
+                logger.error(f"TTS 캐시 삭제 오류: {e}")
+
+    def clear(self) -> None:
+        """캐시를 모두 비웁니다."""
+        with self._lock:
+            for key in list(self._entries):
+                try:
+                    os.remove(self.path_for(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """적중/미스 횟수와 저장 현황을 반환합니다."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+            }
@@ -0,0 +1,76 @@
+"""TTS 엔진
+
+pyttsx3를 감싸서 음성 선택, 속도 설정, 낭독, 파일 저장을 제공합니다.
+Tk에 의존하지 않습니다.
+"""
+import sys
+import logging
+from typing import Optional, Tuple
+
+from tts_cache import TTSCache, cache_key
+
+logger = logging.getLogger(__name__)
+
+
+def default_driver_name() -> str:
+    """현재 플랫폼에서 pyttsx3가 기본으로 사용하는 드라이버 이름을 반환합니다."""
+    if sys.platform == 'win32':
+        return 'sapi5'
+    if sys.platform == 'darwin':
+        return 'nsss'
+    return 'espeak'
+
+
+class TTSEngine:
+    """pyttsx3 엔진 하나를 감싼 텍스트 음성 변환기입니다."""
+
+    def __init__(self, rate: int = 150, driver_name: Optional[str] = None,
+                 cache: Optional[TTSCache] = None):
+        # pyttsx3는 가져오는 데만 수백 ms가 걸리므로 엔진을 만들 때 가져옴
+        import pyttsx3
+
+        self.driver_name = driver_name or default_driver_name()
+        self.engine = pyttsx3.init(driver_name) if driver_name else pyttsx3.init()
+        self.engine.setProperty('rate', rate)
+        self.cache = cache
+        logger.info("TTS 엔진 초기화 성공")
+
+    def find_voice(self, keyword: str = "korean") -> Optional[str]:
+        """ID가 keyword와 같거나 이름에 keyword가 들어간(대소문자 무시) 첫 번째 음성의 ID를 반환합니다."""
+        for voice in self.engine.getProperty('voices'):
+            if voice.id == keyword or keyword.lower() in voice.name.lower():
+                return voice.id
+        return None
+
+    def configure(self, rate: Optional[int] = None, voice: Optional[str] = None) -> None:
+        """속도와 음성을 설정합니다."""
+        if rate is not None:
+            self.engine.setProperty('rate', rate)
+        if voice is not None:
+            self.engine.setProperty('voice', voice)
+
+    def speak(self, text: str, rate: Optional[int] = None, voice: Optional[str] = None) -> None:
+        """텍스트를 읽습니다 (끝날 때까지 블로킹)."""
+        self.configure(rate, voice)
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+    def save_to_file(self, text: str, file_path: str, rate: Optional[int] = None,
+                     voice: Optional[str] = None) -> None:
+        """텍스트를 합성해 WAV 파일로 저장합니다 (끝날 때까지 블로킹)."""
+        self.configure(rate, voice)
+        self.engine.save_to_file(text, file_path)
+        self.engine.runAndWait()
+
+    def render_cached(self, text: str, rate: int, voice: Optional[str] = None) -> Tuple[str, bool]:
+        """캐시를 거쳐 텍스트를 WAV 파일로 만들고 (경로, 캐시 적중 여부)를 반환합니다."""
+        if self.cache is None:
+            raise RuntimeError("TTS 캐시가 설정되지 않았습니다.")
+        key = cache_key(text, voice, rate, self.driver_name)
+        return self.cache.get_or_render(
+            key, lambda path: self.save_to_file(text, path, rate=rate, voice=voice)
+        )
+
+    def stop(self) -> None:
+        """진행 중인 낭독을 중단합니다."""
+        self.engine.stop()
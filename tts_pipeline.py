@@ -0,0 +1,142 @@
+"""문장 단위 파이프라인 합성
+
+긴 텍스트를 문장 단위로 나눠 작은 프로세스 풀에서 앞서 합성하고,
+첫 문장이 준비되는 즉시 재생을 시작합니다. 재생하는 동안 다음 문장들이 합성되므로
+첫 소리가 나오기까지의 시간이 전체 텍스트 길이와 거의 무관해집니다.
+"""
+import os
+import time
+import uuid
+import threading
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from text_segmenter import split_sentences
+from tts_cache import TTSCache, cache_key
+
+logger = logging.getLogger(__name__)
+
+# 작업자 프로세스마다 하나씩 만드는 엔진
+_worker_engine = None
+
+
+def _init_worker(driver_name, voice_id):
+    """작업자 프로세스에서 TTS 엔진을 한 번만 만듭니다."""
+    global _worker_engine
+    from tts_engine import TTSEngine
+
+    _worker_engine = TTSEngine(driver_name=driver_name)
+    _worker_engine.configure(voice=voice_id)
+
+
+def _render_segment(text, rate, out_path):
+    """작업자 프로세스에서 한 조각을 WAV로 합성합니다."""
+    started = time.perf_counter()
+    _worker_engine.save_to_file(text, out_path, rate=rate)
+    return out_path, time.perf_counter() - started
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class StreamingSynthesizer:
+    """문장 단위로 앞서 합성하며 순서대로 재생하는 합성기입니다."""
+
+    def __init__(self, work_dir: str, driver_name: Optional[str] = None,
+                 voice_id: Optional[str] = None, workers: int = 2, lookahead: int = 3,
+                 cache: Optional[TTSCache] = None, engine_name: str = ""):
+        self.work_dir = work_dir
+        self.driver_name = driver_name
+        self.voice_id = voice_id
+        self.workers = workers
+        self.lookahead = max(1, lookahead)
+        self.cache = cache
+        self.engine_name = engine_name or (driver_name or "")
+        self._pool: Optional[ProcessPoolExecutor] = None
+        os.makedirs(work_dir, exist_ok=True)
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.driver_name, self.voice_id)
+            )
+        return self._pool
+
+    def speak(self, text: str, rate: int, play: Callable[[str, threading.Event], None],
+              cancel_event: Optional[threading.Event] = None,
+              on_first_audio: Optional[Callable[[float], None]] = None) -> int:
+        """텍스트를 문장 단위로 합성하며 재생합니다. 재생한 조각 수를 반환합니다."""
+        cancel_event = cancel_event or threading.Event()
+        segments = split_sentences(text)
+        if not segments:
+            return 0
+
+        started = time.perf_counter()
+        run_id = uuid.uuid4().hex[:8]
+        pool = self._get_pool()
+        pending = deque()
+        next_index = 0
+
+        def submit_next():
+            nonlocal next_index
+            segment = segments[next_index]
+            key = cache_key(segment, self.voice_id, rate, self.engine_name) if self.cache else None
+            cached = self.cache.lookup(key) if self.cache else None
+            if cached:
+                pending.append((key, None, cached))
+            else:
+                out_path = os.path.join(self.work_dir, f"segment_{run_id}_{next_index}.wav")
+                pending.append((key, pool.submit(_render_segment, segment, rate, out_path), out_path))
+            next_index += 1
+
+        played = 0
+        try:
+            while next_index < len(segments) and len(pending) < self.lookahead:
+                submit_next()
+
+            while pending and not cancel_event.is_set():
+                key, future, path = pending.popleft()
+                if future is not None:
+                    # 취소를 확인하면서 합성 완료를 기다림
+                    while not future.done():
+                        if cancel_event.wait(0.02):
+                            break
+                    if cancel_event.is_set():
+                        pending.appendleft((key, future, path))
+                        break
+                    future.result()
+                    if self.cache:
+                        path = self.cache.adopt(key, path)
+
+                if next_index < len(segments):
+                    submit_next()
+
+                if played == 0 and on_first_audio:
+                    on_first_audio(time.perf_counter() - started)
+                play(path, cancel_event)
+                played += 1
+
+                if future is not None and not self.cache:
+                    os.remove(path)
+        finally:
+            # 남은 작업은 취소하고, 이미 합성 중인 조각은 끝나는 대로 임시 파일 삭제
+            for _, future, path in pending:
+                if future is not None and not future.cancel():
+                    future.add_done_callback(lambda f, p=path: _remove_quietly(p))
+                elif future is not None:
+                    _remove_quietly(path)
+        return played
+
+    def close(self) -> None:
+        """작업자 프로세스를 종료합니다."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
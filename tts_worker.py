@@ -0,0 +1,241 @@
+"""TTS 전용 작업자 스레드
+
+pyttsx3 엔진은 스레드 간에 공유하면 요청끼리 충돌하므로, 엔진을 소유한 작업자 스레드 하나가
+우선순위 큐에서 작업을 꺼내 차례로 처리합니다. 음성 검색은 처음 한 번만 수행하고 결과를 재사용합니다.
+"""
+import os
+import itertools
+import queue
+import threading
+import time
+import logging
+from typing import Callable, List, Optional
+
+from tts_cache import TTSCache
+from tts_engine import TTSEngine
+from tts_pipeline import StreamingSynthesizer
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+_SHUTDOWN = object()
+
+
+class TTSJob:
+    """낭독 요청 하나와 그 처리 결과/지표를 담습니다."""
+
+    def __init__(self, text: str, rate: int, priority: int = PRIORITY_NORMAL,
+                 on_done: Optional[Callable[["TTSJob"], None]] = None, streaming: bool = False):
+        self.text = text
+        self.rate = rate
+        self.priority = priority
+        self.on_done = on_done
+        self.streaming = streaming
+
+        self.status = "queued"  # queued, running, done, cancelled, failed
+        self.error: Optional[Exception] = None
+        self.cache_hit = False
+        self.submitted_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.synthesized_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+        self.cancel_event = threading.Event()
+        self._done = threading.Event()
+
+    @property
+    def queue_wait(self) -> Optional[float]:
+        """큐에서 기다린 시간(초)"""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.submitted_at
+
+    @property
+    def synth_time(self) -> Optional[float]:
+        """합성(또는 캐시 조회)에 걸린 시간(초). 스트리밍이면 첫 소리까지의 시간"""
+        if self.started_at is None or self.synthesized_at is None:
+            return None
+        return self.synthesized_at - self.started_at
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self) -> None:
+        """작업을 취소합니다. 재생 중이면 다음 청크에서 멈춥니다."""
+        self.cancel_event.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """작업이 끝날 때까지 기다립니다."""
+        return self._done.wait(timeout)
+
+    def metrics(self) -> str:
+        wait = f"{self.queue_wait * 1000:.0f}ms" if self.queue_wait is not None else "-"
+        synth = f"{self.synth_time * 1000:.0f}ms" if self.synth_time is not None else "-"
+        source = "첫 소리" if self.streaming else ("캐시" if self.cache_hit else "합성")
+        return f"대기 {wait}, {source} {synth}"
+
+    def _finish(self, status: str) -> None:
+        self.status = status
+        self.finished_at = time.perf_counter()
+        self._done.set()
+        if self.on_done:
+            try:
+                self.on_done(self)
+            except Exception as e:
+                logger.error(f"TTS 작업 완료 처리 오류: {e}")
+
+
+class TTSWorker:
+    """TTS 엔진을 소유하고 큐의 작업을 하나씩 처리하는 작업자입니다.
+
+    play(경로, 중단 이벤트)가 주어지면 합성 결과를 캐시 WAV로 만든 뒤 재생하고,
+    없으면 엔진의 say/runAndWait로 직접 낭독합니다.
+    스트리밍 작업은 문장 단위로 나눠 streaming_workers개의 프로세스에서 앞서 합성합니다.
+    """
+
+    def __init__(self, rate: int = 150, voice_keyword: str = "korean",
+                 cache_dir: Optional[str] = None,
+                 play: Optional[Callable[[str, threading.Event], None]] = None,
+                 driver_name: Optional[str] = None, streaming_workers: int = 2):
+        self.rate = rate
+        self.voice_keyword = voice_keyword
+        self.cache_dir = cache_dir
+        self.play = play
+        self.driver_name = driver_name
+        self.streaming_workers = streaming_workers
+        self.pipeline: Optional[StreamingSynthesizer] = None
+
+        self.on_log: Callable[[str], None] = logger.info
+        self.on_error: Optional[Callable[[Exception], None]] = None
+        # 엔진 초기화가 끝나면 성공 여부와 함께 호출 (작업자 스레드)
+        self.on_ready: Optional[Callable[[bool], None]] = None
+
+        self.tts: Optional[TTSEngine] = None
+        self.voice_id: Optional[str] = None
+        self.current: Optional[TTSJob] = None
+        self.history: List[TTSJob] = []
+
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def submit(self, text: str, rate: Optional[int] = None, priority: int = PRIORITY_NORMAL,
+               interrupt: bool = False, streaming: bool = False,
+               on_done: Optional[Callable[[TTSJob], None]] = None) -> TTSJob:
+        """낭독 작업을 큐에 넣습니다. interrupt면 현재 작업을 멈추고 먼저 처리합니다."""
+        job = TTSJob(text, rate or self.rate, PRIORITY_HIGH if interrupt else priority, on_done, streaming)
+        if interrupt:
+            self.interrupt()
+        self._queue.put((job.priority, next(self._seq), job))
+        return job
+
+    def interrupt(self) -> None:
+        """현재 처리 중인 작업을 중단합니다."""
+        job = self.current
+        if job is not None:
+            job.cancel()
+            if self.play is None and self.tts is not None:
+                # 직접 낭독 중이면 엔진에 중단 요청
+                self.tts.stop()
+
+    def cancel_all(self) -> None:
+        """대기 중인 작업을 모두 취소하고 현재 작업도 중단합니다."""
+        while True:
+            try:
+                _, _, job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is _SHUTDOWN:
+                self._queue.put((PRIORITY_LOW + 1, next(self._seq), job))
+                break
+            job.cancel()
+            job._finish("cancelled")
+        self.interrupt()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        """남은 작업을 취소하고 작업자를 종료합니다."""
+        self.cancel_all()
+        self._queue.put((PRIORITY_LOW + 1, next(self._seq), _SHUTDOWN))
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _run(self):
+        # 엔진은 반드시 이 스레드에서 만들고 이 스레드에서만 사용
+        try:
+            cache = TTSCache(self.cache_dir) if self.cache_dir else None
+            self.tts = TTSEngine(rate=self.rate, driver_name=self.driver_name, cache=cache)
+            self.voice_id = self.tts.find_voice(self.voice_keyword)
+            if self.voice_id:
+                self.on_log(f"한국어 음성 설정: {self.voice_id}")
+            else:
+                self.on_log("한국어 음성을 찾을 수 없습니다. 기본 음성을 사용합니다.")
+        except Exception as e:
+            logger.error(f"TTS 엔진 초기화 오류: {e}")
+            if self.on_error:
+                self.on_error(e)
+            self.tts = None
+        if self.on_ready:
+            self.on_ready(self.tts is not None)
+
+        while True:
+            _, _, job = self._queue.get()
+            if job is _SHUTDOWN:
+                if self.pipeline is not None:
+                    self.pipeline.close()
+                break
+            if job.cancelled:
+                job._finish("cancelled")
+                continue
+            if self.tts is None:
+                job.error = RuntimeError("TTS 엔진을 사용할 수 없습니다.")
+                job._finish("failed")
+                continue
+
+            self.current = job
+            job.status = "running"
+            job.started_at = time.perf_counter()
+            try:
+                self._process(job)
+                job._finish("cancelled" if job.cancelled else "done")
+            except Exception as e:
+                job.error = e
+                job._finish("failed")
+            finally:
+                self.current = None
+                self.history = (self.history + [job])[-100:]
+
+    def _process(self, job):
+        if job.streaming and self.play is not None and self.tts.cache is not None:
+            if self.pipeline is None:
+                self.pipeline = StreamingSynthesizer(
+                    work_dir=os.path.join(self.cache_dir, "segments"),
+                    driver_name=self.tts.driver_name,
+                    voice_id=self.voice_id,
+                    workers=self.streaming_workers,
+                    cache=self.tts.cache,
+                    engine_name=self.tts.driver_name
+                )
+
+            def first_audio(elapsed):
+                job.synthesized_at = time.perf_counter()
+
+            self.pipeline.speak(job.text, job.rate, self.play, job.cancel_event, on_first_audio=first_audio)
+        elif self.play is not None and self.tts.cache is not None:
+            file_path, job.cache_hit = self.tts.render_cached(job.text, job.rate, self.voice_id)
+            job.synthesized_at = time.perf_counter()
+            if not job.cancelled:
+                self.play(file_path, job.cancel_event)
+        else:
+            job.synthesized_at = time.perf_counter()
+            self.tts.speak(job.text, rate=job.rate, voice=self.voice_id)
@@ -0,0 +1,92 @@
+"""스레드 안전한 UI 이벤트 버스
+
+Tk 위젯은 메인 스레드에서만 다뤄야 하므로 백그라운드 스레드는 이벤트만 보내고,
+메인 루프가 root.after로 일정한 프레임 간격마다 모아서 반영합니다.
+같은 키의 값 이벤트(레벨, 상태 등)는 마지막 값만 남기고, 로그는 한 번에 묶어서 전달합니다.
+"""
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class UIEventBus:
+    """백그라운드 스레드의 UI 갱신 요청을 모아 메인 스레드에서 처리합니다."""
+
+    def __init__(self, root, fps=30):
+        self.root = root
+        self.interval_ms = max(1, int(1000 / fps))
+        self._lock = threading.Lock()
+        self._values = {}
+        self._logs = []
+        self._calls = []
+        self._value_handlers = {}
+        self._log_handlers = []
+        self._after_id = None
+
+    def on(self, key, handler):
+        """값 이벤트 처리기를 등록합니다. 프레임마다 가장 최근 값 하나만 전달됩니다."""
+        self._value_handlers[key] = handler
+
+    def on_logs(self, handler):
+        """로그 처리기를 등록합니다. 프레임마다 쌓인 로그 목록이 한 번에 전달됩니다."""
+        self._log_handlers.append(handler)
+
+    def post(self, key, value):
+        """값 이벤트를 보냅니다 (같은 키는 최신 값으로 덮어씀)."""
+        with self._lock:
+            self._values[key] = value
+
+    def post_log(self, message):
+        """로그 한 줄을 보냅니다."""
+        with self._lock:
+            self._logs.append(message)
+
+    def call(self, func, *args):
+        """메인 스레드에서 실행할 함수를 보냅니다 (보낸 순서대로 실행됨)."""
+        with self._lock:
+            self._calls.append((func, args))
+
+    def start(self):
+        """주기적인 이벤트 처리를 시작합니다."""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        """주기적인 이벤트 처리를 멈춥니다."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def flush(self):
+        """쌓인 이벤트를 즉시 처리합니다 (메인 스레드에서만 호출)."""
+        with self._lock:
+            values, self._values = self._values, {}
+            logs, self._logs = self._logs, []
+            calls, self._calls = self._calls, []
+
+        for key, value in values.items():
+            handler = self._value_handlers.get(key)
+            if handler is None:
+                continue
+            try:
+                handler(value)
+            except Exception as e:
+                logger.error(f"UI 이벤트 처리 오류 ({key}): {e}")
+
+        if logs:
+            for handler in self._log_handlers:
+                try:
+                    handler(logs)
+                except Exception as e:
+                    logger.error(f"UI 로그 처리 오류: {e}")
+
+        for func, args in calls:
+            try:
+                func(*args)
+            except Exception as e:
+                logger.error(f"UI 호출 처리 오류: {e}")
+
+    def _drain(self):
+        self.flush()
+        self._after_id = self.root.after(self.interval_ms, self._drain)
@@ -0,0 +1,284 @@
+"""음성 구간 감지 (VAD)
+
+녹음 데이터를 짧은 분석 프레임으로 나눠 에너지와 영교차율로 음성 여부를 판단합니다.
+잡음 바닥은 조용한 구간에서 계속 따라가므로 환경 소음이 바뀌어도 기준이 맞춰집니다.
+무음 구간은 모드에 따라 그대로 두거나(keep), 버리거나(drop), 짧게 줄여서(compress)
+디스크에 쓰기 전에 걸러 내고, 음성 구간의 위치를 기록합니다.
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from audio_meter import FULL_SCALE
+
+VAD_MODES = ("off", "keep", "drop", "compress")
+
+# 잡음 바닥을 정하기 전의 초깃값 (dBFS). 조용한 방 수준으로 낮게 잡아 첫 소리를 음성으로 봄
+INITIAL_NOISE_FLOOR_DBFS = -60.0
+
+
+@dataclass
+class SpeechSegment:
+    """음성 구간 하나 (초 단위). start/end는 기록된 파일 기준, source_*는 원래 입력 기준입니다."""
+    start: float
+    end: float
+    source_start: float
+    source_end: float
+
+    def to_dict(self) -> dict:
+        return {
+            "start": round(self.start, 3),
+            "end": round(self.end, 3),
+            "source_start": round(self.source_start, 3),
+            "source_end": round(self.source_end, 3),
+        }
+
+
+class VoiceActivityDetector:
+    """녹음 청크를 받아 무음 구간을 걸러 낸 데이터를 돌려주는 VAD 단계입니다.
+
+    음성이 min_speech_ms 이상 이어지면 구간이 시작되고, hangover_ms 동안 무음이 이어지면 끝납니다.
+    구간 앞에는 pre_pad_ms, 뒤에는 post_pad_ms만큼 주변 소리를 붙입니다.
+    compress 모드는 무음 구간마다 처음 max_silence_ms까지만 남깁니다. 16비트 PCM만 지원합니다.
+
+    녹음을 시작하자마자 말해도 놓치지 않도록, 처음 settle_ms 동안은 min_speech_dbfs를 넘는 프레임을
+    모두 음성으로 봅니다. 그동안 소리 크기 차이가 threshold_db보다 컸으면 가장 조용했던 프레임을
+    잡음 바닥의 시작값으로 쓰고, 계속 같은 크기였으면(말을 계속했거나 일정한 잡음) 낮은 초깃값을 유지합니다.
+    최근 floor_window_ms 동안 가장 조용한 소리도 잡음 바닥보다 threshold_db / 2 넘게 크면 그 값으로 올리므로,
+    시끄러운 곳에서 시작해도 잡음을 음성으로 보는 시간은 floor_window_ms 정도를 넘지 않습니다.
+    """
+
+    def __init__(self, sample_rate: int, channels: int = 1, sample_width: int = 2, mode: str = "drop",
+                 frame_ms: int = 10, threshold_db: float = 9.0, min_speech_dbfs: float = -55.0,
+                 hangover_ms: int = 400, pre_pad_ms: int = 200, post_pad_ms: int = 150,
+                 min_speech_ms: int = 30, max_silence_ms: int = 500, settle_ms: int = 500,
+                 floor_window_ms: int = 5000):
+        if mode not in VAD_MODES[1:]:
+            raise ValueError(f"알 수 없는 VAD 모드입니다: {mode}")
+        if sample_width != 2:
+            raise ValueError("VAD는 16비트 샘플만 지원합니다.")
+
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.mode = mode
+        self.threshold_db = threshold_db
+        self.min_speech_dbfs = min_speech_dbfs
+
+        self.frame_samples = max(1, sample_rate * frame_ms // 1000)
+        self.frame_bytes = self.frame_samples * channels * sample_width
+        self.frame_seconds = self.frame_samples / float(sample_rate)
+
+        def frames_for(ms):
+            return max(0, int(round(ms / float(frame_ms))))
+
+        self.hangover_frames = max(1, frames_for(hangover_ms))
+        self.post_pad_frames = min(frames_for(post_pad_ms), self.hangover_frames)
+        self.min_speech_frames = max(1, frames_for(min_speech_ms))
+        self.pre_pad_frames = frames_for(pre_pad_ms)
+        self.max_silence_frames = frames_for(max_silence_ms)
+        self.settle_frames = frames_for(settle_ms)
+        # 최근 구간 최솟값은 0.5초 블록 단위로 모아 둠
+        self.floor_block_frames = max(1, frames_for(500))
+        self.floor_blocks = max(1, frames_for(floor_window_ms) // self.floor_block_frames)
+
+        self.reset()
+
+    def reset(self) -> None:
+        """새 녹음을 위해 상태를 초기화합니다."""
+        self._pending = bytearray()
+        # 구간 밖 프레임은 앞 패딩 + 시작 판정에 필요한 만큼 잡아 두고, 밀려나는 프레임을 무음으로 처리
+        self._preroll = deque()
+        self._preroll_size = self.pre_pad_frames + self.min_speech_frames
+        self._tail = []
+        self._in_speech = False
+        self._onset = 0
+        self._silent_run = 0
+        self._silence_kept = 0
+        self._segment_start = None
+        self.noise_floor = INITIAL_NOISE_FLOOR_DBFS
+        self._settle_left = self.settle_frames
+        self._settle_min = None
+        self._settle_max = None
+        self._block_min = None
+        self._block_count = 0
+        self._recent_mins = deque(maxlen=self.floor_blocks)
+
+        self.frames_in = 0
+        self.frames_out = 0
+        self.speech_frames = 0
+        self.segments: List[SpeechSegment] = []
+
+    # ------------------------------------------------------------------
+    # 특징 / 판정
+    # ------------------------------------------------------------------
+    def _features(self, data):
+        """프레임별 (에너지 dBFS, 영교차율)을 계산합니다."""
+        samples = np.frombuffer(data, dtype=np.int16).reshape(-1, self.frame_samples * self.channels)
+        if self.channels > 1:
+            mono = samples.reshape(len(samples), self.frame_samples, self.channels).mean(axis=2)
+        else:
+            mono = samples.astype(np.float32)
+        rms = np.sqrt(np.mean(np.square(mono, dtype=np.float64), axis=1))
+        energy = 20.0 * np.log10(np.maximum(rms, 1.0) / FULL_SCALE)
+        signs = np.signbit(mono)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / float(self.frame_samples)
+        return energy, zcr
+
+    def _is_speech(self, energy, zcr):
+        loud_enough = energy > self.min_speech_dbfs
+        if self._settle_left > 0:
+            # 시작 직후에는 잡음 바닥을 모르므로 충분히 큰 소리는 음성으로 보고, 가장 조용한 프레임을 기억
+            self._settle_left -= 1
+            if self._settle_min is None:
+                self._settle_min = self._settle_max = energy
+            self._settle_min = min(self._settle_min, energy)
+            self._settle_max = max(self._settle_max, energy)
+            if self._settle_left == 0:
+                if self._settle_max - self._settle_min > self.threshold_db:
+                    self.noise_floor = self._settle_min
+                else:
+                    self.noise_floor = min(self._settle_min, INITIAL_NOISE_FLOOR_DBFS)
+            return loud_enough
+
+        self._track_minimum(energy)
+        floor = self.noise_floor
+        voiced = energy > floor + self.threshold_db
+        # 마찰음(ㅅ, ㅎ 등)은 에너지가 낮고 영교차율이 높음
+        unvoiced = zcr > 0.25 and energy > floor + self.threshold_db / 2
+        speech = loud_enough and (voiced or unvoiced)
+
+        # 잡음 바닥: 더 조용해지면 빠르게, 무음 중에는 천천히, 음성 중에는 아주 천천히 따라감
+        if energy < floor:
+            self.noise_floor += (energy - floor) * 0.3
+        elif not speech:
+            self.noise_floor += (energy - floor) * 0.05
+        else:
+            self.noise_floor += (energy - floor) * 0.001
+        return speech
+
+    def _track_minimum(self, energy):
+        """최근 구간의 가장 조용한 소리가 잡음 바닥보다 훨씬 크면 잡음 바닥을 그 값으로 올립니다."""
+        self._block_min = energy if self._block_min is None else min(self._block_min, energy)
+        self._block_count += 1
+        if self._block_count < self.floor_block_frames:
+            return
+        self._recent_mins.append(self._block_min)
+        self._block_min = None
+        self._block_count = 0
+        if len(self._recent_mins) == self.floor_blocks:
+            quietest = min(self._recent_mins)
+            if quietest > self.noise_floor + self.threshold_db / 2:
+                self.noise_floor = quietest
+
+    # ------------------------------------------------------------------
+    # 프레임 흐름
+    # ------------------------------------------------------------------
+    def _emit(self, out, frame):
+        out.append(frame)
+        self.frames_out += 1
+
+    def _dispose_silence(self, out, frame):
+        """구간 밖으로 확정된 무음 프레임을 모드에 따라 기록하거나 버립니다."""
+        if self.mode == "keep":
+            self._emit(out, frame)
+        elif self.mode == "compress" and self._silence_kept < self.max_silence_frames:
+            self._silence_kept += 1
+            self._emit(out, frame)
+
+    def _push_outside(self, out, frame):
+        self._preroll.append(frame)
+        if len(self._preroll) > self._preroll_size:
+            self._dispose_silence(out, self._preroll.popleft())
+
+    def _start_segment(self, out):
+        self._segment_start = (self.frames_out, self.frames_in - len(self._preroll))
+        while self._preroll:
+            self._emit(out, self._preroll.popleft())
+        self._in_speech = True
+        self._silent_run = 0
+
+    def _end_segment(self, out):
+        """구간을 끝냅니다. 뒤쪽 무음은 post padding만 남기고 나머지는 구간 밖으로 돌립니다."""
+        keep, rest = self._tail[:self.post_pad_frames], self._tail[self.post_pad_frames:]
+        self._tail = []
+        for frame in keep:
+            self._emit(out, frame)
+        output_start, source_start = self._segment_start
+        source_end = self.frames_in - len(rest)
+        self.segments.append(SpeechSegment(
+            output_start * self.frame_seconds, self.frames_out * self.frame_seconds,
+            source_start * self.frame_seconds, source_end * self.frame_seconds
+        ))
+        self._segment_start = None
+        self._in_speech = False
+        self._onset = 0
+        self._silence_kept = 0
+        for frame in rest:
+            self._push_outside(out, frame)
+
+    def process(self, data: bytes) -> bytes:
+        """청크 하나를 처리하고 디스크에 기록할 데이터를 반환합니다.
+
+        앞 패딩 때문에 출력은 입력보다 최대 pre_pad_ms + min_speech_ms만큼 늦게 나옵니다.
+        """
+        self._pending.extend(data)
+        count = len(self._pending) // self.frame_bytes
+        if count == 0:
+            return b''
+        usable = count * self.frame_bytes
+        block = bytes(self._pending[:usable])
+        del self._pending[:usable]
+
+        energy, zcr = self._features(block)
+        out = []
+        for i in range(count):
+            frame = block[i * self.frame_bytes:(i + 1) * self.frame_bytes]
+            speech = self._is_speech(float(energy[i]), float(zcr[i]))
+            self.frames_in += 1
+            if speech:
+                self.speech_frames += 1
+
+            if self._in_speech:
+                if speech:
+                    for held in self._tail:
+                        self._emit(out, held)
+                    self._tail = []
+                    self._silent_run = 0
+                    self._emit(out, frame)
+                else:
+                    self._silent_run += 1
+                    self._tail.append(frame)
+                    if self._silent_run >= self.hangover_frames:
+                        self._end_segment(out)
+            else:
+                self._push_outside(out, frame)
+                self._onset = self._onset + 1 if speech else 0
+                if self._onset >= self.min_speech_frames:
+                    self._start_segment(out)
+        return b''.join(out)
+
+    def flush(self) -> bytes:
+        """녹음이 끝날 때 남은 프레임을 정리해 반환합니다."""
+        out = []
+        if self._in_speech:
+            self._end_segment(out)
+        while self._preroll:
+            self._dispose_silence(out, self._preroll.popleft())
+        if self.mode == "keep" and self._pending:
+            out.append(bytes(self._pending))
+        self._pending = bytearray()
+        return b''.join(out)
+
+    # ------------------------------------------------------------------
+    @property
+    def kept_ratio(self) -> float:
+        """기록한 프레임 비율 (0.0-1.0)"""
+        return self.frames_out / float(self.frames_in) if self.frames_in else 1.0
+
+    def summary(self) -> str:
+        source = self.frames_in * self.frame_seconds
+        written = self.frames_out * self.frame_seconds
+        return (f"VAD({self.mode}): 음성 구간 {len(self.segments)}개, "
+                f"{source:.1f}초 -> {written:.1f}초 ({self.kept_ratio * 100:.0f}%)")
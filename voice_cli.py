@@ -0,0 +1,361 @@
+"""음성 녹음 및 TTS 명령줄 도구
+
+tkinter 없이 녹음, 재생, 목록 조회, 음성 합성을 수행합니다.
+
+    python voice_cli.py devices
+    python voice_cli.py record --duration 10 --name meeting
+    python voice_cli.py record --devices 0,2 --layout separate
+    python voice_cli.py record --segment-minutes 30 --split-on-silence
+    python voice_cli.py list
+    python voice_cli.py play meeting
+    python voice_cli.py speak "안녕하세요" --output hello.wav
+    python voice_cli.py batch --ops mono,trim,normalize,resample:16000
+    python voice_cli.py tts-batch prompts.csv --workers 4
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def cmd_devices(args):
+    from device_probe import DeviceProber
+    from recorder_engine import RecordingEngine
+    from recordings_store import RecordingsStore
+
+    engine = RecordingEngine()
+    try:
+        # 지원 형식은 녹음 디렉토리의 장치 캐시를 거쳐 확인 (--probe면 캐시를 무시)
+        cache_path = os.path.join(RecordingsStore(args.dir).directory, ".device_cache.json")
+        prober = DeviceProber(engine.audio, cache_path)
+        prober.refresh(force=args.probe)
+        for device in prober.list():
+            print(f"{device.label()}\t{device.describe()}")
+    finally:
+        engine.close()
+    return 0
+
+
+def cmd_record(args):
+    from dataclasses import replace
+
+    from capture_profiles import get_profile
+    from recorder_engine import RecordingEngine
+    from recordings_store import RecordingsStore
+    from segment_writer import SegmentPolicy
+
+    if args.split_on_silence and not args.segment_minutes:
+        raise ValueError("--split-on-silence는 --segment-minutes와 함께 사용해야 합니다.")
+    profile = get_profile(args.profile)
+    if args.rate:
+        profile = replace(profile, sample_rate=args.rate)
+    if args.chunk:
+        profile = replace(profile, chunk_size=args.chunk)
+
+    store = RecordingsStore(args.dir)
+    if args.devices and len(args.devices) > 1:
+        return record_multi(args, profile, store)
+    if args.devices:
+        args.device = args.devices[0]
+
+    engine = RecordingEngine()
+    engine.on_log = logger.info
+    engine.apply_profile(profile)
+    engine.on_error = lambda e: logger.error(f"녹음 오류: {e}")
+    engine.vad_mode = args.vad
+    engine.stats_export_path = args.stats_file
+    engine.stats_export_interval = args.stats_interval
+    engine.segment_policy = SegmentPolicy(
+        max_seconds=(args.segment_minutes or 0) * 60,
+        max_bytes=int((args.segment_mb or 0) * 1024 * 1024),
+        # 무음 분할: 한도의 90%를 넘긴 뒤 처음 오는 무음에서 나누고, 무음이 없으면 한도에서 나눔
+        silence_after=(args.segment_minutes or 0) * 60 * 0.9 if args.split_on_silence else 0.0,
+    )
+
+    partial_path = store.new_partial_path()
+    try:
+        if args.preroll:
+            # 입력을 먼저 열어 두고 Enter를 누른 순간 직전 preroll초부터 녹음
+            engine.arm(args.device, args.preroll)
+            input(f"녹음 대기 중... Enter를 누르면 녹음을 시작합니다 (직전 {args.preroll:g}초 포함)")
+        engine.start(partial_path, args.device, args.mode)
+        print("녹음 중... (Ctrl+C로 중지)")
+        deadline = time.monotonic() + args.duration if args.duration else None
+        try:
+            while engine.is_recording and (deadline is None or time.monotonic() < deadline):
+                time.sleep(0.1)
+        except KeyboardInterrupt:
+            pass
+        result = engine.stop()
+    finally:
+        engine.close()
+
+    if result.frames == 0:
+        for path in result.files:
+            store.discard(path)
+        print("녹음된 데이터가 없습니다.", file=sys.stderr)
+        return 1
+
+    file_path = store.finalize_files(result.files, args.name)
+    if len(result.files) > 1:
+        print(f"세그먼트 {len(result.files)}개로 나눠 저장했습니다.")
+    if args.vad != "off":
+        store.save_segments(os.path.basename(file_path), result.segments, args.vad)
+    print(f"{file_path} ({result.duration:.1f}초, {result.summary})")
+    return 0
+
+
+def record_multi(args, profile, store):
+    """여러 장치를 동시에 녹음합니다 (record --devices 0,2)."""
+    import pyaudio
+
+    from multi_capture import MultiDeviceRecorder
+
+    audio = pyaudio.PyAudio()
+    try:
+        names = {i: audio.get_device_info_by_index(i).get('name', str(i)) for i in args.devices}
+        recorder = MultiDeviceRecorder(
+            audio, [(i, names[i]) for i in args.devices],
+            sample_rate=profile.sample_rate, chunk_size=profile.chunk_size,
+            channels=profile.channels, layout=args.layout
+        )
+        recorder.on_log = logger.info
+        if args.layout == "multichannel":
+            partial_paths = [store.new_partial_path()]
+        else:
+            partial_paths = [store.new_partial_path(f"_dev{i}") for i in args.devices]
+
+        recorder.start(partial_paths)
+        print(f"{len(args.devices)}개 장치 동시 녹음 중... (Ctrl+C로 중지)")
+        deadline = time.monotonic() + args.duration if args.duration else None
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                time.sleep(0.1)
+        except KeyboardInterrupt:
+            pass
+        result = recorder.stop()
+    finally:
+        audio.terminate()
+
+    if result.frames == 0:
+        for path in partial_paths:
+            store.discard(path)
+        print("녹음된 데이터가 없습니다.", file=sys.stderr)
+        return 1
+
+    from recordings_store import default_recording_name
+
+    name = args.name or default_recording_name()
+    if args.layout == "multichannel":
+        file_paths = [store.finalize(partial_paths[0], name)]
+    else:
+        file_paths = [store.finalize(path, f"{name}_dev{i}") for path, i in zip(partial_paths, args.devices)]
+    for file_path in file_paths:
+        print(file_path)
+    print(result.summary)
+    return 0
+
+
+def parse_devices(text):
+    """'0,2' 형식의 장치 ID 목록을 읽습니다."""
+    try:
+        return [int(part) for part in text.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"장치 ID 목록이 올바르지 않습니다: {text}") from None
+
+
+def cmd_list(args):
+    from recordings_catalog import RecordingsCatalog, format_duration, format_size
+    from recordings_store import RecordingsStore
+
+    store = RecordingsStore(args.dir)
+    catalog = RecordingsCatalog(store.directory)
+    try:
+        catalog.rescan()
+        for info in catalog.query(args.sort, args.desc, args.filter, limit=-1):
+            print(f"{info.name}\t{format_duration(info.duration)}\t{format_size(info.size)}")
+    finally:
+        catalog.close()
+    return 0
+
+
+def cmd_batch(args):
+    from batch_processor import BatchProcessor
+
+    processor = BatchProcessor(args.dir, args.ops, out_dir=args.out, workers=args.workers)
+    todo = len(processor.pending(force=args.force))
+    print(f"처리 단계: {processor.spec} -> {processor.out_dir} ({todo}개 파일)")
+
+    def progress(done, total, name, result):
+        if result is None:
+            print(f"[{done}/{total}] {name}: 실패")
+        else:
+            print(f"[{done}/{total}] {name} -> {', '.join(result['outputs'])} ({result['elapsed']:.2f}초)")
+
+    report = processor.run(force=args.force, on_progress=progress)
+    print(report.summary())
+    for name, error in report.failed.items():
+        print(f"{name}: {error}", file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+def cmd_play(args):
+    from recorder_engine import RecordingEngine
+    from recordings_store import RecordingsStore
+
+    file_path = RecordingsStore(args.dir).path_for(args.name)
+    engine = RecordingEngine()
+    try:
+        engine.play_file(file_path)
+    finally:
+        engine.close()
+    return 0
+
+
+def cmd_speak(args):
+    from recordings_store import RecordingsStore
+    from tts_cache import TTSCache
+    from tts_engine import TTSEngine
+
+    cache = None if args.no_cache else TTSCache(RecordingsStore(args.dir).tts_cache_dir)
+    tts = TTSEngine(rate=args.rate, cache=cache)
+    voice = tts.find_voice(args.voice) if args.voice else None
+    if args.output:
+        tts.save_to_file(args.text, args.output, rate=args.rate, voice=voice)
+        print(args.output)
+    elif cache is None:
+        tts.speak(args.text, rate=args.rate, voice=voice)
+    else:
+        from recorder_engine import RecordingEngine
+
+        file_path, hit = tts.render_cached(args.text, args.rate, voice)
+        logger.info(f"TTS 캐시 {'적중' if hit else '미스'}: {cache.stats()}")
+        engine = RecordingEngine()
+        try:
+            engine.play_file(file_path)
+        finally:
+            engine.close()
+    return 0
+
+
+def cmd_tts_batch(args):
+    from recordings_store import RecordingsStore
+    from tts_batch import TTSBatchRenderer, load_items
+
+    items = load_items(args.manifest)
+    if args.prefix is None:
+        # GUI와 같은 규칙: 목록 이름_id.wav
+        args.prefix = os.path.splitext(os.path.basename(args.manifest))[0] + "_"
+    store = RecordingsStore(args.dir)
+    renderer = TTSBatchRenderer(store.directory, items, prefix=args.prefix, workers=args.workers,
+                                rate=args.rate, voice=args.voice)
+    todo = len(renderer.pending(force=args.force))
+    print(f"{args.manifest}: {len(items)}개 중 {todo}개 합성 -> {store.directory}")
+
+    def progress(done, total, item_id, result):
+        if result is None:
+            print(f"[{done}/{total}] {item_id}: 실패")
+        else:
+            print(f"[{done}/{total}] {item_id} -> {result['output']} "
+                  f"({result['duration']:.1f}초 분량, {result['elapsed']:.2f}초)")
+
+    report = renderer.run(force=args.force, on_progress=progress)
+    print(report.summary())
+    for item_id, error in report.failed.items():
+        print(f"{item_id}: {error}", file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="음성 녹음 및 TTS 명령줄 도구")
+    parser.add_argument('--dir', default="recordings", help="녹음 파일 디렉토리")
+    parser.add_argument('-v', '--verbose', action='store_true', help="자세한 로그 출력")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('devices', help="입력 장치 목록")
+    p.add_argument('--probe', action='store_true', help="캐시를 무시하고 지원 형식을 다시 확인")
+    p.set_defaults(func=cmd_devices)
+
+    p = sub.add_parser('record', help="녹음")
+    p.add_argument('--name', default=None, help="저장할 파일 이름 (기본: 현재 시각)")
+    p.add_argument('--duration', type=float, default=None, help="녹음 시간(초), 생략하면 Ctrl+C까지")
+    p.add_argument('--device', type=int, default=None, help="입력 장치 ID")
+    p.add_argument('--mode', choices=("blocking", "callback"), default="blocking", help="캡처 방식")
+    p.add_argument('--profile', choices=("speech", "standard", "music"), default="standard",
+                   help="녹음 프로필 (speech: 16kHz 모노, standard: 44.1kHz 모노, music: 48kHz 스테레오)")
+    p.add_argument('--rate', type=int, default=None, help="샘플레이트 (프로필 값 대신 사용)")
+    p.add_argument('--chunk', type=int, default=None, help="버퍼 크기(프레임, 프로필 값 대신 사용)")
+    p.add_argument('--vad', choices=("off", "keep", "drop", "compress"), default="off",
+                   help="무음 처리 (keep: 구간만 기록, drop: 무음 제거, compress: 무음 단축)")
+    p.add_argument('--devices', type=parse_devices, default=None,
+                   help="동시에 녹음할 장치 ID 목록 (예: 0,2). 첫 번째 장치가 시간 기준")
+    p.add_argument('--layout', choices=("multichannel", "separate"), default="multichannel",
+                   help="동시 녹음 저장 방식 (multichannel: 다채널 파일 하나, separate: 장치별 파일)")
+    p.add_argument('--preroll', type=float, default=None,
+                   help="입력을 미리 열어 두고 Enter로 녹음 시작, 시작 직전 이 시간(초)을 함께 저장")
+    p.add_argument('--segment-minutes', type=float, default=None,
+                   help="이 시간(분)마다 새 세그먼트 파일로 나눠 저장 (세션 파일 하나로 묶임)")
+    p.add_argument('--segment-mb', type=float, default=None, help="세그먼트 파일 최대 크기(MB)")
+    p.add_argument('--split-on-silence', action='store_true',
+                   help="--segment-minutes에 가까워지면 다음 무음 구간에서 미리 나눔")
+    p.add_argument('--stats-file', default=None,
+                   help="캡처 상태를 주기적으로 기록할 파일 (.prom이면 Prometheus 텍스트, 아니면 JSON)")
+    p.add_argument('--stats-interval', type=float, default=5.0, help="캡처 상태 기록 간격(초)")
+    p.set_defaults(func=cmd_record)
+
+    p = sub.add_parser('list', help="녹음 목록")
+    p.add_argument('--sort', default='name', choices=("name", "duration", "size", "mtime", "peak_dbfs"), help="정렬 기준")
+    p.add_argument('--desc', action='store_true', help="내림차순 정렬")
+    p.add_argument('--filter', default='', help="파일 이름에 포함된 문자열")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser('batch', help="녹음 파일 일괄 후처리")
+    p.add_argument('--ops', required=True,
+                   help="처리 단계 (예: mono,trim:-50,normalize:-1,resample:16000,gain:3,split:-45:700)")
+    p.add_argument('--out', default=None, help="결과 디렉토리 (기본: 녹음 디렉토리/processed)")
+    p.add_argument('--workers', type=int, default=None, help="작업자 프로세스 수")
+    p.add_argument('--force', action='store_true', help="이미 처리한 파일도 다시 처리")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser('play', help="녹음 재생")
+    p.add_argument('name', help="녹음 파일 이름")
+    p.set_defaults(func=cmd_play)
+
+    p = sub.add_parser('speak', help="텍스트 음성 변환")
+    p.add_argument('text', help="읽을 텍스트")
+    p.add_argument('--rate', type=int, default=150, help="음성 속도")
+    p.add_argument('--voice', default="korean", help="음성 이름에 포함된 키워드")
+    p.add_argument('--output', default=None, help="읽는 대신 저장할 WAV 경로")
+    p.add_argument('--no-cache', action='store_true', help="합성 캐시를 사용하지 않음")
+    p.set_defaults(func=cmd_speak)
+
+    p = sub.add_parser('tts-batch', help="CSV/JSONL 목록을 일괄 음성 변환해 녹음 디렉토리에 저장")
+    p.add_argument('manifest', help="id, text, voice, rate 열이 있는 .csv 또는 .jsonl 파일")
+    p.add_argument('--prefix', default=None, help="저장할 파일 이름 앞에 붙일 문자열 (기본: 목록 파일 이름_)")
+    p.add_argument('--rate', type=int, default=150, help="rate가 없는 행의 음성 속도")
+    p.add_argument('--voice', default=None, help="voice가 없는 행의 음성 (이름 키워드 또는 음성 ID)")
+    p.add_argument('--workers', type=int, default=None, help="작업자 프로세스 수")
+    p.add_argument('--force', action='store_true', help="이미 합성한 행과 같은 이름의 기존 파일도 다시 합성")
+    p.set_defaults(func=cmd_tts_batch)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    try:
+        return args.func(args)
+    except Exception as e:
+        logger.error(f"{args.command} 실행 오류: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,12 @@
 import os
-import wave
-import pyaudio
-import pyttsx3
+import sys
+import argparse
+
+# 시작 시간은 모듈을 읽기 시작한 시점부터 잼
+from startup import StartupTimer
+
+startup_timer = StartupTimer()
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import threading
@@ -9,75 +14,218 @@ import time
 from datetime import datetime
 import logging
 
+# 창을 띄우는 데 필요한 가벼운 모듈만 여기서 가져오고, PyAudio/numpy/pyttsx3를 쓰는 모듈은
+# 창이 뜬 뒤 백그라운드 초기화(_load_backend)에서 가져옴
+from capture_profiles import DEFAULT_PROFILE, PROFILES
+from recordings_store import RecordingsStore, default_recording_name
+from ui_bus import UIEventBus
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class VoiceRecorderTTS:
-    def __init__(self, root):
+    def __init__(self, root, timer=None):
         self.root = root
         self.root.title("음성 녹음 및 TTS 프로그램")
         self.root.geometry("800x600")
         self.root.resizable(True, True)
+        self.timer = timer or StartupTimer()
+        # 모든 구성 요소가 준비되면 호출 (시작 시간 측정용)
+        self.on_ready = None
         
-        # PyAudio 객체 초기화
-        self.audio = pyaudio.PyAudio()
-        self.stream = None
-        self.frames = []
+        # 녹음 엔진(PyAudio), 재생 엔진, 녹음 색인, 파형 피크, TTS 작업자는 창을 먼저 띄운 뒤
+        # 백그라운드에서 초기화하고 준비되면 연결 (_load_backend, _on_backend_ready)
+        self.recorder = None
+        self.player = None
+        self.catalog = None
+        self.peaks = None
+        self.tts_worker = None
+        # 진행 중인 일괄 음성 변환의 취소 이벤트 (진행 중이 아니면 None)
+        self.tts_batch_cancel = None
+        self.recordings_list = None
+        self.prober = None
+        self.audio_devices = []
+        self.default_devices = None
+        self.backend_ready = False
+        self.closing = False
+        
+        # 녹음 형식은 설정 탭의 녹음 프로필로 변경
+        self.profile_var = tk.StringVar(value=DEFAULT_PROFILE)
         self.is_recording = False
-        self.recording_thread = None
-        self.sample_rate = 44100
-        self.chunk_size = 1024
-        self.channels = 1
-        self.format = pyaudio.paInt16
+        self.partial_path = None
+        self.seeking = False
         
-        # 사용 가능한 오디오 장치 목록
-        self.audio_devices = self.get_audio_devices()
+        # 녹음 파일 저장소 (비정상 종료로 남은 파일 복구는 백그라운드 초기화에서 수행)
+        self.store = RecordingsStore("recordings")
         
-        # TTS 엔진 초기화
-        try:
-            self.engine = pyttsx3.init()
-            self.engine.setProperty('rate', 150)
-            logger.info("TTS 엔진 초기화 성공")
-        except Exception as e:
-            logger.error(f"TTS 엔진 초기화 오류: {e}")
-            messagebox.showerror("오류", f"TTS 엔진 초기화에 실패했습니다: {e}")
+        # 캡처 방식 (blocking: stream.read 반복, callback: stream_callback + 링 버퍼)
+        self.capture_mode_var = tk.StringVar(value="blocking")
         
-        # 녹음 파일 저장 디렉토리
-        self.recordings_dir = "recordings"
-        if not os.path.exists(self.recordings_dir):
-            os.makedirs(self.recordings_dir)
-            logger.info(f"녹음 디렉토리 생성: {self.recordings_dir}")
+        # 무음 처리 (off: 그대로, keep: 구간만 표시, drop: 무음 제거, compress: 무음 단축)
+        self.vad_mode_var = tk.StringVar(value="off")
         
-        # 저장된 녹음 파일 목록
-        self.recordings = []
+        # 분할 녹음 (0분이면 파일 하나에 기록, 4GB를 넘으면 RF64로 전환)
+        self.segment_minutes_var = tk.IntVar(value=0)
+        self.split_on_silence_var = tk.BooleanVar(value=False)
         
-        # UI 구성
-        self.setup_ui()
+        # 여러 장치 동시 녹음 (설정 탭에서 두 개 이상 고르면 사용)
+        self.multi_recorder = None
+        self.multi_partial_paths = []
+        self.multi_device_vars = {}
+        self.multi_layout_var = tk.StringVar(value="multichannel")
         
-        # 녹음 목록 업데이트 (UI 구성 후 호출)
-        self.update_recordings_list()
+        # 캡처 상태 내보내기 (녹음 중 주기적으로 Prometheus 텍스트 파일에 기록)
+        self.export_stats_var = tk.BooleanVar(value=False)
+        self.stats_export_path = os.path.join(self.store.directory, ".capture_stats.prom")
+        
+        # 백그라운드 스레드의 UI 갱신은 이벤트 버스를 거쳐 메인 루프에서 반영
+        self.ui_bus = UIEventBus(self.root, fps=30)
+        
+        # UI 구성 (오디오가 필요한 부분은 준비될 때까지 자리 표시만)
+        with self.timer.stage("UI 구성"):
+            self.setup_ui()
+        
+        self.ui_bus.on('level', self.set_level)
+        self.ui_bus.on('status', lambda text: self.recording_status.config(text=text))
+        self.ui_bus.on('tts_status', lambda text: self.tts_status.config(text=text))
+        self.ui_bus.on('playback_position', self.update_playback_position)
+        self.ui_bus.on('playback_state', self.update_playback_state)
+        self.ui_bus.on_logs(self.append_debug_lines)
+        self.ui_bus.start()
+        
+        self.update_capture_stats()
+        
+        # 창이 처음 그려진 뒤 나머지 초기화 시작
+        self.root.after_idle(self._on_window_shown)
     
-    def get_audio_devices(self):
-        """사용 가능한 오디오 장치 목록을 반환합니다."""
-        devices = []
+    def _on_window_shown(self):
+        self.timer.mark("window")
+        threading.Thread(target=self._load_backend, name="startup", daemon=True).start()
+    
+    def _load_backend(self):
+        """오디오 백엔드와 녹음 색인을 준비합니다 (백그라운드 스레드)."""
+        timer = self.timer
         try:
-            info = self.audio.get_host_api_info_by_index(0)
-            num_devices = info.get('deviceCount')
+            for module in ("numpy", "pyaudio", "recorder_engine"):
+                timer.timed_import(module)
+            from device_probe import DeviceProber
+            from recorder_engine import RecordingEngine
             
-            for i in range(num_devices):
-                device_info = self.audio.get_device_info_by_host_api_device_index(0, i)
-                device_name = device_info.get('name')
-                max_input_channels = device_info.get('maxInputChannels')
-                
-                if max_input_channels > 0:  # 입력 장치인 경우
-                    devices.append((i, device_name))
+            with timer.stage("PyAudio 초기화"):
+                recorder = RecordingEngine()
+            with timer.stage("입력 장치 조회"):
+                # 형식은 캐시에 있는 장치만 채우고, 나머지는 창이 준비된 뒤 백그라운드에서 확인
+                prober = DeviceProber(recorder.audio, os.path.join(self.store.directory, ".device_cache.json"))
+                prober.refresh(probe=False)
+                recorder.capabilities = prober
+                try:
+                    default_devices = recorder.default_device_names()
+                except Exception as e:
+                    default_devices = e
+            with timer.stage("녹음 파일 복구"):
+                self.store.recover()
             
-            logger.info(f"사용 가능한 오디오 입력 장치: {devices}")
-            return devices
+            for module in ("playback_engine", "recordings_catalog", "waveform_peaks",
+                           "recordings_view", "waveform_view", "tts_worker"):
+                timer.timed_import(module)
+            from recordings_catalog import RecordingsCatalog
+            
+            with timer.stage("녹음 색인 열기"):
+                catalog = RecordingsCatalog(self.store.directory)
         except Exception as e:
-            logger.error(f"오디오 장치 목록 조회 오류: {e}")
-            return []
+            logger.exception("오디오 초기화 오류")
+            self.ui_bus.call(self._on_backend_failed, e)
+            return
+        self.ui_bus.call(self._on_backend_ready, recorder, prober, default_devices, catalog)
+    
+    def _on_backend_ready(self, recorder, prober, default_devices, catalog):
+        """백그라운드에서 준비한 구성 요소를 UI에 연결합니다 (메인 스레드)."""
+        from playback_engine import PlaybackEngine
+        from tts_worker import TTSWorker
+        from waveform_peaks import PeakStore
+        
+        if self.closing:
+            catalog.close()
+            recorder.close()
+            return
+        
+        with self.timer.stage("구성 요소 연결"):
+            # 녹음 엔진
+            self.recorder = recorder
+            self.recorder.on_level = lambda level: self.ui_bus.post('level', level)
+            self.recorder.on_log = self.update_debug_info
+            self.recorder.on_error = lambda e: self.ui_bus.call(self.on_record_error, e)
+            self.change_profile()
+            self.default_devices = default_devices
+            
+            # 입력 장치 목록 (지원 형식 포함, 바뀐 장치만 설정 탭에 반영)
+            self.prober = prober
+            self.prober.on_change = lambda changes: self.ui_bus.call(self.apply_device_changes, changes)
+            self.prober.reinitialize = self.reinitialize_audio
+            self.audio_devices = self.prober.list()
+            
+            # 재생 엔진 (출력 스트림을 형식별로 열어 두고 재사용)
+            self.player = PlaybackEngine(self.recorder.audio, chunk_frames=1024, max_streams=2)
+            self.player.on_position = lambda path, pos, total: self.ui_bus.post('playback_position', (path, pos, total))
+            self.player.on_state = lambda state, path: self.ui_bus.post('playback_state', (state, path))
+            self.player.on_log = self.update_debug_info
+            
+            # 녹음 파일 색인 (길이, 형식, 크기, 피크 레벨)
+            self.catalog = catalog
+            
+            # 파형 피크 파일 (없는 파일은 표시할 때 백그라운드에서 생성)
+            self.peaks = PeakStore(self.store.directory)
+            
+            # TTS 작업자 (엔진은 작업자 스레드가 소유, 합성 결과는 디스크 캐시에 보관).
+            # 엔진이 준비되기 전에 들어온 요청은 큐에서 기다림
+            self.tts_worker = TTSWorker(
+                rate=150,
+                voice_keyword="korean",
+                cache_dir=self.store.tts_cache_dir,
+                play=self.player.play_file
+            )
+            self.tts_worker.on_log = self.update_debug_info
+            self.tts_worker.on_error = lambda e: self.ui_bus.call(
+                messagebox.showerror, "오류", f"TTS 엔진 초기화에 실패했습니다: {e}"
+            )
+            self.tts_worker.on_ready = lambda ok: self.ui_bus.call(self._on_tts_ready, ok)
+            self.tts_worker.start()
+        
+        with self.timer.stage("녹음 목록/설정 탭 구성"):
+            for widget in self.recordings_tab.winfo_children():
+                widget.destroy()
+            self.setup_recordings_tab()
+            self.rebuild_settings_tab()
+        
+        self.backend_ready = True
+        self.record_btn.config(state=tk.NORMAL)
+        self.test_btn.config(state=tk.NORMAL)
+        self.speak_btn.config(state=tk.NORMAL)
+        self.batch_btn.config(state=tk.NORMAL)
+        self.recording_status.config(text="녹음 준비 완료")
+        
+        # 녹음 목록 업데이트 (UI 구성 후 호출)
+        self.update_recordings_list()
+        # 캐시에 없는 장치의 지원 형식 확인
+        self.prober.refresh_async()
+        
+        elapsed = self.timer.mark("ready")
+        self.update_debug_info(f"시작 완료 ({elapsed:.2f}초)")
+        logger.info("시작 단계별 시간:\n" + self.timer.report())
+        if self.on_ready:
+            self.on_ready()
+    
+    def _on_backend_failed(self, error):
+        """오디오 백엔드를 초기화하지 못했을 때 (메인 스레드)."""
+        self.recording_status.config(text="오디오 초기화 실패")
+        self.update_debug_info(f"오디오 초기화 오류: {error}")
+        messagebox.showerror("오류", f"오디오 장치를 초기화할 수 없습니다: {error}")
+    
+    def _on_tts_ready(self, ok):
+        """TTS 엔진 초기화가 끝났을 때 (메인 스레드)."""
+        self.timer.mark("tts")
+        self.tts_status.config(text="" if ok else "TTS 엔진을 사용할 수 없습니다.")
     
     def setup_ui(self):
         # 탭 구성
@@ -107,15 +255,15 @@ class VoiceRecorderTTS:
         # TTS 탭 구성
         self.setup_tts_tab()
         
-        # 녹음 목록 탭 구성
-        self.setup_recordings_tab()
+        # 녹음 목록 탭 (녹음 색인이 준비되면 setup_recordings_tab으로 교체)
+        tk.Label(self.recordings_tab, text="녹음 목록을 불러오는 중...", font=("Arial", 12)).pack(pady=40)
         
         # 설정 탭 구성
         self.setup_settings_tab()
     
     def setup_recording_tab(self):
         # 녹음 상태 표시
-        self.recording_status = tk.Label(self.recording_tab, text="녹음 준비 완료", font=("Arial", 12))
+        self.recording_status = tk.Label(self.recording_tab, text="오디오 초기화 중...", font=("Arial", 12))
         self.recording_status.pack(pady=10)
         
         # 녹음 시간 표시
@@ -127,13 +275,24 @@ class VoiceRecorderTTS:
         btn_frame.pack(pady=20)
         
         # 녹음 시작/중지 버튼
-        self.record_btn = tk.Button(btn_frame, text="녹음 시작", command=self.toggle_recording, bg="#3498db", fg="white", font=("Arial", 12), padx=10, pady=5)
+        self.record_btn = tk.Button(btn_frame, text="녹음 시작", command=self.toggle_recording, bg="#3498db", fg="white", font=("Arial", 12), padx=10, pady=5, state=tk.DISABLED)
         self.record_btn.pack(side=tk.LEFT, padx=10)
         
-        # 테스트 버튼 추가
-        self.test_btn = tk.Button(btn_frame, text="마이크 테스트", command=self.test_microphone, bg="#2ecc71", fg="white", font=("Arial", 12), padx=10, pady=5)
+        # 입력 모니터 (스펙트럼/스펙트로그램, 녹음 중에도 켜 둘 수 있음)
+        self.test_btn = tk.Button(btn_frame, text="입력 모니터", command=self.toggle_monitor, bg="#2ecc71", fg="white", font=("Arial", 12), padx=10, pady=5, state=tk.DISABLED)
         self.test_btn.pack(side=tk.LEFT, padx=10)
         
+        # 녹음 대기 (입력을 열어 두고 녹음 시작 직전 몇 초를 함께 저장)
+        arm_frame = tk.Frame(self.recording_tab)
+        arm_frame.pack()
+        
+        self.arm_var = tk.BooleanVar(value=False)
+        self.preroll_var = tk.DoubleVar(value=2.0)
+        tk.Checkbutton(arm_frame, text="녹음 대기 (시작 전", variable=self.arm_var, command=self.toggle_armed).pack(side=tk.LEFT)
+        tk.Spinbox(arm_frame, from_=0.5, to=10.0, increment=0.5, width=4, textvariable=self.preroll_var,
+                   command=self.toggle_armed).pack(side=tk.LEFT)
+        tk.Label(arm_frame, text="초 포함)").pack(side=tk.LEFT)
+        
         # 녹음 파일 이름 입력
         name_frame = tk.Frame(self.recording_tab)
         name_frame.pack(pady=20)
@@ -141,7 +300,7 @@ class VoiceRecorderTTS:
         tk.Label(name_frame, text="녹음 파일 이름:", font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
         self.file_name_entry = tk.Entry(name_frame, width=30)
         self.file_name_entry.pack(side=tk.LEFT, padx=5)
-        self.file_name_entry.insert(0, f"recording_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        self.file_name_entry.insert(0, default_recording_name())
         
         # 오디오 레벨 표시
         level_frame = tk.Frame(self.recording_tab)
@@ -151,9 +310,13 @@ class VoiceRecorderTTS:
         self.level_bar = ttk.Progressbar(level_frame, orient="horizontal", length=500, mode="determinate")
         self.level_bar.pack(fill=tk.X, pady=5)
         
+        # 입력 모니터 화면 (모니터를 처음 켤 때 만듦)
+        self.spectrum_view = None
+        
         # 디버그 정보 표시
         debug_frame = tk.Frame(self.recording_tab)
         debug_frame.pack(pady=10, fill=tk.X, padx=50)
+        self.debug_frame = debug_frame
         
         self.debug_info = tk.Text(debug_frame, height=5, width=60, font=("Consolas", 9))
         self.debug_info.pack(fill=tk.X)
@@ -177,23 +340,58 @@ class VoiceRecorderTTS:
         rate_scale = tk.Scale(settings_frame, from_=50, to=300, orient=tk.HORIZONTAL, variable=self.rate_var, length=200)
         rate_scale.pack(side=tk.LEFT, padx=5)
         
+        # 긴 텍스트는 문장 단위로 나눠 합성하면서 바로 재생
+        self.streaming_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(settings_frame, text="문장 단위로 바로 읽기", variable=self.streaming_var).pack(side=tk.LEFT, padx=15)
+        
         # 음성 변환 버튼
-        self.speak_btn = tk.Button(self.tts_tab, text="텍스트 읽기", command=self.speak_text, bg="#3498db", fg="white", font=("Arial", 12), padx=10, pady=5)
-        self.speak_btn.pack(pady=10)
+        tts_btn_frame = tk.Frame(self.tts_tab)
+        tts_btn_frame.pack(pady=10)
+        
+        self.speak_btn = tk.Button(tts_btn_frame, text="텍스트 읽기", command=self.speak_text, bg="#3498db", fg="white", font=("Arial", 12), padx=10, pady=5, state=tk.DISABLED)
+        self.speak_btn.pack(side=tk.LEFT, padx=5)
+        
+        # 읽기 중지 버튼 (대기 중인 요청도 모두 취소)
+        self.stop_speak_btn = tk.Button(tts_btn_frame, text="읽기 중지", command=self.stop_speaking, bg="#e74c3c", fg="white", font=("Arial", 12), padx=10, pady=5)
+        self.stop_speak_btn.pack(side=tk.LEFT, padx=5)
+        
+        # CSV/JSONL 목록의 각 행을 WAV로 합성해 녹음 목록에 저장 (진행 중에는 중지 버튼)
+        self.batch_btn = tk.Button(tts_btn_frame, text="목록 일괄 변환...", command=self.toggle_tts_batch, bg="#8e44ad", fg="white", font=("Arial", 12), padx=10, pady=5, state=tk.DISABLED)
+        self.batch_btn.pack(side=tk.LEFT, padx=5)
+        
+        # TTS 엔진 상태 (엔진은 처음 실행 후 백그라운드에서 준비)
+        self.tts_status = tk.Label(self.tts_tab, text="TTS 엔진 준비 중...", font=("Arial", 10))
+        self.tts_status.pack(pady=5)
     
     def setup_recordings_tab(self):
+        from recordings_view import VirtualRecordingsList
+        from waveform_view import WaveformView
+        
         # 녹음 목록 프레임
         list_frame = tk.Frame(self.recordings_tab)
         list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # 녹음 목록 스크롤바
-        scrollbar = tk.Scrollbar(list_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # 녹음 목록 표시 (보이는 행만 색인에서 조회)
+        self.recordings_list = VirtualRecordingsList(list_frame, self.catalog, self.peaks)
+        self.recordings_list.pack(fill=tk.BOTH, expand=True)
+        self.recordings_list.on_select = self.show_waveform
+        
+        # 선택한 녹음의 파형 (휠로 확대/축소, 끌어서 이동, 클릭하면 그 위치부터 재생)
+        self.waveform_view = WaveformView(self.recordings_tab, self.peaks, height=100)
+        self.waveform_view.pack(fill=tk.X, padx=10)
+        self.waveform_view.on_seek = self.play_from
         
-        # 녹음 목록 표시
-        self.recordings_listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set, font=("Arial", 10), height=15)
-        self.recordings_listbox.pack(fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.recordings_listbox.yview)
+        # 재생 위치 (끌어서 이동)
+        position_frame = tk.Frame(self.recordings_tab)
+        position_frame.pack(fill=tk.X, padx=10)
+        
+        self.playback_scale = ttk.Scale(position_frame, from_=0, to=1, orient=tk.HORIZONTAL)
+        self.playback_scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.playback_scale.bind("<ButtonPress-1>", lambda e: setattr(self, 'seeking', True))
+        self.playback_scale.bind("<ButtonRelease-1>", self.seek_playback)
+        
+        self.playback_label = tk.Label(position_frame, text="00:00 / 00:00", font=("Arial", 10))
+        self.playback_label.pack(side=tk.LEFT, padx=5)
         
         # 녹음 파일 관리 버튼 프레임
         btn_frame = tk.Frame(self.recordings_tab)
@@ -203,6 +401,14 @@ class VoiceRecorderTTS:
         self.play_btn = tk.Button(btn_frame, text="재생", command=self.play_recording, bg="#2ecc71", fg="white", font=("Arial", 10), padx=10, pady=5)
         self.play_btn.pack(side=tk.LEFT, padx=5)
         
+        # 일시정지 버튼
+        self.pause_btn = tk.Button(btn_frame, text="일시정지", command=self.player.toggle_pause, bg="#f39c12", fg="white", font=("Arial", 10), padx=10, pady=5)
+        self.pause_btn.pack(side=tk.LEFT, padx=5)
+        
+        # 정지 버튼
+        self.stop_play_btn = tk.Button(btn_frame, text="정지", command=self.player.stop, bg="#7f8c8d", fg="white", font=("Arial", 10), padx=10, pady=5)
+        self.stop_play_btn.pack(side=tk.LEFT, padx=5)
+        
         # 삭제 버튼
         self.delete_btn = tk.Button(btn_frame, text="삭제", command=self.delete_recording, bg="#e74c3c", fg="white", font=("Arial", 10), padx=10, pady=5)
         self.delete_btn.pack(side=tk.LEFT, padx=5)
@@ -213,18 +419,75 @@ class VoiceRecorderTTS:
     
     def setup_settings_tab(self):
         """설정 탭 UI 구성"""
+        if self.recorder is None:
+            tk.Label(self.settings_tab, text="오디오 장치를 찾는 중...", font=("Arial", 12)).pack(pady=40)
+            return
+        
         # 오디오 장치 선택
         device_frame = tk.LabelFrame(self.settings_tab, text="오디오 입력 장치 선택", padx=10, pady=10)
         device_frame.pack(fill=tk.X, padx=10, pady=10)
         
-        # 사용 가능한 장치 목록
+        # 사용 가능한 장치 목록 (장치를 다시 찾으면 apply_device_changes가 바뀐 항목만 고침)
         self.device_var = tk.StringVar()
         if self.audio_devices:
-            self.device_var.set(f"{self.audio_devices[0][0]}: {self.audio_devices[0][1]}")
+            self.device_var.set(self.audio_devices[0].label())
+        self.device_frame = device_frame
+        
+        # 여러 장치 동시 녹음 (첫 번째로 고른 장치가 시간 기준)
+        multi_frame = tk.LabelFrame(self.settings_tab, text="동시 녹음 (두 개 이상 선택)", padx=10, pady=10)
+        multi_frame.pack(fill=tk.X, padx=10, pady=10)
+        self.multi_devices_frame = tk.Frame(multi_frame)
+        self.multi_devices_frame.pack(fill=tk.X)
         
-        for idx, (device_id, device_name) in enumerate(self.audio_devices):
-            rb = tk.Radiobutton(device_frame, text=f"{device_id}: {device_name}", variable=self.device_var, value=f"{device_id}: {device_name}")
-            rb.pack(anchor=tk.W, pady=2)
+        self.device_rows = {}
+        for device in self.audio_devices:
+            self.add_device_row(device)
+        tk.Radiobutton(multi_frame, text="다채널 파일 하나로 저장", variable=self.multi_layout_var, value="multichannel").pack(anchor=tk.W, pady=2)
+        tk.Radiobutton(multi_frame, text="장치별 파일로 저장", variable=self.multi_layout_var, value="separate").pack(anchor=tk.W, pady=2)
+        
+        # 캡처 방식 선택 (같은 장치에서 드롭아웃 비교용)
+        mode_frame = tk.LabelFrame(self.settings_tab, text="캡처 방식", padx=10, pady=10)
+        mode_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        tk.Radiobutton(mode_frame, text="블로킹 읽기 (stream.read)", variable=self.capture_mode_var, value="blocking").pack(anchor=tk.W, pady=2)
+        tk.Radiobutton(mode_frame, text="콜백 + 링 버퍼 (stream_callback)", variable=self.capture_mode_var, value="callback").pack(anchor=tk.W, pady=2)
+        
+        # 녹음 프로필
+        profile_frame = tk.LabelFrame(self.settings_tab, text="녹음 프로필", padx=10, pady=10)
+        profile_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        for name, profile in PROFILES.items():
+            tk.Radiobutton(profile_frame, text=profile.describe(), variable=self.profile_var, value=name,
+                           command=self.change_profile).pack(anchor=tk.W, pady=2)
+        
+        # 무음 처리 (음성 구간 감지)
+        vad_frame = tk.LabelFrame(self.settings_tab, text="무음 처리 (음성 구간 감지)", padx=10, pady=10)
+        vad_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        for value, text in (("off", "사용 안 함"), ("keep", "모두 저장하고 음성 구간만 표시"),
+                            ("compress", "긴 무음을 짧게 줄이기"), ("drop", "무음 구간 제거")):
+            tk.Radiobutton(vad_frame, text=text, variable=self.vad_mode_var, value=value).pack(anchor=tk.W, pady=2)
+        
+        # 분할 녹음 (긴 녹음을 세그먼트 파일로 나누고 세션 하나로 묶음)
+        segment_frame = tk.LabelFrame(self.settings_tab, text="분할 저장", padx=10, pady=10)
+        segment_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        minutes_row = tk.Frame(segment_frame)
+        minutes_row.pack(anchor=tk.W, pady=2)
+        tk.Spinbox(minutes_row, from_=0, to=720, increment=5, width=5,
+                   textvariable=self.segment_minutes_var).pack(side=tk.LEFT)
+        tk.Label(minutes_row, text="분마다 새 파일로 나누기 (0: 나누지 않음)").pack(side=tk.LEFT, padx=5)
+        tk.Checkbutton(segment_frame, text="나눌 때가 가까워지면 무음 구간에서 먼저 나누기",
+                       variable=self.split_on_silence_var).pack(anchor=tk.W, pady=2)
+        
+        # 캡처 상태 (오버플로, 지연, 손실 프레임)
+        stats_frame = tk.LabelFrame(self.settings_tab, text="캡처 상태", padx=10, pady=10)
+        stats_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        self.capture_stats_label = tk.Label(stats_frame, text=self.recorder.stats.describe(), justify=tk.LEFT)
+        self.capture_stats_label.pack(anchor=tk.W, pady=2)
+        tk.Checkbutton(stats_frame, text=f"녹음 중 통계 파일로 내보내기 ({self.stats_export_path})",
+                       variable=self.export_stats_var).pack(anchor=tk.W, pady=2)
         
         # 장치 정보
         info_frame = tk.LabelFrame(self.settings_tab, text="시스템 정보", padx=10, pady=10)
@@ -232,11 +495,18 @@ class VoiceRecorderTTS:
         
         # PyAudio 정보
         try:
+            import pyaudio
+            
             # PyAudio 버전 정보
             version_info = f"PyAudio 버전: {pyaudio.__version__}\n"
-            # 기본 장치 정보 가져오기
-            default_input = self.audio.get_default_input_device_info().get('name', '알 수 없음')
-            default_output = self.audio.get_default_output_device_info().get('name', '알 수 없음')
+            # 기본 장치 정보 (시작할 때 조회한 값이 있으면 사용)
+            defaults = self.default_devices
+            self.default_devices = None
+            if defaults is None:
+                defaults = self.recorder.default_device_names()
+            elif isinstance(defaults, Exception):
+                raise defaults
+            default_input, default_output = defaults
             audio_info = f"{version_info}기본 입력 장치: {default_input}\n기본 출력 장치: {default_output}"
         except Exception as e:
             audio_info = f"시스템 정보를 가져올 수 없습니다: {e}"
@@ -250,13 +520,67 @@ class VoiceRecorderTTS:
         refresh_btn.pack(anchor=tk.W, pady=5)
     
     def refresh_audio_devices(self):
-        """오디오 장치 목록을 새로고침합니다."""
-        self.audio_devices = self.get_audio_devices()
-        # 설정 탭 다시 구성
+        """오디오 장치를 다시 찾고 지원 형식을 다시 확인합니다 (백그라운드)."""
+        self.update_debug_info("오디오 장치 확인 중...")
+        self.prober.refresh_async(force=True, rescan=True, on_done=lambda changes: self.update_debug_info(
+            "오디오 장치 확인 완료" + ("" if changes else " (변경 없음)")
+        ))
+    
+    def reinitialize_audio(self):
+        """새로 꽂거나 뺀 장치가 보이도록 PortAudio를 다시 초기화합니다 (장치 확인 스레드).
+        
+        다중 장치 녹음이나 재생 중이면 열린 스트림을 지키기 위해 건너뛰고 None을 반환합니다.
+        """
+        if self.multi_recorder is not None or not self.player.release_streams():
+            return None
+        audio = self.recorder.reinitialize_audio()
+        if audio is not None:
+            self.player.audio = audio
+        return audio
+    
+    def add_device_row(self, device):
+        """설정 탭에 장치 하나의 선택 항목을 추가합니다."""
+        text = f"{device.label()} - {device.describe()}"
+        rb = tk.Radiobutton(self.device_frame, text=text, variable=self.device_var, value=device.label(),
+                            command=self.on_device_selected)
+        rb.pack(anchor=tk.W, pady=2)
+        var = self.multi_device_vars.get(device.key)
+        if var is None:
+            var = self.multi_device_vars[device.key] = tk.BooleanVar(value=False)
+        cb = tk.Checkbutton(self.multi_devices_frame, text=text, variable=var)
+        cb.pack(anchor=tk.W, pady=2)
+        self.device_rows[device.key] = (rb, cb)
+    
+    def apply_device_changes(self, changes):
+        """추가/제거/변경된 장치만 설정 탭에 반영합니다 (메인 스레드)."""
+        selected = next((d.key for d in self.audio_devices if d.label() == self.device_var.get()), None)
+        for device in changes.removed:
+            for widget in self.device_rows.pop(device.key, ()):
+                widget.destroy()
+            self.multi_device_vars.pop(device.key, None)
+        for device in changes.changed:
+            rows = self.device_rows.get(device.key)
+            if rows is None:
+                continue
+            text = f"{device.label()} - {device.describe()}"
+            rows[0].config(text=text, value=device.label())
+            rows[1].config(text=text)
+        for device in changes.added:
+            self.add_device_row(device)
+        
+        self.audio_devices = self.prober.list()
+        labels = {d.key: d.label() for d in self.audio_devices}
+        if selected in labels:
+            self.device_var.set(labels[selected])
+        elif self.audio_devices:
+            self.device_var.set(self.audio_devices[0].label())
+        self.update_debug_info(f"오디오 장치 목록 갱신: {changes.summary()}")
+    
+    def rebuild_settings_tab(self):
+        """설정 탭을 다시 구성합니다."""
         for widget in self.settings_tab.winfo_children():
             widget.destroy()
         self.setup_settings_tab()
-        messagebox.showinfo("알림", "오디오 장치 목록이 새로고침되었습니다.")
     
     def get_selected_device_id(self):
         """선택된 오디오 장치 ID를 반환합니다."""
@@ -272,100 +596,176 @@ class VoiceRecorderTTS:
             # 기본 입력 장치 사용
             return None
     
+    def toggle_armed(self):
+        """녹음 대기를 켜거나 끕니다. 켜져 있으면 현재 장치와 프리롤 길이로 다시 엽니다."""
+        if not self.backend_ready or self.is_recording:
+            self.arm_var.set(self.recorder.armed if self.recorder else False)
+            return
+        if not self.arm_var.get():
+            self.recorder.disarm()
+            self.recording_status.config(text="녹음 준비 완료")
+            return
+        try:
+            self.recorder.arm(self.get_selected_device_id(), self.preroll_var.get())
+            self.recording_status.config(text="녹음 대기 중")
+        except Exception as e:
+            self.arm_var.set(False)
+            self.update_debug_info(f"녹음 대기 오류: {e}")
+            messagebox.showerror("오류", f"입력 장치를 열 수 없습니다: {e}")
+    
+    def on_device_selected(self):
+        """녹음 대기나 입력 모니터 중에 장치를 바꾸면 새 장치로 다시 엽니다."""
+        if self.recorder is None or self.is_recording:
+            return
+        if self.recorder.armed:
+            self.toggle_armed()
+        if self.recorder.monitor is not None:
+            self.stop_monitor()
+            self.toggle_monitor()
+    
     def toggle_recording(self):
+        if not self.backend_ready:
+            messagebox.showwarning("경고", "오디오 장치를 초기화하는 중입니다.")
+            return
         if not self.is_recording:
             self.start_recording()
         else:
             self.stop_recording()
     
-    def test_microphone(self):
-        """마이크 테스트를 수행합니다."""
-        if self.is_recording:
-            messagebox.showwarning("경고", "녹음 중에는 마이크 테스트를 할 수 없습니다.")
+    def toggle_monitor(self):
+        """입력 모니터를 켜거나 끕니다.
+
+        캡처와 FFT는 백그라운드 스레드에서 모든 청크에 대해 계산하고, 화면은 일정한 간격으로만 그리므로
+        창이 멈추지 않습니다. 녹음 중이거나 녹음 대기 중이면 그 스트림을 함께 씁니다.
+        """
+        if not self.backend_ready:
+            messagebox.showwarning("경고", "오디오 장치를 초기화하는 중입니다.")
+            return
+        if self.recorder.monitor is not None:
+            self.stop_monitor()
+            return
+        if self.multi_recorder is not None:
+            messagebox.showwarning("경고", "동시 녹음 중에는 입력 모니터를 사용할 수 없습니다.")
             return
-        
-        self.update_debug_info("마이크 테스트 시작...")
-        
-        # 선택된 장치 ID 가져오기
-        device_id = self.get_selected_device_id()
         
         try:
-            test_stream = self.audio.open(
-                format=self.format,
-                channels=self.channels,
-                rate=self.sample_rate,
-                input=True,
-                input_device_index=device_id,
-                frames_per_buffer=self.chunk_size
-            )
-            
-            self.update_debug_info("마이크 연결 성공! 5초간 오디오 레벨을 측정합니다...")
-            
-            # 5초 동안 오디오 레벨 측정
-            for i in range(50):  # 5초 (50 * 0.1초)
-                if test_stream.is_active():
-                    try:
-                        data = test_stream.read(self.chunk_size)
-                        level = self.get_audio_level(data)
-                        self.level_bar['value'] = level
-                        self.root.update()
-                        time.sleep(0.1)
-                    except Exception as e:
-                        self.update_debug_info(f"데이터 읽기 오류: {e}")
-                else:
-                    self.update_debug_info("스트림이 활성화되지 않았습니다.")
-                    break
-            
-            self.update_debug_info("마이크 테스트 완료!")
-            test_stream.stop_stream()
-            test_stream.close()
-            
+            monitor = self.recorder.start_monitor(self.get_selected_device_id())
         except Exception as e:
-            self.update_debug_info(f"마이크 테스트 오류: {e}")
-            messagebox.showerror("오류", f"마이크 테스트 중 오류가 발생했습니다: {e}")
-    
-    def get_audio_level(self, data):
-        """오디오 데이터의 레벨(볼륨)을 반환합니다."""
-        try:
-            # 부호 있는 16비트 정수로 변환
-            import array
-            import audioop
-            
-            # 오디오 데이터의 RMS(Root Mean Square) 값 계산
-            rms = audioop.rms(data, 2)  # 2는 샘플당 바이트 수 (16비트 = 2바이트)
+            self.update_debug_info(f"입력 모니터 오류: {e}")
+            messagebox.showerror("오류", f"입력 모니터를 시작할 수 없습니다: {e}")
+            return
+        
+        if self.spectrum_view is None:
+            from spectrum_view import SpectrumView
             
-            # 로그 스케일로 변환 (0-100)
-            level = min(100, max(0, int(20 * (rms / 32768))))
-            return level
-        except Exception as e:
-            logger.error(f"오디오 레벨 계산 오류: {e}")
-            return 0
+            self.spectrum_view = SpectrumView(self.recording_tab, height=220)
+        self.spectrum_view.pack(fill=tk.X, padx=50, pady=5, before=self.debug_frame)
+        self.spectrum_view.attach(monitor)
+        self.test_btn.config(text="모니터 중지")
+        self.update_debug_info(f"입력 모니터 시작 ({monitor.sample_rate}Hz)")
+    
+    def stop_monitor(self):
+        """입력 모니터를 끄고 화면을 숨깁니다."""
+        if self.spectrum_view is not None:
+            self.spectrum_view.attach(None)
+            self.spectrum_view.pack_forget()
+        if self.recorder is not None and self.recorder.monitor is not None:
+            monitor = self.recorder.monitor
+            self.recorder.stop_monitor()
+            self.update_debug_info(f"입력 모니터 중지 (분석 생략 {monitor.skipped_bytes}바이트)")
+        self.test_btn.config(text="입력 모니터")
+        if not self.is_recording:
+            self.level_bar['value'] = 0
     
     def update_debug_info(self, message):
-        """디버그 정보를 업데이트합니다."""
+        """디버그 정보를 업데이트합니다. 어느 스레드에서든 호출할 수 있습니다."""
+        self.ui_bus.post_log(f"{datetime.now().strftime('%H:%M:%S')} - {message}")
+        logger.info(message)
+    
+    def append_debug_lines(self, lines):
+        """쌓인 디버그 메시지를 한 번에 표시합니다 (메인 스레드)."""
         self.debug_info.config(state=tk.NORMAL)
-        self.debug_info.insert(tk.END, f"{datetime.now().strftime('%H:%M:%S')} - {message}\n")
+        self.debug_info.insert(tk.END, "\n".join(lines) + "\n")
+        # 오래된 줄은 잘라서 위젯이 무한히 커지지 않도록 함
+        line_count = int(self.debug_info.index('end-1c').split('.')[0])
+        if line_count > 500:
+            self.debug_info.delete("1.0", f"{line_count - 500}.0")
         self.debug_info.see(tk.END)
         self.debug_info.config(state=tk.DISABLED)
-        logger.info(message)
+    
+    def set_level(self, level):
+        """오디오 레벨 막대를 갱신합니다 (메인 스레드)."""
+        self.level_bar['value'] = level
+    
+    def update_capture_stats(self):
+        """설정 탭의 캡처 상태를 1초마다 갱신합니다."""
+        if self.recorder is None:
+            self.root.after(1000, self.update_capture_stats)
+            return
+        try:
+            self.capture_stats_label.config(text=self.recorder.stats.describe())
+        except tk.TclError:
+            pass
+        # 엔진이 모니터 입력을 다시 열지 못해 껐으면 화면도 정리
+        if self.spectrum_view is not None and self.spectrum_view.monitor is not None and self.recorder.monitor is None:
+            self.stop_monitor()
+        self.root.after(1000, self.update_capture_stats)
+    
+    def change_profile(self):
+        """설정 탭에서 고른 녹음 프로필을 적용합니다."""
+        if self.is_recording:
+            messagebox.showwarning("경고", "녹음 중에는 프로필을 바꿀 수 없습니다.")
+            return
+        if self.recorder is None:
+            # 녹음 엔진이 준비되면 그때 고른 프로필을 적용
+            return
+        try:
+            self.recorder.apply_profile(PROFILES[self.profile_var.get()])
+        except Exception as e:
+            self.update_debug_info(f"녹음 프로필 적용 오류: {e}")
+        # 녹음 대기 중이면 새 형식으로 다시 열리며, 실패하면 대기가 해제됨
+        self.arm_var.set(self.recorder.armed)
+    
+    def selected_multi_devices(self):
+        """동시 녹음에 고른 장치 (ID, 이름) 목록을 반환합니다."""
+        return [(device.index, device.name) for device in self.audio_devices
+                if self.multi_device_vars.get(device.key) and self.multi_device_vars[device.key].get()]
+    
+    def current_segment_policy(self):
+        """설정 탭의 분할 저장 값으로 분할 기준을 만듭니다."""
+        from segment_writer import SegmentPolicy
+        
+        try:
+            seconds = max(0, self.segment_minutes_var.get()) * 60
+        except tk.TclError:
+            seconds = 0
+        # 무음 분할: 한도의 90%를 넘긴 뒤 처음 오는 무음에서 나누고, 무음이 없으면 한도에서 나눔
+        silence_after = seconds * 0.9 if self.split_on_silence_var.get() else 0.0
+        return SegmentPolicy(max_seconds=seconds, silence_after=silence_after)
     
     def start_recording(self):
+        devices = self.selected_multi_devices()
+        if len(devices) > 1:
+            self.start_multi_recording(devices)
+            return
+        
         # 선택된 장치 ID 가져오기
         device_id = self.get_selected_device_id()
         
         try:
+            # 녹음 데이터는 임시 파일에 바로 기록하고 중지 시 최종 이름으로 변경
+            self.partial_path = self.store.new_partial_path()
+            self.recorder.vad_mode = self.vad_mode_var.get()
+            self.recorder.stats_export_path = self.stats_export_path if self.export_stats_var.get() else None
+            self.recorder.segment_policy = self.current_segment_policy()
+            self.recorder.start(self.partial_path, device_id, self.capture_mode_var.get())
+            
             self.is_recording = True
-            self.frames = []
             self.record_btn.config(text="녹음 중지", bg="#e74c3c")
             self.recording_status.config(text="녹음 중...")
             
             self.update_debug_info("녹음 시작 중...")
             
-            # 녹음 스레드 시작
-            self.recording_thread = threading.Thread(target=self.record_audio, args=(device_id,))
-            self.recording_thread.daemon = True
-            self.recording_thread.start()
-            
             # 타이머 시작
             self.start_time = time.time()
             self.update_timer()
@@ -377,6 +777,68 @@ class VoiceRecorderTTS:
             self.update_debug_info(f"녹음 시작 오류: {e}")
             messagebox.showerror("오류", f"녹음을 시작할 수 없습니다: {e}")
     
+    def start_multi_recording(self, devices):
+        """여러 장치를 동시에 녹음합니다. 녹음 형식은 현재 녹음 프로필을 따릅니다."""
+        profile = PROFILES[self.profile_var.get()]
+        layout = self.multi_layout_var.get()
+        if self.recorder.armed:
+            # 동시 녹음은 장치마다 스트림을 새로 열므로 녹음 대기 해제
+            self.recorder.disarm()
+            self.arm_var.set(False)
+        if self.recorder.monitor is not None:
+            self.stop_monitor()
+        try:
+            from multi_capture import MultiDeviceRecorder
+            
+            recorder = MultiDeviceRecorder(
+                self.recorder.audio, devices, sample_rate=profile.sample_rate,
+                chunk_size=profile.chunk_size, channels=profile.channels, layout=layout
+            )
+            recorder.on_log = self.update_debug_info
+            if layout == "multichannel":
+                self.multi_partial_paths = [self.store.new_partial_path()]
+            else:
+                self.multi_partial_paths = [self.store.new_partial_path(f"_dev{index}") for index, _ in devices]
+            recorder.start(self.multi_partial_paths)
+        except Exception as e:
+            for path in self.multi_partial_paths:
+                self.store.discard(path)
+            self.update_debug_info(f"동시 녹음 시작 오류: {e}")
+            messagebox.showerror("오류", f"동시 녹음을 시작할 수 없습니다: {e}")
+            return
+        
+        self.multi_recorder = recorder
+        self.is_recording = True
+        self.record_btn.config(text="녹음 중지", bg="#e74c3c")
+        self.recording_status.config(text=f"{len(devices)}개 장치 동시 녹음 중...")
+        self.start_time = time.time()
+        self.update_timer()
+    
+    def stop_multi_recording(self):
+        recorder, self.multi_recorder = self.multi_recorder, None
+        result = recorder.stop()
+        if result.frames == 0:
+            for path in self.multi_partial_paths:
+                self.store.discard(path)
+            messagebox.showwarning("경고", "녹음된 데이터가 없습니다. 마이크가 제대로 연결되어 있는지 확인하세요.")
+            return
+        
+        try:
+            name = self.file_name_entry.get() or default_recording_name()
+            if recorder.layout == "multichannel":
+                names = [name]
+            else:
+                names = [f"{name}_dev{capture.index}" for capture in recorder.captures]
+            for partial_path, file_name in zip(self.multi_partial_paths, names):
+                file_path = self.store.finalize(partial_path, file_name)
+                self.update_debug_info(f"녹음 파일 저장 성공: {file_path}")
+                self.index_recording(os.path.basename(file_path))
+            self.file_name_entry.delete(0, tk.END)
+            self.file_name_entry.insert(0, default_recording_name())
+        except Exception as e:
+            self.update_debug_info(f"파일 저장 오류: {e}")
+            messagebox.showerror("오류", f"녹음 파일을 저장할 수 없습니다: {e}")
+    
     def update_timer(self):
         if self.is_recording:
             elapsed = time.time() - self.start_time
@@ -384,48 +846,24 @@ class VoiceRecorderTTS:
             self.recording_time.config(text=f"{mins:02d}:{secs:02d}")
             self.root.after(1000, self.update_timer)
     
-    def record_audio(self, device_id=None):
+    def on_record_error(self, error):
+        """녹음 스레드에서 스트림을 열지 못했을 때 UI를 되돌립니다 (메인 스레드)."""
+        if not self.is_recording:
+            return
+        self.is_recording = False
+        self.record_btn.config(text="녹음 시작", bg="#3498db")
+        self.recording_status.config(text="녹음 준비 완료")
+        
+        # 만들어 둔 임시 파일(분할 녹음이면 세그먼트 파일) 정리
+        paths = [self.partial_path]
         try:
-            self.stream = self.audio.open(
-                format=self.format,
-                channels=self.channels,
-                rate=self.sample_rate,
-                input=True,
-                input_device_index=device_id,
-                frames_per_buffer=self.chunk_size
-            )
-            
-            self.update_debug_info(f"녹음 스트림 생성 성공 (장치 ID: {device_id if device_id is not None else '기본'})")
-            
-            silent_chunks = 0
-            while self.is_recording:
-                try:
-                    data = self.stream.read(self.chunk_size)
-                    self.frames.append(data)
-                    
-                    # 오디오 레벨 표시
-                    level = self.get_audio_level(data)
-                    self.level_bar['value'] = level
-                    
-                    # 무음 감지 (너무 오랫동안 무음이면 경고)
-                    if level < 5:
-                        silent_chunks += 1
-                        if silent_chunks >= 50:  # 약 5초 동안 무음
-                            self.update_debug_info("주의: 오디오 입력이 감지되지 않습니다. 마이크가 제대로 연결되어 있는지 확인하세요.")
-                            silent_chunks = 0
-                    else:
-                        silent_chunks = 0
-                    
-                except Exception as e:
-                    self.update_debug_info(f"녹음 중 오류: {e}")
-                    break
-            
+            paths = self.recorder.stop().files
         except Exception as e:
-            self.update_debug_info(f"녹음 스트림 생성 오류: {e}")
-            messagebox.showerror("오류", f"녹음 스트림을 생성할 수 없습니다: {e}")
-            self.is_recording = False
-            self.record_btn.config(text="녹음 시작", bg="#3498db")
-            self.recording_status.config(text="녹음 준비 완료")
+            logger.error(f"녹음 정리 오류: {e}")
+        for path in paths:
+            self.store.discard(path)
+        
+        messagebox.showerror("오류", f"녹음 스트림을 생성할 수 없습니다: {error}")
     
     def stop_recording(self):
         if self.is_recording:
@@ -435,160 +873,273 @@ class VoiceRecorderTTS:
             
             self.update_debug_info("녹음 중지 중...")
             
-            if self.stream:
-                try:
-                    self.stream.stop_stream()
-                    self.stream.close()
-                    self.stream = None
-                    self.update_debug_info("스트림 닫기 성공")
-                except Exception as e:
-                    self.update_debug_info(f"스트림 닫기 오류: {e}")
+            if self.multi_recorder is not None:
+                self.stop_multi_recording()
+                return
+            
+            result = self.recorder.stop()
             
             # 녹음된 프레임이 있는지 확인
-            if not self.frames:
+            if result.frames == 0:
                 self.update_debug_info("녹음된 데이터가 없습니다!")
+                for path in result.files:
+                    self.store.discard(path)
                 messagebox.showwarning("경고", "녹음된 데이터가 없습니다. 마이크가 제대로 연결되어 있는지 확인하세요.")
                 return
             
-            # 녹음 파일 저장
-            file_name = self.file_name_entry.get() or f"recording_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            file_path = os.path.join(self.recordings_dir, f"{file_name}.wav")
-            
+            # 녹음 파일 저장 (임시 파일을 최종 이름으로 변경)
             try:
-                with wave.open(file_path, 'wb') as wf:
-                    wf.setnchannels(self.channels)
-                    wf.setsampwidth(self.audio.get_sample_size(self.format))
-                    wf.setframerate(self.sample_rate)
-                    wf.writeframes(b''.join(self.frames))
+                file_path = self.store.finalize_files(result.files, self.file_name_entry.get())
                 
                 self.update_debug_info(f"녹음 파일 저장 성공: {file_path}")
+                if len(result.files) > 1:
+                    self.update_debug_info(f"세그먼트 {len(result.files)}개를 세션 하나로 묶었습니다.")
+                
+                # 음성 구간 정보 저장
+                if self.recorder.vad_mode != "off":
+                    self.store.save_segments(os.path.basename(file_path), result.segments, self.recorder.vad_mode)
                 
-                # 녹음 목록 업데이트
-                self.update_recordings_list()
+                # 녹음 목록 업데이트 (저장한 파일만 색인에 반영, 피크는 녹음 중 측정값 사용)
+                self.index_recording(os.path.basename(file_path), result.peak_dbfs)
                 
                 # 파일 이름 리셋
                 self.file_name_entry.delete(0, tk.END)
-                self.file_name_entry.insert(0, f"recording_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+                self.file_name_entry.insert(0, default_recording_name())
                 
             except Exception as e:
                 self.update_debug_info(f"파일 저장 오류: {e}")
                 messagebox.showerror("오류", f"녹음 파일을 저장할 수 없습니다: {e}")
     
+    def index_recording(self, name, peak_dbfs=None):
+        """저장한 녹음을 백그라운드에서 색인에 반영하고 목록을 갱신합니다.
+        
+        peak_dbfs가 없으면 파일 전체를 읽어 피크를 구하므로 UI 스레드에서 하지 않습니다.
+        """
+        def update():
+            try:
+                self.catalog.update_file(name, peak_dbfs)
+            except Exception as e:
+                self.update_debug_info(f"녹음 목록 업데이트 오류 ({name}): {e}")
+                return
+            self.ui_bus.call(self.recordings_list.refresh)
+        
+        threading.Thread(target=update, name="catalog-update", daemon=True).start()
+        self.peaks.request(name)
+    
     def speak_text(self):
         text = self.tts_text.get("1.0", tk.END).strip()
         if text:
-            # 음성 속도 설정
-            self.engine.setProperty('rate', self.rate_var.get())
-            
-            # 언어 설정 (한국어)
-            korean_voice = None
-            for voice in self.engine.getProperty('voices'):
-                if 'korean' in voice.name.lower():
-                    korean_voice = voice.id
-                    break
-            
-            if korean_voice:
-                self.engine.setProperty('voice', korean_voice)
-                self.update_debug_info(f"한국어 음성 설정: {korean_voice}")
-            else:
-                self.update_debug_info("한국어 음성을 찾을 수 없습니다. 기본 음성을 사용합니다.")
-            
-            # 음성 합성 시작
-            self.speak_btn.config(state=tk.DISABLED, text="읽는 중...")
-            
-            def speak():
-                try:
-                    self.engine.say(text)
-                    self.engine.runAndWait()
-                    self.update_debug_info("텍스트 읽기 완료")
-                except Exception as e:
-                    self.update_debug_info(f"텍스트 읽기 오류: {e}")
-                finally:
-                    self.root.after(0, lambda: self.speak_btn.config(state=tk.NORMAL, text="텍스트 읽기"))
-            
-            threading.Thread(target=speak).start()
+            # 음성 합성 요청 (TTS 작업자가 순서대로 처리)
+            busy = self.tts_worker.current is not None or self.tts_worker.pending > 0
+            self.tts_worker.submit(
+                text,
+                rate=self.rate_var.get(),
+                streaming=self.streaming_var.get(),
+                on_done=self.on_speak_done
+            )
+            if busy:
+                self.update_debug_info(f"텍스트 읽기 요청 대기 중 (대기 {self.tts_worker.pending}건)")
         else:
             messagebox.showwarning("경고", "텍스트를 입력해주세요.")
     
-    def update_recordings_list(self):
-        self.recordings_listbox.delete(0, tk.END)
-        self.recordings = []
+    def on_speak_done(self, job):
+        """TTS 작업이 끝나면 결과와 지표를 기록합니다 (TTS 작업자 스레드)."""
+        if job.status == "done":
+            self.update_debug_info(f"텍스트 읽기 완료 ({job.metrics()})")
+        elif job.status == "cancelled":
+            self.update_debug_info("텍스트 읽기 취소")
+        else:
+            self.update_debug_info(f"텍스트 읽기 오류: {job.error}")
+    
+    def stop_speaking(self):
+        """현재 낭독을 멈추고 대기 중인 요청을 모두 취소합니다."""
+        if self.tts_worker is not None:
+            self.tts_worker.cancel_all()
+    
+    def toggle_tts_batch(self):
+        """목록 파일을 골라 일괄 음성 변환을 시작합니다. 진행 중이면 남은 행을 취소합니다."""
+        from tts_batch import TTSBatchRenderer, load_items
+        
+        if self.tts_batch_cancel is not None:
+            self.tts_batch_cancel.set()
+            self.batch_btn.config(text="중지하는 중...", state=tk.DISABLED)
+            return
         
+        manifest = filedialog.askopenfilename(
+            title="일괄 변환할 목록 선택",
+            filetypes=[("CSV/JSONL 목록", "*.csv *.jsonl"), ("모든 파일", "*.*")]
+        )
+        if not manifest:
+            return
         try:
-            for file in os.listdir(self.recordings_dir):
-                if file.endswith(".wav"):
-                    self.recordings.append(file)
-                    self.recordings_listbox.insert(tk.END, file)
-            
-            self.update_debug_info(f"녹음 목록 업데이트: {len(self.recordings)}개 파일 발견")
+            items = load_items(manifest)
+            # 파일 이름은 목록 이름_id.wav, voice가 없는 행은 TTS 탭과 같은 음성과 속도로 합성
+            renderer = TTSBatchRenderer(
+                self.store.directory, items,
+                prefix=os.path.splitext(os.path.basename(manifest))[0] + "_",
+                rate=self.rate_var.get(), voice=self.tts_worker.voice_id
+            )
         except Exception as e:
-            self.update_debug_info(f"녹음 목록 업데이트 오류: {e}")
+            messagebox.showerror("오류", f"목록을 읽을 수 없습니다: {e}")
+            return
+        
+        cancel = threading.Event()
+        self.tts_batch_cancel = cancel
+        self.batch_btn.config(text="일괄 변환 중지")
+        self.update_debug_info(f"일괄 음성 변환 시작: {os.path.basename(manifest)} "
+                               f"({len(items)}개 중 {len(renderer.pending())}개 합성)")
+        
+        def progress(done, total, item_id, result):
+            self.ui_bus.post('tts_status', f"일괄 변환 중... {done}/{total}")
+            if result is None:
+                self.update_debug_info(f"일괄 변환 실패: {item_id}")
+        
+        def run():
+            try:
+                report = renderer.run(on_progress=progress, cancel_event=cancel)
+            except Exception as e:
+                logger.exception("일괄 음성 변환 오류")
+                report = e
+            self.ui_bus.call(self.on_tts_batch_done, report)
+        
+        threading.Thread(target=run, name="tts-batch", daemon=True).start()
+    
+    def on_tts_batch_done(self, report):
+        """일괄 음성 변환이 끝나면 결과를 알리고 녹음 목록을 갱신합니다 (메인 스레드)."""
+        self.tts_batch_cancel = None
+        self.batch_btn.config(text="목록 일괄 변환...", state=tk.NORMAL)
+        self.tts_status.config(text="")
+        if self.closing:
+            return
+        if isinstance(report, Exception):
+            messagebox.showerror("오류", f"일괄 음성 변환 중 오류가 발생했습니다: {report}")
+            return
+        self.update_debug_info(f"일괄 음성 변환 완료: {report.summary()}")
+        for item_id, error in list(report.failed.items())[:5]:
+            self.update_debug_info(f"  {item_id}: {error}")
+        if report.rendered:
+            self.update_recordings_list()
+        if report.failed:
+            messagebox.showwarning("경고", f"{len(report.failed)}개 행을 변환하지 못했습니다. 디버그 정보를 확인하세요.")
+    
+    def update_recordings_list(self):
+        """녹음 디렉토리를 백그라운드에서 다시 스캔하고 목록을 갱신합니다."""
+        self.recordings_list.refresh()
+        
+        def rescan():
+            try:
+                added, updated, removed = self.catalog.rescan()
+                self.update_debug_info(
+                    f"녹음 목록 업데이트: {self.catalog.count()}개 파일 (추가 {added}, 변경 {updated}, 삭제 {removed})"
+                )
+                if added or updated or removed:
+                    self.ui_bus.call(self.recordings_list.refresh)
+            except Exception as e:
+                self.update_debug_info(f"녹음 목록 업데이트 오류: {e}")
+        
+        threading.Thread(target=rescan, daemon=True).start()
     
     def play_recording(self):
-        selection = self.recordings_listbox.curselection()
-        if selection:
-            file_name = self.recordings[selection[0]]
-            file_path = os.path.join(self.recordings_dir, file_name)
-            
+        file_name = self.recordings_list.selected_name
+        if file_name:
             self.update_debug_info(f"녹음 파일 재생 중: {file_name}")
-            
-            # PyAudio를 사용하여 오디오 재생
-            def play_audio():
-                try:
-                    wf = wave.open(file_path, 'rb')
-                    stream = self.audio.open(
-                        format=self.audio.get_format_from_width(wf.getsampwidth()),
-                        channels=wf.getnchannels(),
-                        rate=wf.getframerate(),
-                        output=True
-                    )
-                    
-                    data = wf.readframes(self.chunk_size)
-                    while data:
-                        stream.write(data)
-                        data = wf.readframes(self.chunk_size)
-                    
-                    stream.stop_stream()
-                    stream.close()
-                    wf.close()
-                    self.update_debug_info("녹음 파일 재생 완료")
-                except Exception as e:
-                    self.update_debug_info(f"녹음 파일 재생 오류: {e}")
-            
-            threading.Thread(target=play_audio).start()
+            self.player.play(self.store.path_for(file_name))
         else:
             messagebox.showwarning("경고", "재생할 녹음 파일을 선택해주세요.")
     
+    def play_from(self, seconds):
+        """파형에서 클릭한 위치부터 재생합니다."""
+        name = self.waveform_view.name
+        if not name:
+            return
+        file_path = self.store.path_for(name)
+        if self.player.current_path == file_path:
+            self.player.seek(seconds)
+        else:
+            self.player.play(file_path, start=seconds)
+    
+    def show_waveform(self, name):
+        self.waveform_view.show(name)
+    
+    def seek_playback(self, event=None):
+        """재생 위치 막대를 놓은 위치로 이동합니다."""
+        self.seeking = False
+        self.player.seek(self.playback_scale.get())
+    
+    def update_playback_position(self, value):
+        from recordings_catalog import format_duration
+        
+        path, position, total = value
+        if self.waveform_view.name and path == self.store.path_for(self.waveform_view.name):
+            self.waveform_view.set_position(position)
+        if not self.seeking:
+            self.playback_scale.configure(to=max(total, 0.001))
+            self.playback_scale.set(position)
+        self.playback_label.config(text=f"{format_duration(position)} / {format_duration(total)}")
+    
+    def update_playback_state(self, value):
+        state, path = value
+        self.pause_btn.config(text="계속" if state == "paused" else "일시정지")
+    
     def delete_recording(self):
-        selection = self.recordings_listbox.curselection()
-        if selection:
-            file_name = self.recordings[selection[0]]
-            file_path = os.path.join(self.recordings_dir, file_name)
-            
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                    self.update_recordings_list()
+        file_name = self.recordings_list.selected_name
+        if file_name:
+            try:
+                if self.store.delete(file_name):
+                    self.catalog.remove(file_name)
+                    self.peaks.remove(file_name)
+                    self.waveform_view.show(None)
+                    self.recordings_list.selected_name = None
+                    self.recordings_list.refresh()
                     self.update_debug_info(f"녹음 파일 삭제: {file_name}")
-                except Exception as e:
-                    self.update_debug_info(f"녹음 파일 삭제 오류: {e}")
+            except Exception as e:
+                self.update_debug_info(f"녹음 파일 삭제 오류: {e}")
         else:
             messagebox.showwarning("경고", "삭제할 녹음 파일을 선택해주세요.")
     
     def on_closing(self):
-        if self.stream:
+        self.closing = True
+        self.ui_bus.stop()
+        if not self.backend_ready:
+            # 백그라운드 초기화가 끝나지 않았으면 창만 닫음 (초기화 스레드는 데몬이라 함께 종료)
+            self.root.destroy()
+            return
+        if self.spectrum_view is not None:
+            self.spectrum_view.attach(None)
+        self.tts_worker.shutdown()
+        if self.tts_batch_cancel is not None:
+            self.tts_batch_cancel.set()
+        self.catalog.close()
+        self.player.close()
+        if self.multi_recorder is not None:
             try:
-                self.stream.stop_stream()
-                self.stream.close()
-            except:
+                self.multi_recorder.stop()
+            except Exception:
                 pass
         
-        self.audio.terminate()
+        # 기록 중이던 파일은 헤더를 확정해 두고 다음 실행 시 복구
+        try:
+            self.recorder.close()
+        except:
+            pass
+        
         self.root.destroy()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="음성 녹음 및 TTS 프로그램")
+    parser.add_argument('--measure-startup', action='store_true',
+                        help="시작 단계별 시간을 출력하고 종료 (예산을 넘으면 종료 코드 1)")
+    args = parser.parse_args()
+    
     root = tk.Tk()
-    app = VoiceRecorderTTS(root)
+    app = VoiceRecorderTTS(root, startup_timer)
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
-    root.mainloop() 
\ No newline at end of file
+    if args.measure_startup:
+        def report_and_exit():
+            print(startup_timer.report())
+            app.on_closing()
+        app.on_ready = lambda: root.after(100, report_and_exit)
+    root.mainloop()
+    if args.measure_startup:
+        sys.exit(0 if startup_timer.within_budget else 1)
@@ -0,0 +1,196 @@
+"""스트리밍 WAV 파일 기록기
+
+녹음 데이터를 메모리에 모아두지 않고 전용 스레드에서 디스크에 바로 기록합니다.
+RIFF 헤더를 주기적으로 갱신하기 때문에 프로그램이 비정상 종료되어도
+마지막 체크포인트까지는 재생 가능한 파일이 남습니다.
+
+rf64로 만들면 헤더에 JUNK 청크 자리를 잡아 두었다가, 데이터가 4GB RIFF 한도를 넘는 순간
+같은 자리를 ds64 청크로 바꿔 RF64(EBU Tech 3306) 파일이 됩니다. 한도 안에서는 일반 WAV와 같습니다.
+"""
+import os
+import queue
+import struct
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 녹음 중인 파일에 붙는 확장자 (완료되면 최종 이름으로 변경됨)
+PARTIAL_SUFFIX = ".part"
+
+# 표준 PCM WAV 헤더 크기 (RIFF + fmt + data 청크 헤더)
+HEADER_SIZE = 44
+
+# JUNK/ds64 청크(본문 28바이트)를 포함한 헤더 크기
+RF64_HEADER_SIZE = 80
+
+# RIFF/data 크기 필드(32비트)의 최댓값. RF64에서는 이 값을 넣고 실제 크기는 ds64에 기록
+MAX_RIFF_SIZE = 0xFFFFFFFF
+
+_STOP = object()
+
+
+def build_wav_header(channels, sample_width, sample_rate, data_size, rf64=False):
+    """PCM WAV 헤더를 생성합니다.
+
+    rf64가 False면 44바이트 표준 헤더, True면 JUNK 청크를 넣은 80바이트 헤더이며,
+    데이터가 RIFF 한도를 넘으면 같은 크기의 RF64 헤더(ds64 청크)를 만듭니다.
+    """
+    byte_rate = sample_rate * channels * sample_width
+    block_align = channels * sample_width
+    fmt = struct.pack('<4sIHHIIHH', b'fmt ', 16, 1, channels, sample_rate, byte_rate, block_align, sample_width * 8)
+    if not rf64:
+        return struct.pack('<4sI4s', b'RIFF', 36 + data_size, b'WAVE') + fmt + struct.pack('<4sI', b'data', data_size)
+
+    riff_size = RF64_HEADER_SIZE - 8 + data_size
+    if riff_size <= MAX_RIFF_SIZE:
+        return (struct.pack('<4sI4s', b'RIFF', riff_size, b'WAVE')
+                + struct.pack('<4sI28x', b'JUNK', 28) + fmt + struct.pack('<4sI', b'data', data_size))
+    sample_count = data_size // block_align if block_align else 0
+    return (struct.pack('<4sI4s', b'RF64', MAX_RIFF_SIZE, b'WAVE')
+            + struct.pack('<4sIQQQI', b'ds64', 28, riff_size, data_size, sample_count, 0)
+            + fmt + struct.pack('<4sI', b'data', MAX_RIFF_SIZE))
+
+
+class StreamingWavWriter:
+    """청크를 큐로 받아 전용 스레드에서 WAV 파일에 이어 쓰는 기록기입니다."""
+
+    def __init__(self, file_path, channels, sample_width, sample_rate,
+                 max_queue_chunks=64, checkpoint_interval=2.0, rf64=False):
+        self.file_path = file_path
+        self.channels = channels
+        self.sample_width = sample_width
+        self.sample_rate = sample_rate
+        self.checkpoint_interval = checkpoint_interval
+        self.rf64 = rf64
+        self.header_size = RF64_HEADER_SIZE if rf64 else HEADER_SIZE
+
+        self.bytes_written = 0
+        self.error = None
+        self._closed = False
+
+        self._file = open(file_path, 'wb')
+        self._file.write(build_wav_header(channels, sample_width, sample_rate, 0, rf64))
+
+        # 캡처와 디스크 사이의 제한된 큐 (가득 차면 생산자가 잠시 대기)
+        self._queue = queue.Queue(maxsize=max_queue_chunks)
+        self._thread = threading.Thread(target=self._run, name="wav-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def frame_size(self):
+        return self.channels * self.sample_width
+
+    @property
+    def frames_written(self):
+        return self.bytes_written // self.frame_size
+
+    @property
+    def duration(self):
+        """지금까지 기록된 길이(초)를 반환합니다."""
+        return self.frames_written / float(self.sample_rate)
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def write(self, data):
+        """오디오 청크를 기록 큐에 넣습니다."""
+        if self._closed:
+            raise ValueError("이미 닫힌 WAV 기록기입니다.")
+        if self.error is not None:
+            raise self.error
+        self._queue.put(data)
+
+    def close(self):
+        """남은 청크를 모두 기록하고 헤더를 확정한 뒤 파일을 닫습니다."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        last_checkpoint = time.monotonic()
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            if self.error is not None:
+                # 오류 이후에도 생산자가 막히지 않도록 큐는 계속 비움
+                continue
+            try:
+                if not self.rf64 and self.header_size - 8 + self.bytes_written + len(item) > MAX_RIFF_SIZE:
+                    raise OSError("WAV 파일이 4GB 한도에 도달했습니다. RF64로 저장하거나 분할 녹음을 사용하세요.")
+                self._file.write(item)
+                self.bytes_written += len(item)
+
+                now = time.monotonic()
+                if now - last_checkpoint >= self.checkpoint_interval:
+                    self._checkpoint()
+                    last_checkpoint = now
+            except Exception as e:
+                logger.error(f"WAV 기록 오류: {e}")
+                self.error = e
+
+        try:
+            self._checkpoint()
+            self._file.close()
+        except Exception as e:
+            logger.error(f"WAV 파일 마무리 오류: {e}")
+            if self.error is None:
+                self.error = e
+
+    def _checkpoint(self):
+        """현재까지 기록된 크기로 헤더를 다시 씁니다 (RIFF 한도를 넘으면 RF64 헤더로 바뀜)."""
+        self._file.seek(0)
+        self._file.write(build_wav_header(self.channels, self.sample_width, self.sample_rate,
+                                          self.bytes_written, self.rf64))
+        self._file.seek(0, os.SEEK_END)
+        self._file.flush()
+
+
+def repair_wav_header(file_path):
+    """파일 크기에 맞춰 WAV 헤더의 크기 필드를 다시 씁니다 (표준 헤더와 JUNK/ds64 헤더)."""
+    file_size = os.path.getsize(file_path)
+    with open(file_path, 'r+b') as f:
+        header = f.read(RF64_HEADER_SIZE)
+        if header[:4] in (b'RIFF', b'RF64') and header[12:16] in (b'JUNK', b'ds64') and header[72:76] == b'data':
+            header_size, rf64 = RF64_HEADER_SIZE, True
+        elif header[:4] == b'RIFF' and header[36:40] == b'data':
+            header_size, rf64 = HEADER_SIZE, False
+        else:
+            raise ValueError(f"지원하지 않는 WAV 헤더입니다: {file_path}")
+        fmt_offset = header_size - 32
+        channels, sample_rate = struct.unpack_from('<HI', header, fmt_offset + 10)
+        block_align, bits = struct.unpack_from('<HH', header, fmt_offset + 20)
+        data_size = file_size - header_size
+        data_size -= data_size % (block_align or 1)
+        f.truncate(header_size + data_size)
+        f.seek(0)
+        f.write(build_wav_header(channels, bits // 8, sample_rate, data_size, rf64))
+    return data_size
+
+
+def recover_partial_recordings(directory):
+    """비정상 종료로 남은 녹음 파일(.part)을 복구하여 .wav 파일로 바꿉니다."""
+    recovered = []
+    for file in os.listdir(directory):
+        if not file.endswith(".wav" + PARTIAL_SUFFIX):
+            continue
+        part_path = os.path.join(directory, file)
+        base = file[:-len(".wav" + PARTIAL_SUFFIX)].lstrip('.')
+        target = os.path.join(directory, f"{base}_recovered.wav")
+        try:
+            if repair_wav_header(part_path) == 0:
+                os.remove(part_path)
+                continue
+            os.replace(part_path, target)
+            recovered.append(target)
+            logger.info(f"중단된 녹음 파일 복구: {target}")
+        except Exception as e:
+            logger.error(f"녹음 파일 복구 오류 ({file}): {e}")
+    return recovered
@@ -0,0 +1,273 @@
+"""파형 피크 파일
+
+녹음 파일마다 블록별 최소/최대 샘플 값을 여러 확대 단계로 미리 계산해 사이드카 파일
+(recordings/.peaks/이름.peaks)에 저장합니다. 파형을 그릴 때는 이 파일만 메모리 매핑으로
+읽으므로 몇 시간짜리 녹음도 오디오를 읽지 않고 어떤 배율로든 바로 그릴 수 있습니다.
+
+파일 형식 (리틀 엔디언):
+    헤더    PEAK, 버전, 블록 프레임 수, 단계 배율, 샘플레이트, 프레임 수,
+            원본 크기, 원본 수정 시각, 단계 수
+    단계표  단계별 블록 수 (Q)
+    데이터  단계별 (블록 수, 2) int16 배열 (최소, 최대)
+"""
+import os
+import queue
+import struct
+import threading
+import logging
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+
+from playback_engine import open_source
+
+logger = logging.getLogger(__name__)
+
+PEAKS_DIR = ".peaks"
+PEAKS_SUFFIX = ".peaks"
+
+MAGIC = b'PEAK'
+VERSION = 1
+_HEADER = struct.Struct('<4sHIHIQQdH')
+
+# 가장 세밀한 단계의 블록 크기(프레임)와 단계 간 배율
+BLOCK_FRAMES = 256
+LEVEL_FACTOR = 4
+
+# 한 번에 읽어 처리하는 블록 수
+_BLOCKS_PER_PASS = 4096
+
+
+def _to_int16(samples, sample_width):
+    """샘플 폭에 상관없이 16비트 범위로 맞춥니다."""
+    if sample_width == 1:
+        return (samples.astype(np.int16) - 128) * 256
+    if sample_width == 4:
+        return (samples >> 16).astype(np.int16)
+    return samples
+
+
+def _block_peaks(samples, block_values):
+    """샘플 배열을 block_values개씩 묶어 (블록 수, 2) 최소/최대 배열을 만듭니다."""
+    full = len(samples) // block_values
+    blocks = samples[:full * block_values].reshape(full, block_values)
+    peaks = np.empty((full + (1 if len(samples) % block_values else 0), 2), dtype=np.int16)
+    peaks[:full, 0] = blocks.min(axis=1)
+    peaks[:full, 1] = blocks.max(axis=1)
+    if full < len(peaks):
+        rest = samples[full * block_values:]
+        peaks[full] = (rest.min(), rest.max())
+    return peaks
+
+
+def _reduce_level(peaks, factor):
+    """아래 단계의 블록을 factor개씩 합쳐 다음 단계를 만듭니다."""
+    starts = np.arange(0, len(peaks), factor)
+    reduced = np.empty((len(starts), 2), dtype=np.int16)
+    reduced[:, 0] = np.minimum.reduceat(peaks[:, 0], starts)
+    reduced[:, 1] = np.maximum.reduceat(peaks[:, 1], starts)
+    return reduced
+
+
+def build_peaks(wav_path: str, out_path: str, block_frames: int = BLOCK_FRAMES,
+                factor: int = LEVEL_FACTOR) -> None:
+    """WAV 파일(또는 세션 파일)에서 피크 파일을 만듭니다 (임시 파일에 쓴 뒤 교체)."""
+    stat = os.stat(wav_path)
+    source = open_source(wav_path)
+    try:
+        dtype = {1: np.uint8, 2: np.int16, 4: np.int32}.get(source.sample_width)
+        if dtype is None:
+            raise ValueError(f"지원하지 않는 샘플 폭입니다: {source.sample_width}")
+        channels = source.channels
+        frames = source.frames
+        sample_rate = source.sample_rate
+
+        # 가장 세밀한 단계: 매핑된 샘플을 일정 크기씩 읽어 계산 (모든 채널을 합쳐 최소/최대)
+        dtype = np.dtype(dtype).newbyteorder('<')
+        step = block_frames * _BLOCKS_PER_PASS
+        parts = [
+            _block_peaks(_to_int16(np.frombuffer(source.read(start, step), dtype=dtype), source.sample_width),
+                         block_frames * channels)
+            for start in range(0, frames, step)
+        ]
+    finally:
+        source.close()
+    levels = [np.concatenate(parts) if parts else np.zeros((0, 2), dtype=np.int16)]
+
+    while len(levels[-1]) > factor:
+        levels.append(_reduce_level(levels[-1], factor))
+
+    tmp_path = f"{out_path}.tmp_{threading.get_ident()}"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, block_frames, factor, sample_rate, frames,
+                                 stat.st_size, stat.st_mtime, len(levels)))
+            f.write(struct.pack(f'<{len(levels)}Q', *(len(level) for level in levels)))
+            for level in levels:
+                f.write(level.astype('<i2').tobytes())
+        os.replace(tmp_path, out_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class WaveformPeaks:
+    """피크 파일 하나를 메모리 매핑으로 읽습니다."""
+
+    def __init__(self, peaks_path: str):
+        self.path = peaks_path
+        with open(peaks_path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            (magic, version, self.block_frames, self.factor, self.sample_rate, self.frames,
+             self.source_size, self.source_mtime, level_count) = _HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"피크 파일 형식이 아닙니다: {peaks_path}")
+            counts = struct.unpack(f'<{level_count}Q', f.read(8 * level_count))
+
+        self.levels = []
+        offset = _HEADER.size + 8 * level_count
+        for count in counts:
+            if count:
+                self.levels.append(np.memmap(peaks_path, dtype='<i2', mode='r', offset=offset, shape=(count, 2)))
+            else:
+                self.levels.append(np.zeros((0, 2), dtype=np.int16))
+            offset += count * 4
+
+    @property
+    def duration(self) -> float:
+        return self.frames / float(self.sample_rate) if self.sample_rate else 0.0
+
+    def is_fresh(self, stat) -> bool:
+        """원본 WAV의 크기/수정 시각이 피크 파일을 만들 때와 같은지 확인합니다."""
+        return self.source_size == stat.st_size and self.source_mtime == stat.st_mtime
+
+    def columns(self, width: int, start: int = 0, end: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """[start, end) 프레임 범위를 width개 열로 나눈 (최소, 최대) 배열을 -1.0~1.0 범위로 반환합니다."""
+        end = self.frames if end is None else min(end, self.frames)
+        start = max(0, min(start, end))
+        width = max(1, int(width))
+        if end <= start or not self.levels[0].size:
+            empty = np.zeros(0, dtype=np.float32)
+            return empty, empty
+
+        # 한 열에 블록이 하나 이상 들어가는 가장 거친 단계를 사용
+        frames_per_column = (end - start) / float(width)
+        level_index = 0
+        block = self.block_frames
+        while level_index + 1 < len(self.levels) and block * self.factor <= frames_per_column:
+            level_index += 1
+            block *= self.factor
+        level = self.levels[level_index]
+
+        first = start // block
+        last = min(len(level), -(-end // block))
+        data = np.asarray(level[first:last])
+        if len(data) >= width:
+            edges = (np.arange(width) * len(data)) // width
+            mins = np.minimum.reduceat(data[:, 0], edges)
+            maxs = np.maximum.reduceat(data[:, 1], edges)
+        else:
+            # 가장 세밀한 단계보다 더 확대하면 블록을 여러 열에 나눠 그림
+            index = (np.arange(width) * len(data)) // width
+            mins = data[index, 0]
+            maxs = data[index, 1]
+        return mins.astype(np.float32) / 32768.0, maxs.astype(np.float32) / 32768.0
+
+
+class PeakStore:
+    """녹음 디렉토리의 피크 파일을 관리합니다.
+
+    get()은 최신 피크 파일이 있을 때만 바로 반환하고, 없으면 request()로 백그라운드 생성을 요청합니다.
+    생성은 작업자 스레드 하나가 순서대로 처리합니다.
+    """
+
+    def __init__(self, directory: str, max_open: int = 64):
+        self.directory = directory
+        self.peaks_dir = os.path.join(directory, PEAKS_DIR)
+        self.max_open = max_open
+        os.makedirs(self.peaks_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._open = OrderedDict()
+        self._pending = set()
+        self._failed = set()
+        self._queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def path_for(self, name: str) -> str:
+        return os.path.join(self.peaks_dir, name + PEAKS_SUFFIX)
+
+    def get(self, name: str) -> Optional[WaveformPeaks]:
+        """최신 피크 파일을 반환합니다. 없거나 오래되었으면 None입니다."""
+        try:
+            stat = os.stat(os.path.join(self.directory, name))
+        except OSError:
+            return None
+
+        with self._lock:
+            peaks = self._open.get(name)
+            if peaks is not None and peaks.is_fresh(stat):
+                self._open.move_to_end(name)
+                return peaks
+
+        try:
+            peaks = WaveformPeaks(self.path_for(name))
+        except (OSError, ValueError, struct.error):
+            return None
+        if not peaks.is_fresh(stat):
+            return None
+
+        with self._lock:
+            self._open[name] = peaks
+            while len(self._open) > self.max_open:
+                self._open.popitem(last=False)
+        return peaks
+
+    def build(self, name: str) -> WaveformPeaks:
+        """피크 파일을 지금 만듭니다 (호출한 스레드에서 블로킹)."""
+        with self._lock:
+            # 교체하기 전에 기존 매핑을 놓아 둠
+            self._open.pop(name, None)
+            self._failed.discard(name)
+        build_peaks(os.path.join(self.directory, name), self.path_for(name))
+        return self.get(name)
+
+    def request(self, name: str) -> None:
+        """피크 파일 생성을 백그라운드 작업자에 요청합니다 (이미 요청했거나 실패한 파일은 무시)."""
+        with self._lock:
+            if name in self._pending or name in self._failed:
+                return
+            self._pending.add(name)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="peaks", daemon=True)
+                self._thread.start()
+        self._queue.put(name)
+
+    def is_pending(self, name: str) -> bool:
+        with self._lock:
+            return name in self._pending
+
+    def remove(self, name: str) -> None:
+        """녹음 파일을 지울 때 피크 파일도 지웁니다."""
+        with self._lock:
+            self._open.pop(name, None)
+            self._failed.discard(name)
+        try:
+            os.remove(self.path_for(name))
+        except OSError:
+            pass
+
+    def _run(self):
+        while True:
+            name = self._queue.get()
+            try:
+                self.build(name)
+            except Exception as e:
+                logger.error(f"피크 파일 생성 오류 ({name}): {e}")
+                with self._lock:
+                    self._failed.add(name)
+            finally:
+                with self._lock:
+                    self._pending.discard(name)
@@ -0,0 +1,163 @@
+"""파형 표시 위젯
+
+피크 파일(waveform_peaks)만 읽어 파형을 그립니다. 녹음 목록의 미리보기 이미지와
+확대/이동할 수 있는 파형 보기를 제공합니다.
+"""
+import tkinter as tk
+from typing import Callable, Optional
+
+import numpy as np
+
+from waveform_peaks import PeakStore, WaveformPeaks
+
+WAVE_COLOR = "#2980b9"
+PLAYHEAD_COLOR = "#e74c3c"
+
+# 피크 파일 생성을 기다리는 동안 다시 확인하는 간격 (ms)
+POLL_MS = 250
+
+
+def render_thumbnail(peaks: WaveformPeaks, width: int = 100, height: int = 16,
+                     color: str = WAVE_COLOR) -> tk.PhotoImage:
+    """파형 전체를 작은 이미지로 그립니다."""
+    image = tk.PhotoImage(width=width, height=height)
+    mins, maxs = peaks.columns(width)
+    middle = (height - 1) / 2.0
+    tops = np.clip(np.round(middle - maxs * middle), 0, height - 1).astype(int)
+    bottoms = np.clip(np.round(middle - mins * middle), 0, height - 1).astype(int)
+    for x, (top, bottom) in enumerate(zip(tops, bottoms)):
+        image.put(color, to=(x, int(top), x + 1, int(bottom) + 1))
+    return image
+
+
+class WaveformView(tk.Canvas):
+    """녹음 하나의 파형을 그리는 캔버스입니다.
+
+    휠로 마우스 위치를 중심으로 확대/축소하고, 끌어서 이동하며, 클릭하면 on_seek(초)를 호출합니다.
+    """
+
+    def __init__(self, master, peak_store: PeakStore, height: int = 100, **kwargs):
+        kwargs.setdefault("bg", "white")
+        kwargs.setdefault("highlightthickness", 0)
+        super().__init__(master, height=height, **kwargs)
+        self.peak_store = peak_store
+        self.name: Optional[str] = None
+        self.peaks: Optional[WaveformPeaks] = None
+        self.view_start = 0
+        self.view_end = 0
+        self.position = 0.0
+        self.on_seek: Optional[Callable[[float], None]] = None
+
+        self._drag_x = None
+        self._dragged = False
+        self._poll_id = None
+
+        self.bind("<Configure>", lambda e: self.redraw())
+        self.bind("<MouseWheel>", lambda e: self.zoom(0.8 if e.delta > 0 else 1.25, e.x))
+        self.bind("<Button-4>", lambda e: self.zoom(0.8, e.x))
+        self.bind("<Button-5>", lambda e: self.zoom(1.25, e.x))
+        self.bind("<ButtonPress-1>", self._on_press)
+        self.bind("<B1-Motion>", self._on_drag)
+        self.bind("<ButtonRelease-1>", self._on_release)
+
+    # ------------------------------------------------------------------
+    def show(self, name: Optional[str]) -> None:
+        """녹음 파일의 파형을 표시합니다. 피크 파일이 없으면 만들어질 때까지 기다립니다."""
+        self.name = name
+        self.peaks = None
+        self.position = 0.0
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        if name:
+            self._load()
+        self.redraw()
+
+    def _load(self):
+        self._poll_id = None
+        self.peaks = self.peak_store.get(self.name)
+        if self.peaks is None:
+            self.peak_store.request(self.name)
+            if self.peak_store.is_pending(self.name):
+                self._poll_id = self.after(POLL_MS, self._load)
+            return
+        self.view_start, self.view_end = 0, self.peaks.frames
+        self.redraw()
+
+    def set_position(self, seconds: float) -> None:
+        """재생 위치 표시를 옮깁니다."""
+        self.position = seconds
+        self._draw_playhead()
+
+    def zoom(self, factor: float, x: Optional[int] = None) -> None:
+        """x 위치를 중심으로 factor배 범위를 보여 줍니다 (1보다 작으면 확대)."""
+        if self.peaks is None:
+            return
+        width = max(1, self.winfo_width())
+        span = self.view_end - self.view_start
+        anchor = self.view_start + span * ((x if x is not None else width / 2) / width)
+        new_span = int(min(self.peaks.frames, max(width, span * factor)))
+        start = int(anchor - (anchor - self.view_start) * new_span / max(1, span))
+        self._set_view(start, new_span)
+
+    def _set_view(self, start, span):
+        start = max(0, min(start, self.peaks.frames - span))
+        self.view_start, self.view_end = start, start + span
+        self.redraw()
+
+    # ------------------------------------------------------------------
+    def redraw(self) -> None:
+        self.delete("all")
+        width = self.winfo_width()
+        height = self.winfo_height()
+        if width <= 1:
+            return
+        if self.peaks is None:
+            text = ""
+            if self.name:
+                text = "파형 생성 중..." if self.peak_store.is_pending(self.name) else "파형을 표시할 수 없습니다."
+            self.create_text(width / 2, height / 2, text=text, fill="gray")
+            return
+
+        mins, maxs = self.peaks.columns(width, self.view_start, self.view_end)
+        if len(maxs):
+            middle = height / 2.0
+            xs = np.arange(len(maxs))
+            top = np.column_stack((xs, middle - maxs * middle)).ravel()
+            bottom = np.column_stack((xs[::-1], middle - mins[::-1] * middle)).ravel()
+            self.create_polygon(*np.concatenate((top, bottom)).tolist(), fill=WAVE_COLOR, outline=WAVE_COLOR)
+
+        rate = float(self.peaks.sample_rate)
+        self.create_text(4, 2, anchor=tk.NW, fill="gray",
+                         text=f"{self.view_start / rate:.2f}s - {self.view_end / rate:.2f}s")
+        self._draw_playhead()
+
+    def _draw_playhead(self):
+        self.delete("playhead")
+        if self.peaks is None or self.view_end <= self.view_start:
+            return
+        frame = self.position * self.peaks.sample_rate
+        if self.view_start <= frame <= self.view_end:
+            x = (frame - self.view_start) / (self.view_end - self.view_start) * self.winfo_width()
+            self.create_line(x, 0, x, self.winfo_height(), fill=PLAYHEAD_COLOR, tags="playhead")
+
+    def _on_press(self, event):
+        self._drag_x = event.x
+        self._dragged = False
+
+    def _on_drag(self, event):
+        if self.peaks is None or self._drag_x is None:
+            return
+        span = self.view_end - self.view_start
+        shift = int((self._drag_x - event.x) * span / max(1, self.winfo_width()))
+        if shift:
+            self._dragged = True
+            self._drag_x = event.x
+            self._set_view(self.view_start + shift, span)
+
+    def _on_release(self, event):
+        if self.peaks is not None and not self._dragged and self.on_seek:
+            span = self.view_end - self.view_start
+            frame = self.view_start + span * event.x / max(1, self.winfo_width())
+            self.on_seek(frame / float(self.peaks.sample_rate))
+        self._drag_x = None